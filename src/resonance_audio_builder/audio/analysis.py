@@ -5,9 +5,43 @@ import re
 import subprocess
 import threading
 from pathlib import Path
+from typing import Dict, List, Optional
 
 from resonance_audio_builder.core.logger import Logger
 
+# [Parsed_astats_1 @ ...] Overall.RMS_level=-70.23 (o -inf si no hay contenido)
+_RMS_RE = re.compile(rb"Overall\.RMS_level=(-?inf|[-\d.]+)")
+# Resumen que astats imprime al cerrar (una línea por estadística, "Overall" tras los canales):
+# [Parsed_astats_1 @ 0x...] Overall
+# [Parsed_astats_1 @ 0x...] RMS level dB: -58.123456
+_ASTATS_LINE_RE = re.compile(rb"^\[Parsed_astats_(\d+) @ [^\]]*\] ([^\r\n]*)", re.MULTILINE)
+_RMS_LEVEL_PREFIX = b"RMS level dB: "
+
+# Sin banner, sin progreso y sin leer stdin (no compite con el listener de teclado)
+_FFMPEG_BASE = ("ffmpeg", "-hide_banner", "-nostdin", "-nostats", "-loglevel", "info")
+# Por entrada: solo audio (no inicializa la carátula como vídeo) y un hilo de decodificación,
+# el paralelismo ya lo pone el ThreadPoolExecutor del auditor
+_INPUT_OPTS = ("-vn", "-sn", "-dn", "-threads", "1")
+
+# Por debajo de esto no hay contenido real por encima del cutoff (upscale)
+_FAKE_RMS_DB = -75.0
+
+
+def _overall_rms_levels(stderr: bytes) -> Dict[int, float]:
+    """RMS (dB) de la sección Overall del resumen de cada astats, por índice de filtro."""
+    in_overall = set()
+    levels = {}
+    for idx, text in _ASTATS_LINE_RE.findall(stderr):
+        idx = int(idx)
+        if text == b"Overall":
+            in_overall.add(idx)
+        elif idx in in_overall and idx not in levels and text.startswith(_RMS_LEVEL_PREFIX):
+            try:
+                levels[idx] = float(text.rpartition(b" ")[2])
+            except ValueError:
+                pass
+    return levels
+
 
 class AudioAnalyzer:
     """Analyzes audio files for spectral integrity using FFmpeg."""
@@ -35,7 +69,8 @@ class AudioAnalyzer:
         # si es inf o muy bajo, es fake.
 
         cmd = [
-            "ffmpeg",
+            *_FFMPEG_BASE,
+            *_INPUT_OPTS,
             "-i",
             str(file_path),
             "-af",
@@ -46,11 +81,11 @@ class AudioAnalyzer:
         ]
 
         try:
+            # stderr en bytes: solo necesitamos un número, no decodificar todo el log de ffmpeg
             result = subprocess.run(
                 cmd,
-                capture_output=True,
-                encoding="utf-8",
-                errors="replace",
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 creationflags=0x08000000 if os.name == "nt" else 0,
                 check=False,
             )
@@ -60,12 +95,12 @@ class AudioAnalyzer:
             # [Parsed_astats_1 @ ...] Overall.RMS_level=-inf
             # o valores como -90.5 dB
 
-            output = result.stderr
+            output = result.stderr or b""
 
             # Buscamos la linea Overall.RMS_level=...
             # Ejemplo: [Parsed_astats_1 @ 000001bc5f5f4440] Overall.RMS_level=-70.231451
 
-            match = re.search(r"Overall\.RMS_level=([-\d\.]+)", output)
+            match = _RMS_RE.search(output)
             if match:
                 level_db = float(match.group(1))
 
@@ -75,7 +110,7 @@ class AudioAnalyzer:
 
                 self.log.debug(f"HF RMS Level (> {cutoff_hz}Hz): {level_db} dB")
 
-                if level_db == float("-inf") or level_db < -75.0:
+                if level_db < _FAKE_RMS_DB:
                     return False  # Fake HQ
                 return True  # Genuine HQ
 
@@ -84,3 +119,44 @@ class AudioAnalyzer:
         except Exception as e:
             self.log.debug(f"Error analizando espectro: {e}")
             return True
+
+    def analyze_integrity_batch(self, file_paths: List[Path], cutoff_hz: int = 16000) -> Optional[Dict[Path, bool]]:
+        """
+        Igual que analyze_integrity pero con un solo proceso ffmpeg para varios archivos
+        (una rama highpass+astats por entrada). Devuelve None si no se pudo interpretar
+        la salida, para que el llamador vuelva al análisis archivo a archivo.
+        """
+        if not file_paths:
+            return {}
+
+        cmd = list(_FFMPEG_BASE)
+        graph = []
+        for i, path in enumerate(file_paths):
+            cmd.extend([*_INPUT_OPTS, "-i", str(path)])
+            # Sin reset: el resumen final de astats tiene que cubrir el archivo entero
+            graph.append(f"[{i}:a]highpass=f={cutoff_hz},astats[a{i}]")
+        cmd.extend(["-filter_complex", ";".join(graph)])
+        for i in range(len(file_paths)):
+            cmd.extend(["-map", f"[a{i}]", "-f", "null", "-"])
+
+        try:
+            result = subprocess.run(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                creationflags=0x08000000 if os.name == "nt" else 0,
+                check=False,
+            )
+        except Exception as e:
+            self.log.debug(f"Error analizando espectro (lote): {e}")
+            return None
+
+        # Los filtros se numeran en orden: highpass_0, astats_1, highpass_2, astats_3...
+        levels = _overall_rms_levels(result.stderr or b"")
+        verdicts = {}
+        for i, path in enumerate(file_paths):
+            level_db = levels.get(2 * i + 1)
+            if level_db is None:
+                return None
+            verdicts[path] = level_db >= _FAKE_RMS_DB
+        return verdicts
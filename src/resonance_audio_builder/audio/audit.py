@@ -1,14 +1,64 @@
 """Audio library audit tools for metadata and quality verification."""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from mutagen.id3 import ID3, ID3NoHeaderError
 from mutagen.mp4 import MP4
 
 from resonance_audio_builder.audio.analysis import AudioAnalyzer
 from resonance_audio_builder.core.logger import Logger
+from resonance_audio_builder.core.utils import walk_audio_stats
+
+# Bitrate declarado por debajo de esto: no es HQ, sin necesidad de análisis espectral
+_LOW_HQ_BITRATE = 200_000
+
+# mutagen recorre átomos/frames con muchos read()/seek() pequeños; con un buffer
+# grande la cabecera entra en una lectura y los seeks dentro del buffer no tocan disco.
+_TAG_READ_BUFFER = 128 * 1024
+
+
+def _read_tags(cls, file_path: Path):
+    with open(file_path, "rb", buffering=_TAG_READ_BUFFER) as fp:
+        return cls(fp)
+
+
+def _tag_gaps(file_path: Path) -> Tuple[bool, bool, bool, int]:
+    """(falta metadata, falta portada, falta letra, bitrate declarado o 0) leyendo los tags."""
+    if file_path.suffix.lower() == ".mp3":
+        try:
+            audio = _read_tags(ID3, file_path)
+        except ID3NoHeaderError:
+            return True, True, True, 0
+        # Claves tipo "APIC:desc" / "USLT::eng": una sola pasada para obtener los ids de frame
+        frame_ids = {k[:4] for k in audio.keys()}
+        # ID3 solo lee la cabecera de tags, no el stream: bitrate desconocido
+        return (
+            "TIT2" not in frame_ids or "TPE1" not in frame_ids,
+            "APIC" not in frame_ids,
+            "USLT" not in frame_ids and "SYLT" not in frame_ids,
+            0,
+        )
+
+    # M4A: átomos iTunes; MP4 ya parsea el stream (info.bitrate) al leer los tags
+    audio = _read_tags(MP4, file_path)
+    return (
+        "\xa9nam" not in audio or "\xa9ART" not in audio,
+        "covr" not in audio,
+        "\xa9lyr" not in audio,
+        int(getattr(audio.info, "bitrate", 0) or 0),
+    )
+
+
+# Clave (ruta, mtime_ns, tamaño): si el archivo cambia, la entrada deja de coincidir.
+# Solo se guardan bools y el bitrate (no el objeto mutagen, que retiene portada y letra).
+@lru_cache(maxsize=4096)
+def _cached_tag_gaps(path_str: str, mtime_ns: int, size: int) -> Tuple[bool, bool, bool, int]:
+    return _tag_gaps(Path(path_str))
 
 
 @dataclass
@@ -23,10 +73,24 @@ class AuditResult:
     fake_hq_detected: List[str] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
 
+    def merge(self, other: "AuditResult") -> None:
+        """Suma los contadores y listas de otro resultado (total_files no se toca)."""
+        self.total_size_bytes += other.total_size_bytes
+        self.missing_metadata.extend(other.missing_metadata)
+        self.missing_covers.extend(other.missing_covers)
+        self.missing_lyrics.extend(other.missing_lyrics)
+        self.fake_hq_detected.extend(other.fake_hq_detected)
+        self.errors.extend(other.errors)
+
 
 class AudioAuditor:
     """Scans audio libraries for missing metadata and quality issues."""
 
+    # Archivos por proceso ffmpeg en el análisis espectral (acota el largo de argv)
+    SPECTRAL_BATCH_SIZE = 64
+    # Hilos para leer tags en paralelo (mutagen y ffmpeg liberan el GIL en E/S)
+    AUDIT_WORKERS = min(8, os.cpu_count() or 1)
+
     def __init__(self, logger: Logger, analyzer: AudioAnalyzer = None):
         self.log = logger
         self.analyzer = analyzer or AudioAnalyzer(logger)
@@ -53,76 +117,92 @@ class AudioAuditor:
 
     def _audit_folder(self, folder_path: Path, check_spectral: bool = False, progress_callback=None) -> AuditResult:
         result = AuditResult()
-        files = list(folder_path.rglob("*.m4a")) + list(folder_path.rglob("*.mp3"))
-        result.total_files = len(files)
+        entries = [(Path(p), st) for p, st in walk_audio_stats(folder_path)]
+        result.total_files = len(entries)
+
+        # Lectura de tags (E/S de disco) en paralelo; se fusiona en orden según van llegando
+        with ThreadPoolExecutor(max_workers=self.AUDIT_WORKERS) as pool:
+            if not check_spectral:
+                self._merge_scanned(result, pool.map(self._audit_entry, entries), progress_callback)
+                return result
+
+            # Por lotes: un ffmpeg analiza SPECTRAL_BATCH_SIZE archivos (ahorra un fork/exec por archivo)
+            step = self.SPECTRAL_BATCH_SIZE
+            for start in range(0, len(entries), step):
+                end = start + step
+                batch = entries[start:end]
+                scanned = list(pool.map(self._audit_entry, batch))
+                self._spectral_pass([p for p, _ in batch], scanned, pool)
+                self._merge_scanned(result, scanned, progress_callback)
+
+        return result
 
-        for file_path in files:
-            self._audit_single_file(file_path, result, check_spectral)
+    @staticmethod
+    def _merge_scanned(result: AuditResult, scanned, progress_callback=None) -> None:
+        for partial, _ in scanned:
+            result.merge(partial)
             if progress_callback:
                 progress_callback()
 
-        return result
+    def _audit_entry(self, entry: Tuple[Path, os.stat_result]) -> Tuple[AuditResult, Optional[int]]:
+        partial = AuditResult()
+        file_path, st = entry
+        return partial, self._audit_single_file(file_path, partial, st)
 
-    def _audit_single_file(self, file_path: Path, result: AuditResult, check_spectral: bool) -> None:
-        """Audit a single M4A file and update result."""
+    def _audit_single_file(
+        self, file_path: Path, result: AuditResult, st: Optional[os.stat_result] = None
+    ) -> Optional[int]:
+        """Audit a single M4A file and update result. Returns the declared bitrate (0 = unknown), None on error."""
         try:
-            result.total_size_bytes += file_path.stat().st_size
-            self._check_file_tags(file_path, result)
-
-            if check_spectral:
-                self._check_spectral_integrity(file_path, result)
-
+            # El stat viene del recorrido (DirEntry.stat) cuando está disponible
+            result.total_size_bytes += file_path.stat().st_size if st is None else st.st_size
+            return self._check_file_tags(file_path, result, st)
         except Exception as e:
             self.log.error(f"Error auditing {file_path}: {e}")
             result.errors.append(str(file_path))
+            return None
 
-    def _check_file_tags(self, file_path: Path, result: AuditResult) -> None:
-        """Check audio tags for metadata, cover, and lyrics."""
+    def _check_file_tags(self, file_path: Path, result: AuditResult, st: Optional[os.stat_result] = None) -> int:
+        """Check audio tags for metadata, cover, and lyrics. Returns the declared bitrate (0 = unknown)."""
         try:
-            if file_path.suffix.lower() == ".mp3":
-                self._check_mp3_tags(file_path, result)
+            if st is None:
+                gaps = _tag_gaps(file_path)
             else:
-                self._check_m4a_tags(file_path, result)
+                # Re-auditorías: archivos sin cambios no se vuelven a parsear
+                gaps = _cached_tag_gaps(str(file_path), st.st_mtime_ns, st.st_size)
         except Exception as e:
             self.log.debug(f"Metadata error on {file_path.name}: {e}")
             result.errors.append(f"{file_path.name}: Tag Error")
+            return 0
 
-    def _check_mp3_tags(self, file_path: Path, result: AuditResult) -> None:
-        """Internal helper to check MP3 tags."""
-        try:
-            audio = ID3(file_path)
-        except ID3NoHeaderError:
+        missing_metadata, missing_cover, missing_lyrics, bitrate = gaps
+        if missing_metadata:
             result.missing_metadata.append(file_path.name)
+        if missing_cover:
             result.missing_covers.append(file_path.name)
+        if missing_lyrics:
             result.missing_lyrics.append(file_path.name)
+        return bitrate
+
+    def _spectral_pass(self, paths: List[Path], scanned: List[Tuple[AuditResult, Optional[int]]], pool) -> None:
+        """Check if files are genuine HQ; ffmpeg only runs where the declared bitrate is not conclusive."""
+        todo = []
+        for path, (partial, bitrate) in zip(paths, scanned):
+            if bitrate is None:
+                continue
+            if 0 < bitrate < _LOW_HQ_BITRATE:
+                # La cabecera ya dice que no es HQ
+                partial.fake_hq_detected.append(path.name)
+            else:
+                # >= 320k no prueba nada: un upscale transcodificado también declara 320k
+                todo.append((path, partial))
+        if not todo:
             return
 
-        if "TIT2" not in audio or "TPE1" not in audio:
-            result.missing_metadata.append(file_path.name)
-
-        if not any(k.startswith("APIC") for k in audio.keys()):
-            result.missing_covers.append(file_path.name)
-
-        if not any(k.startswith("USLT") or k.startswith("SYLT") for k in audio.keys()):
-            result.missing_lyrics.append(file_path.name)
-
-    def _check_m4a_tags(self, file_path: Path, result: AuditResult) -> None:
-        """Internal helper to check M4A tags."""
-        audio = MP4(file_path)
-
-        # Check title and artist (iTunes atoms)
-        if "\xa9nam" not in audio or "\xa9ART" not in audio:
-            result.missing_metadata.append(file_path.name)
-
-        # Check cover art
-        if "covr" not in audio:
-            result.missing_covers.append(file_path.name)
-
-        # Check lyrics
-        if "\xa9lyr" not in audio:
-            result.missing_lyrics.append(file_path.name)
-
-    def _check_spectral_integrity(self, file_path: Path, result: AuditResult) -> None:
-        """Check if file is genuine HQ using spectral analysis."""
-        if not self.analyzer.analyze_integrity(file_path):
-            result.fake_hq_detected.append(file_path.name)
+        todo_paths = [p for p, _ in todo]
+        verdicts = self.analyzer.analyze_integrity_batch(todo_paths)
+        if verdicts is None:
+            verdicts = dict(zip(todo_paths, pool.map(self.analyzer.analyze_integrity, todo_paths)))
+        for path, partial in todo:
+            if not verdicts.get(path, True):
+                partial.fake_hq_detected.append(path.name)
@@ -1,37 +1,158 @@
 import asyncio
 import io
-import json
 import os
-import random
 import tempfile
+import threading
 import time
 import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import NoReturn, Optional, Tuple
 
 import aiohttp
-import yt_dlp
 from mutagen.mp4 import MP4, MP4Cover
-from PIL import Image
 
 from resonance_audio_builder.audio.analysis import AudioAnalyzer
-from resonance_audio_builder.audio.lyrics import fetch_lyrics_with_info
+from resonance_audio_builder.audio.lyrics import fetch_lyrics_with_info, fetch_lyrics_with_info_async
 from resonance_audio_builder.audio.metadata import TrackMetadata
 from resonance_audio_builder.audio.musicbrainz import get_composer_string
 from resonance_audio_builder.audio.youtube import SearchResult
+from resonance_audio_builder.core import shutdown
 from resonance_audio_builder.core.config import Config, QualityMode
 from resonance_audio_builder.core.exceptions import (
     CopyrightError,
     FatalError,
     GeoBlockError,
     NotFoundError,
-    RecoverableError,
+    RateLimitError,
     YouTubeError,
 )
 from resonance_audio_builder.core.logger import Logger
 from resonance_audio_builder.network.proxies import SmartProxyManager
-from resonance_audio_builder.network.utils import USER_AGENTS, validate_cookies_file
+from resonance_audio_builder.network.utils import get_random_user_agent, validate_cookies_file
+
+# Filtros de normalizacion (config NORMALIZE_FILTER). dynaudnorm es lineal y de una pasada;
+# loudnorm (EBU R128) sin mediciones previas sobremuestrea a 192 kHz y es bastante mas lento.
+_NORMALIZE_FILTERS = {
+    "dynaudnorm": "dynaudnorm=f=150:g=15",
+    "loudnorm": "loudnorm=I=-14:TP=-1.5:LRA=11",
+}
+
+# Filtros de reescalado de portada (config COVER_RESAMPLE). En 'auto' basta BILINEAR/HAMMING:
+# la miniatura llega ya reducida por draft() y Lanczos no aporta nada visible a ese tamaño.
+_COVER_FILTERS = {
+    "bilinear": "BILINEAR",
+    "hamming": "HAMMING",
+    "bicubic": "BICUBIC",
+    "lanczos": "LANCZOS",
+}
+
+# ffmpeg es CPU: transcodificación + análisis espectral de todos los workers comparten este tope
+_MAX_FFMPEG = os.cpu_count() or 2
+# Parte fija de cada salida AAC; solo el bitrate, los hilos y la ruta cambian por pista
+_AAC_OUTPUT_TAIL = ("-ar", "44100", "-ac", "2")
+
+# Códecs sin pérdida según yt-dlp: no puede haber corte espectral de un MP3 reconvertido
+_LOSSLESS_CODECS = frozenset({"flac", "alac", "wav"})
+
+# Modo de calidad -> (necesita HQ, necesita Mobile); un solo lookup por canción
+_MODE_TARGETS = {
+    QualityMode.HQ_ONLY: (True, False),
+    QualityMode.MOBILE_ONLY: (False, True),
+    QualityMode.BOTH: (True, True),
+}
+
+
+def _size_or_zero(path: Path) -> int:
+    """Tamaño en bytes con un solo stat(); 0 si no existe (evita exists() + stat())."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _mp4_length(path: Path) -> Optional[float]:
+    """Duración en segundos según la cabecera MP4, o None si mutagen no puede leerla."""
+    try:
+        return MP4(str(path)).info.length
+    except Exception:
+        return None
+
+
+# Plantilla de opciones yt-dlp para descargas (lo que no depende del track ni de la config)
+_YTDLP_BASE_OPTS = {
+    "format": "bestaudio/best",
+    "quiet": True,
+    "no_warnings": True,
+    "noprogress": True,
+    "socket_timeout": 15,
+    "retries": 3,
+    "fragment_retries": 10,
+    "skip_unavailable_fragments": True,
+    "geo_bypass": True,
+    "extractor_args": {
+        "youtube": {
+            "player_client": ["android", "web"],
+        }
+    },
+}
+
+_YTDLP_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-us,en;q=0.5",
+    "Sec-Fetch-Mode": "navigate",
+}
+
+
+class _YtdlpFileLogger:
+    """Simple file logger for yt-dlp output."""
+
+    def __init__(self, path: str = "ytdlp_raw.log"):
+        self._path = path
+        self._fh = None
+        # yt-dlp escribe desde varios hilos del executor a la vez
+        self._lock = threading.Lock()
+
+    def _log(self, prefix, msg):
+        with self._lock:
+            if self._fh is None:
+                # Abierto una vez (antes: open/close por línea); buffer por línea por si el proceso muere
+                self._fh = open(self._path, "a", encoding="utf-8", buffering=1)
+                shutdown.register(self.close)
+            self._fh.write(f"[{prefix}] {msg}\n")
+
+    def close(self):
+        """Cierra el archivo de log."""
+        with self._lock:
+            fh, self._fh = self._fh, None
+        if fh is not None:
+            fh.close()
+
+    def debug(self, msg):
+        """Log debug message."""
+        self._log("DEBUG", msg)
+
+    def warning(self, msg):
+        """Log warning message."""
+        self._log("WARNING", msg)
+
+    def error(self, msg):
+        """Log error message."""
+        self._log("ERROR", msg)
+
+
+_YTDLP_FILE_LOGGER = _YtdlpFileLogger()
+
+_COVER_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/123.0.0.0 Safari/537.36"
+    ),
+    "Referer": "https://open.spotify.com/",
+}
 
 
 @dataclass
@@ -43,26 +164,111 @@ class DownloadResult:
     error: str = None
     skipped: bool = False
     fake_hq: bool = False
+    rate_limited: bool = False
 
 
 class AudioDownloader:
     """Async audio downloader with transcoding and metadata injection."""
 
+    # Portadas redimensionadas (~50-100 KB) en memoria
+    COVER_CACHE_SIZE = 128
+
     def __init__(self, config: Config, logger: Logger, proxy_manager: Optional[SmartProxyManager] = None):
         self.cfg = config
         self.log = logger
         self._cookies_valid = validate_cookies_file(config.COOKIES_FILE)
         self.analyzer = AudioAnalyzer(logger)
         self.proxy_manager = proxy_manager
-        self._cover_cache: dict[str, Optional[bytes]] = {}
+        # Portadas por URL (LRU acotado): los temas de un álbum comparten carátula
+        self._cover_cache: OrderedDict[str, Optional[bytes]] = OrderedDict()
+        # Descargas en curso por URL: workers concurrentes del mismo álbum esperan la misma
+        self._cover_inflight: dict[str, asyncio.Future] = {}
+        # Sesión HTTP persistente para portadas (keep-alive contra el CDN), ligada a su event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
+        # Carpetas de salida ya resueltas/creadas (una playlist reutiliza la misma subcarpeta)
+        self._folders: dict[tuple[str, str], Path] = {}
+        self._created_folders: set[tuple[str, str]] = set()
+        # Pools propios: un yt-dlp bloqueado en red no deja sin hilos a Pillow ni a mutagen
+        self._img_pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="cover_img")
+        self._tag_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tagging")
+        # Carpeta temporal propia para los RAW (se crea al primer uso, se borra en close())
+        self._scratch: Optional[tempfile.TemporaryDirectory] = None
+        # validate_audio_file por (ruta, mtime_ns, tamaño): un archivo modificado no coincide
+        self._valid_cache: dict[tuple[str, int, int], bool] = {}
+        # RAW -> (acodec, abr) declarados por yt-dlp; se descarta al borrar el RAW
+        self._raw_source: dict[Path, tuple[str, float]] = {}
+        # Procesos ffmpeg simultáneos: transcode + análisis por worker, nunca más que núcleos
+        ffmpeg_procs = min(_MAX_FFMPEG, 2 * max(1, int(config.MAX_WORKERS)))
+        self._ffmpeg_sem = asyncio.Semaphore(ffmpeg_procs)
+        # Hilos por proceso: con ffmpeg_procs procesos a la vez, el total no supera los núcleos
+        self._ffmpeg_threads = str(max(1, _MAX_FFMPEG // ffmpeg_procs))
+
+    def _cover_session(self) -> aiohttp.ClientSession:
+        """Sesión de portadas reutilizable; se recrea si cambió el event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30, connect=10),
+                headers=_COVER_HEADERS,
+                connector=aiohttp.TCPConnector(limit_per_host=8, ttl_dns_cache=300),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def close(self):
+        """Cierra la sesión HTTP de portadas y los pools de hilos."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+        self._img_pool.shutdown(wait=False)
+        self._tag_pool.shutdown(wait=False)
+        scratch, self._scratch = self._scratch, None
+        if scratch is not None:
+            scratch.cleanup()
+
+    def _scratch_dir(self) -> Path:
+        """Directorio temporal de esta ejecución: la recuperación solo escanea lo nuestro."""
+        if self._scratch is None:
+            # Prefijo ytraw_: _clear_temp_files también limpia restos de ejecuciones abortadas
+            self._scratch = tempfile.TemporaryDirectory(prefix="ytraw_", ignore_cleanup_errors=True)
+        return Path(self._scratch.name)
 
     async def validate_audio_file(self, path: Path) -> bool:
-        """Valida integridad del archivo de audio usando FFmpeg (Async)"""
-        if not path.exists() or path.stat().st_size < 50000:
+        """Valida integridad del archivo de audio (cabecera MP4 con mutagen; ffprobe si no se puede leer)"""
+        try:
+            st = path.stat()
+        except OSError:
             return False
+        if st.st_size < 50000:
+            return False
+
+        # Reintentos/otra calidad vuelven a validar el mismo archivo: si no cambió, mismo resultado
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        cached = self._valid_cache.get(key)
+        if cached is None:
+            cached = self._valid_cache[key] = await self._check_duration(path)
+        return cached
+
+    async def _check_duration(self, path: Path) -> bool:
+        # Sin fork: mutagen lee la duración del moov (un archivo cortado no lo tiene)
+        loop = asyncio.get_running_loop()
+        length = await loop.run_in_executor(self._tag_pool, _mp4_length, path)
+        if length is not None:
+            return length > 10.0
 
         try:
-            cmd = ["ffprobe", "-v", "error", "-show_format", "-show_streams", "-of", "json", str(path)]
+            # Solo el campo que usamos: sin JSON que parsear
+            cmd = [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                str(path),
+            ]
 
             # Async subprocess
             proc = await asyncio.create_subprocess_exec(
@@ -76,9 +282,8 @@ class AudioDownloader:
             if proc.returncode != 0:
                 return False
 
-            data = json.loads(stdout)
-            duration = float(data.get("format", {}).get("duration", 0))
-            return duration > 10.0
+            # "N/A" si el contenedor no declara duración -> ValueError -> inválido
+            return float(stdout.strip() or 0) > 10.0
 
         except Exception:
             return False
@@ -86,49 +291,67 @@ class AudioDownloader:
     async def _resize_cover(self, image_data: bytes, max_size: int = 600) -> bytes:
         """Redimensiona la imagen de portada (CPU bound -> Run in executor)"""
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._resize_cover_sync, image_data, max_size)
+        return await loop.run_in_executor(self._img_pool, self._resize_cover_sync, image_data, max_size)
 
     def _resize_cover_sync(self, image_data: bytes, max_size: int) -> bytes:
         try:
+            from PIL import Image
+
             img = Image.open(io.BytesIO(image_data))
             if img.width <= max_size and img.height <= max_size:
                 return image_data
-            img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+            # thumbnail() ya reduce el JPEG al decodificar (draft); el filtro trabaja sobre ese buffer
+            img.thumbnail((max_size, max_size), getattr(Image.Resampling, self._cover_filter(max_size)))
             output = io.BytesIO()
             if img.mode != "RGB":
                 img = img.convert("RGB")
-            img.save(output, format="JPEG", quality=85, optimize=True)
+            img.save(output, format="JPEG", quality=85)
             return output.getvalue()
         except Exception:
             return image_data
 
+    def _cover_filter(self, max_size: int) -> str:
+        """Nombre del filtro de Pillow para la portada según COVER_RESAMPLE ('auto' por tamaño)"""
+        name = _COVER_FILTERS.get(str(self.cfg.COVER_RESAMPLE).lower())
+        if name:
+            return name
+        return "BILINEAR" if max_size <= 400 else "HAMMING"
+
     def _prepare_download_paths(self, subfolder: str, track: TrackMetadata) -> Tuple[Path, Path, bool, bool]:
         """Calcula y crea las rutas de descarga según el modo"""
-        hq_folder = Path(self.cfg.OUTPUT_FOLDER_HQ) / subfolder
-        mobile_folder = Path(self.cfg.OUTPUT_FOLDER_MOBILE) / subfolder
-
-        needed_hq = self.cfg.MODE in [QualityMode.HQ_ONLY, QualityMode.BOTH]
-        needed_mobile = self.cfg.MODE in [QualityMode.MOBILE_ONLY, QualityMode.BOTH]
+        needed_hq, needed_mobile = _MODE_TARGETS.get(self.cfg.MODE, (False, False))
 
-        if needed_hq:
-            hq_folder.mkdir(parents=True, exist_ok=True)
-        if needed_mobile:
-            mobile_folder.mkdir(parents=True, exist_ok=True)
+        hq_folder = self._output_folder(self.cfg.OUTPUT_FOLDER_HQ, subfolder, needed_hq)
+        mobile_folder = self._output_folder(self.cfg.OUTPUT_FOLDER_MOBILE, subfolder, needed_mobile)
 
-        filename = f"{track.safe_filename}.m4a"
+        filename = track.safe_filename + ".m4a"
         return hq_folder / filename, mobile_folder / filename, needed_hq, needed_mobile
 
+    def _output_folder(self, base: str, subfolder: str, create: bool) -> Path:
+        """Path de salida cacheado por (base, subcarpeta); mkdir solo la primera vez."""
+        key = (base, subfolder)
+        folder = self._folders.get(key)
+        if folder is None:
+            folder = self._folders[key] = Path(base) / subfolder
+        if create and key not in self._created_folders:
+            folder.mkdir(parents=True, exist_ok=True)
+            self._created_folders.add(key)
+        return folder
+
     async def _check_existing_files(
         self, hq_path: Path, mobile_path: Path, needed_hq: bool, needed_mobile: bool
     ) -> Tuple[bool, bool]:
         """Valida si los archivos ya existen y son válidos"""
-        hq_exists = False
-        if needed_hq and hq_path.exists():
-            hq_exists = await self.validate_audio_file(hq_path)
+        # validate_audio_file ya hace su propio stat(); no hace falta exists() antes
+        if needed_hq and needed_mobile:
+            # Las dos lecturas de cabecera (o ffprobe de respaldo) van en paralelo
+            hq_exists, mobile_exists = await asyncio.gather(
+                self.validate_audio_file(hq_path), self.validate_audio_file(mobile_path)
+            )
+            return hq_exists, mobile_exists
 
-        mobile_exists = False
-        if needed_mobile and mobile_path.exists():
-            mobile_exists = await self.validate_audio_file(mobile_path)
+        hq_exists = needed_hq and await self.validate_audio_file(hq_path)
+        mobile_exists = needed_mobile and await self.validate_audio_file(mobile_path)
 
         return hq_exists, mobile_exists
 
@@ -139,6 +362,7 @@ class AudioDownloader:
         if check_quit and check_quit():
             return DownloadResult(success=True, skipped=True)
         raw_path = None
+        assets_task = None
         try:
             # 1. Setup paths and check existence
             hq_path, mobile_path, needed_hq, needed_mobile = self._prepare_download_paths(subfolder, track)
@@ -154,76 +378,131 @@ class AudioDownloader:
             if not search_result:
                 raise YouTubeError("No search result provided")
 
-            # 2. Download RAW (Async)
+            # 2. Download RAW (Async); la portada se descarga en paralelo
+            assets_task = asyncio.create_task(self._fetch_metadata_assets(track))
             raw_path = await self._download_raw(search_result.url, f"isrc_{track.isrc}")
             self._validate_raw(raw_path)
 
             if check_quit and check_quit():
                 return DownloadResult(False, 0, "Cancelled", skipped=True)
 
-            # 3. Spectral Analysis & Assets
-            fake_hq = self._check_fake_hq(raw_path, track, todo_hq)
-            await self._fetch_metadata_assets(track)
-
-            # 4. Transcode and Inject
-            success, total_bytes = await self._perform_transcoding_pipeline(
-                raw_path, hq_path, mobile_path, track, todo_hq, todo_mob
+            # 3-4. Análisis espectral (ffmpeg bloqueante) en un hilo, en paralelo con la transcodificación
+            success, total_bytes, fake_hq = await self._transcode_with_analysis(
+                raw_path, hq_path, mobile_path, track, todo_hq, todo_mob, assets_task
             )
 
             if success:
                 return DownloadResult(True, total_bytes, fake_hq=fake_hq)
             return DownloadResult(False, 0, "Transcode failed")
 
+        except RateLimitError as e:
+            self.log.error(f"Download error {track.title}: {e}")
+            return DownloadResult(False, 0, f"Error: {str(e)}", rate_limited=True)
         except Exception as e:
             self.log.error(f"Download error {track.title}: {e}")
             return DownloadResult(False, 0, f"Error: {str(e)}")
         finally:
+            if assets_task and not assets_task.done():
+                assets_task.cancel()
             self._cleanup_temp_raw(raw_path)
 
     def _validate_raw(self, path: Optional[Path]):
-        if not path or not path.exists() or path.stat().st_size < 1024:
+        if not path or _size_or_zero(path) < 1024:
             raise YouTubeError("Download failed or file corrupted")
 
-    def _check_fake_hq(self, raw_path: Path, track: TrackMetadata, needed_hq: bool) -> bool:
-        if self.cfg.SPECTRAL_ANALYSIS and self.analyzer and needed_hq:
-            if not self.analyzer.analyze_integrity(raw_path, self.cfg.SPECTRAL_CUTOFF):
-                self.log.warning(f"Fake HQ: {track.title}")
-                return True
+    async def _transcode_with_analysis(self, raw_path, hq_path, mobile_path, track, todo_hq, todo_mob, assets_task):
+        """Transcodifica mientras _check_fake_hq corre fuera del event loop.
+
+        El análisis usa subprocess.run; ejecutarlo en el loop congelaba a todos los workers.
+        """
+        fake_future = asyncio.ensure_future(self._check_fake_hq_async(raw_path, track, todo_hq))
+        try:
+            await assets_task
+            success, total_bytes = await self._perform_transcoding_pipeline(
+                raw_path, hq_path, mobile_path, track, todo_hq, todo_mob
+            )
+        finally:
+            # Esperar siempre: el RAW se borra al salir de download()
+            fake_hq = await fake_future
+        return success, total_bytes, fake_hq
+
+    async def _check_fake_hq_async(self, raw_path: Path, track: TrackMetadata, needed_hq: bool) -> bool:
+        # Sin análisis que hacer: no ocupar un permiso de ffmpeg ni un hilo
+        if not self._needs_spectral(raw_path, needed_hq):
+            return False
+        loop = asyncio.get_running_loop()
+        async with self._ffmpeg_sem:
+            return await loop.run_in_executor(None, self._check_fake_hq, raw_path, track)
+
+    def _check_fake_hq(self, raw_path: Path, track: TrackMetadata) -> bool:
+        """Análisis espectral (bloqueante); _check_fake_hq_async decide antes si hace falta"""
+        if not self.analyzer.analyze_integrity(raw_path, self.cfg.SPECTRAL_CUTOFF):
+            self.log.warning(f"Fake HQ: {track.title}")
+            return True
         return False
 
+    def _needs_spectral(self, raw_path: Path, needed_hq: bool) -> bool:
+        return bool(self.cfg.SPECTRAL_ANALYSIS and self.analyzer and needed_hq) and not self._trusted_source(raw_path)
+
+    def _trusted_source(self, raw_path: Path) -> bool:
+        """True si el códec/bitrate declarado ya descarta un falso HQ (sin FFT)"""
+        acodec, abr = self._raw_source.get(raw_path, ("", 0.0))
+        if acodec in _LOSSLESS_CODECS or acodec.startswith("pcm"):
+            return True
+        threshold = self.cfg.HQ_BITRATE_TRUST_THRESHOLD
+        return bool(threshold and abr >= threshold)
+
     async def _fetch_metadata_assets(self, track: TrackMetadata):
         if not track.cover_url:
-            self.log.debug(f"Sin cover_url para: {track.title}")
+            self.log.dlog("Sin cover_url para: %s", track.title)
             return
 
+        url = track.cover_url
         # Cache covers by URL — album tracks share the same art.
-        if track.cover_url in self._cover_cache:
-            track.cover_data = self._cover_cache[track.cover_url]
+        if url in self._cover_cache:
+            self._cover_cache.move_to_end(url)
+            track.cover_data = self._cover_cache[url]
             if not track.cover_data:
-                self.log.debug(f"Cover cache hit vacío para: {track.title} ({track.cover_url})")
+                self.log.debug(f"Cover cache hit vacío para: {track.title} ({url})")
             return
 
-        cover = await self._download_cover(track.cover_url)
-        if cover:
-            cover = await self._resize_cover(cover)
-
-        # Cache success and failures to avoid retry storms on bad URLs.
-        self._cover_cache[track.cover_url] = cover
+        fut = self._cover_inflight.get(url)
+        if fut is None:
+            fut = asyncio.ensure_future(self._load_cover(url))
+            self._cover_inflight[url] = fut
+            fut.add_done_callback(lambda _: self._cover_inflight.pop(url, None))
+        # shield: cancelar a un worker no aborta la descarga que esperan los demás
+        cover = await asyncio.shield(fut)
         track.cover_data = cover
 
         if not cover:
             self.log.debug(f"Cover no disponible para: {track.title} ({track.cover_url})")
 
+    async def _load_cover(self, url: str) -> Optional[bytes]:
+        cover = await self._download_cover(url)
+        if cover:
+            cover = await self._resize_cover(cover)
+
+        # Cache success and failures to avoid retry storms on bad URLs.
+        self._cover_cache[url] = cover
+        if len(self._cover_cache) > self.COVER_CACHE_SIZE:
+            self._cover_cache.popitem(last=False)
+        return cover
+
     async def _perform_transcoding_pipeline(
         self, raw_path, hq_path, mobile_path, track, todo_hq, todo_mob
     ) -> Tuple[bool, int]:
-        tasks = []
+        outputs = []
         if todo_hq:
-            tasks.append(self._transcode(raw_path, hq_path, self.cfg.QUALITY_HQ_BITRATE))
+            outputs.append((hq_path, self.cfg.QUALITY_HQ_BITRATE))
         if todo_mob:
-            tasks.append(self._transcode(raw_path, mobile_path, self.cfg.QUALITY_MOBILE_BITRATE))
+            outputs.append((mobile_path, self.cfg.QUALITY_MOBILE_BITRATE))
 
-        results = await asyncio.gather(*tasks)
+        # Ambas calidades: un solo ffmpeg (decodifica una vez, codifica dos)
+        if len(outputs) > 1:
+            results = await self._transcode_many(raw_path, outputs)
+        else:
+            results = [await self._transcode(raw_path, *outputs[0])]
 
         success = True
         total_bytes = 0
@@ -254,10 +533,11 @@ class AudioDownloader:
         return success, total_bytes
 
     def _cleanup_temp_raw(self, raw_path: Optional[Path]):
-        if raw_path and raw_path.exists():
+        if raw_path:
+            self._raw_source.pop(raw_path, None)
             try:
                 os.remove(raw_path)
-            except Exception:
+            except OSError:
                 pass
 
     async def _download_cover(self, url: str) -> Optional[bytes]:
@@ -266,30 +546,19 @@ class AudioDownloader:
             self.log.debug("Cover URL vacía; se omite descarga")
             return None
 
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/123.0.0.0 Safari/537.36"
-            ),
-            "Referer": "https://open.spotify.com/",
-        }
-        timeout = aiohttp.ClientTimeout(total=30, connect=10)
-
         for attempt in range(3):
             try:
                 # Cover URLs from Spotify CDN are public; avoid proxy latency/issues.
-                async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-                    async with session.get(url) as resp:
-                        if resp.status == 200:
-                            data = await resp.read()
-                            if not data:
-                                self.log.debug(f"Cover vacío (0 bytes): {url}")
-                                return None
-                            return data
-
-                        self.log.debug(f"Cover HTTP {resp.status}: {url}")
-                        return None
+                async with self._cover_session().get(url) as resp:
+                    if resp.status == 200:
+                        data = await resp.read()
+                        if not data:
+                            self.log.debug(f"Cover vacío (0 bytes): {url}")
+                            return None
+                        return data
+
+                    self.log.debug(f"Cover HTTP {resp.status}: {url}")
+                    return None
             except (asyncio.TimeoutError, aiohttp.ServerTimeoutError, aiohttp.ClientResponseError):
                 self.log.debug(f"Cover timeout (intento {attempt + 1}/3): {url}")
                 if attempt < 2:
@@ -305,27 +574,37 @@ class AudioDownloader:
         return None
 
     async def _inject_metadata(self, path: Path, track: TrackMetadata):
-        # Mutagen is blocking file I/O. Wrap in thread.
+        # Letras por aiohttp (no ocupa un hilo); mutagen es I/O bloqueante -> thread.
+        lyrics_info = await self._fetch_lyrics(track)
         loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._inject_metadata_sync, path, track)
+        await loop.run_in_executor(self._tag_pool, self._inject_metadata_sync, path, track, lyrics_info)
+
+    async def _fetch_lyrics(self, track: TrackMetadata) -> Tuple[Optional[str], str]:
+        try:
+            return await fetch_lyrics_with_info_async(track.artist, track.title, track.album, track.duration_seconds)
+        except Exception as e:
+            self.log.debug(f"Error obteniendo letras: {e}")
+            return None, "none"
 
-    def _inject_metadata_sync(self, file_path: Path, track: TrackMetadata):
+    def _inject_metadata_sync(
+        self, file_path: Path, track: TrackMetadata, lyrics_info: Optional[Tuple[Optional[str], str]] = None
+    ):
         """Synchronous part of metadata injection for M4A (AAC)"""
         try:
             audio = MP4(str(file_path))
             # Clear any residual metadata from yt-dlp/ffmpeg to prevent
             # encoding corruption (e.g. UTF-8 read as Latin-1 → "QuiÃ©n")
             audio.clear()
-            self._apply_m4a_tags(audio, track)
+            self._apply_m4a_tags(audio, track, lyrics_info)
             audio.save()
-            self.log.debug(f"Metadatos inyectados: {track.title}")
+            self.log.dlog("Metadatos inyectados: %s", track.title)
         except Exception as e:
             self.log.debug(f"Metadata error: {e}")
 
-    def _apply_m4a_tags(self, audio: MP4, track: TrackMetadata):
+    def _apply_m4a_tags(self, audio: MP4, track: TrackMetadata, lyrics_info=None):
         """Apply all metadata tags to M4A file using iTunes atoms"""
         self._apply_m4a_basic_tags(audio, track)
-        self._apply_m4a_extra_tags(audio, track)
+        self._apply_m4a_extra_tags(audio, track, lyrics_info)
 
     @staticmethod
     def _nfc(text: str) -> str:
@@ -368,7 +647,7 @@ class AudioDownloader:
         if track.tempo > 0:
             audio["tmpo"] = [int(round(track.tempo))]
 
-    def _apply_m4a_extra_tags(self, audio: MP4, track: TrackMetadata):
+    def _apply_m4a_extra_tags(self, audio: MP4, track: TrackMetadata, lyrics_info=None):
         self._apply_m4a_number_tag(audio, "trkn", track.track_number)
         self._apply_m4a_number_tag(audio, "disk", track.disc_number)
 
@@ -377,7 +656,7 @@ class AudioDownloader:
         else:
             self.log.debug(f"Sin cover_data para: {track.title} (cover_url={track.cover_url!r})")
 
-        self._apply_m4a_lyrics(audio, track)
+        self._apply_m4a_lyrics(audio, track, lyrics_info)
         self._apply_m4a_composer(audio, track)
 
     def _apply_m4a_number_tag(self, audio: MP4, key: str, value: str):
@@ -389,10 +668,10 @@ class AudioDownloader:
         except ValueError:
             pass
 
-    def _apply_m4a_lyrics(self, audio: MP4, track: TrackMetadata):
-        """Fetch and embed lyrics into an M4A file."""
+    def _apply_m4a_lyrics(self, audio: MP4, track: TrackMetadata, lyrics_info=None):
+        """Embed lyrics into an M4A file (fetching them if not prefetched)."""
         try:
-            lyrics, lyrics_type = fetch_lyrics_with_info(
+            lyrics, lyrics_type = lyrics_info or fetch_lyrics_with_info(
                 track.artist,
                 track.title,
                 track.album,
@@ -400,7 +679,7 @@ class AudioDownloader:
             )
             if lyrics:
                 audio["\xa9lyr"] = [lyrics]
-                self.log.debug(f"Letras embebidas: {track.title} (tipo={lyrics_type})")
+                self.log.dlog("Letras embebidas: %s (tipo=%s)", track.title, lyrics_type)
         except Exception as e:
             self.log.debug(f"Error obteniendo letras: {e}")
 
@@ -412,7 +691,7 @@ class AudioDownloader:
             composer = get_composer_string(track.isrc)
             if composer:
                 audio["\xa9wrt"] = [composer]
-                self.log.debug(f"Compositor: {composer}")
+                self.log.dlog("Compositor: %s", composer)
         except Exception as e:
             self.log.debug(f"Error obteniendo compositor: {e}")
 
@@ -435,29 +714,10 @@ class AudioDownloader:
 
     def _get_ytdlp_options(self, out_tmpl: Path, proxy: Optional[str]) -> dict:
         """Configura el diccionario de opciones para yt-dlp"""
-        opts = {
-            "format": "bestaudio/best",
-            "outtmpl": str(out_tmpl),
-            "quiet": True,
-            "no_warnings": True,
-            "noprogress": True,
-            "socket_timeout": 15,
-            "retries": 3,
-            "fragment_retries": 10,
-            "skip_unavailable_fragments": True,
-            "geo_bypass": True,
-            "http_headers": {
-                "User-Agent": random.choice(USER_AGENTS),  # nosec B311
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "en-us,en;q=0.5",
-                "Sec-Fetch-Mode": "navigate",
-            },
-            "extractor_args": {
-                "youtube": {
-                    "player_client": ["android", "web"],
-                }
-            },
-        }
+        # Copia superficial de la plantilla; solo cambian outtmpl y el User-Agent rotado
+        opts = dict(_YTDLP_BASE_OPTS)
+        opts["outtmpl"] = str(out_tmpl)
+        opts["http_headers"] = {**_YTDLP_HEADERS, "User-Agent": get_random_user_agent()}
 
         if self.cfg.DEBUG_MODE:
             opts.update({"quiet": False, "no_warnings": False, "verbose": True})
@@ -471,13 +731,15 @@ class AudioDownloader:
 
     async def _download_raw(self, url: str, name: str) -> Path:
         """Async wrapper around yt-dlp download"""
-        temp_dir = Path(tempfile.gettempdir())
+        temp_dir = self._scratch_dir()
         out_tmpl = temp_dir / f"ytraw_{name}_{int(time.time())}.%(ext)s"
 
         proxy = await self.proxy_manager.get_proxy_async() if self.proxy_manager else None
         opts = self._get_ytdlp_options(out_tmpl, proxy)
         opts["logger"] = self._setup_ytdlp_logger()
 
+        import yt_dlp
+
         loop = asyncio.get_running_loop()
         try:
             return await loop.run_in_executor(None, self._execute_ydl, url, opts, temp_dir)
@@ -489,28 +751,11 @@ class AudioDownloader:
             raise YouTubeError(f"Error inesperado en yt-dlp: {e}") from e
 
     def _setup_ytdlp_logger(self):
-        class FileLogger:
-            """Simple file logger for yt-dlp output."""
-
-            def _log(self, prefix, msg):
-                with open("ytdlp_raw.log", "a", encoding="utf-8") as f:
-                    f.write(f"[{prefix}] {msg}\n")
-
-            def debug(self, msg):
-                """Log debug message."""
-                self._log("DEBUG", msg)
-
-            def warning(self, msg):
-                """Log warning message."""
-                self._log("WARNING", msg)
-
-            def error(self, msg):
-                """Log error message."""
-                self._log("ERROR", msg)
-
-        return FileLogger()
+        return _YTDLP_FILE_LOGGER
 
     def _execute_ydl(self, url, opts, temp_dir) -> Path:
+        import yt_dlp
+
         with yt_dlp.YoutubeDL(opts) as ydl:
             info = ydl.extract_info(url, download=True)
             if not info:
@@ -518,18 +763,17 @@ class AudioDownloader:
 
             final_path = Path(ydl.prepare_filename(info))
             if not final_path.exists():
-                recovered = self._attempt_recovery(temp_dir, final_path)
-                if recovered:
-                    return recovered
+                final_path = self._attempt_recovery(temp_dir, final_path) or final_path
+            self._raw_source[final_path] = (str(info.get("acodec") or "").lower(), float(info.get("abr") or 0))
             return final_path
 
     def _attempt_recovery(self, temp_dir: Path, final_path: Path) -> Optional[Path]:
         try:
-            files = list(temp_dir.glob("*"))
             stem = final_path.stem
-            for f in files:
-                if f.stem == stem:
-                    return f
+            with os.scandir(temp_dir) as it:
+                for entry in it:
+                    if Path(entry.name).stem == stem:
+                        return Path(entry.path)
         except Exception:
             pass
         return None
@@ -540,9 +784,9 @@ class AudioDownloader:
 
         err_str = str(e).lower()
         if "429" in err_str or "too many requests" in err_str:
-            self.log.warning("YouTube Rate Limit detected (HTTP 429). Pausing for 60s...")
-            time.sleep(60)
-            raise RecoverableError("Rate Limit (429) - Retrying after pause")
+            # Sin time.sleep aquí: bloqueaba el event loop; el manager espera con backoff async
+            self.log.warning("YouTube Rate Limit detected (HTTP 429). Backing off...")
+            raise RateLimitError("Rate Limit (429)")
 
         if "copyright" in err_str or "blocked" in err_str:
             raise CopyrightError(f"Bloqueado: {str(e)[:50]}")
@@ -554,58 +798,67 @@ class AudioDownloader:
 
     def _build_ffmpeg_cmd(self, input_path: Path, output_path: Path, bitrate: str) -> list:
         """Construye el comando ffmpeg para AAC (M4A)"""
-        cmd = ["ffmpeg", "-y", "-v", "error", "-i", str(input_path), "-vn"]
+        return self._build_ffmpeg_multi_cmd(input_path, [(output_path, bitrate)])
+
+    def _build_ffmpeg_multi_cmd(self, input_path: Path, outputs: list) -> list:
+        """
+        Un solo ffmpeg para una o varias salidas AAC [(ruta, bitrate), ...].
+        La entrada se decodifica (y normaliza) una vez; con varias salidas el
+        audio se reparte con asplit y cada codificador toma su rama con -map.
+        """
+        cmd = ["ffmpeg", "-y", "-v", "error", "-threads", self._ffmpeg_threads, "-i", str(input_path)]
+        labels = [None] * len(outputs)
+        per_output_filter = []
         if self.cfg.NORMALIZE_AUDIO:
-            cmd.extend(["-filter:a", "loudnorm=I=-14:TP=-1.5:LRA=11"])
-
-        cmd.extend(
-            [
-                "-acodec",
-                "aac",
-                "-b:a",
-                f"{bitrate}k",
-                "-ar",
-                "44100",
-                "-ac",
-                "2",
-                "-movflags",
-                "+faststart",
-                "-map_metadata",
-                "-1",
-                str(output_path),
-            ]
-        )
+            norm = _NORMALIZE_FILTERS.get(self.cfg.NORMALIZE_FILTER, _NORMALIZE_FILTERS["dynaudnorm"])
+            if len(outputs) == 1:
+                per_output_filter = ["-filter:a", norm]
+            else:
+                labels = [f"[a{i}]" for i in range(len(outputs))]
+                cmd.extend(["-filter_complex", f"[0:a]{norm},asplit={len(outputs)}{''.join(labels)}"])
+
+        # Las opciones de salida (incluido -vn) aplican solo al archivo que las sigue.
+        # Sin -movflags +faststart: moov queda al final, así mutagen añade tags/portada
+        # sin reescribir el mdat (faststart ya costaba una segunda pasada de ffmpeg).
+        for (output_path, bitrate), label in zip(outputs, labels):
+            if label:
+                cmd.extend(["-map", label])
+            cmd.append("-vn")
+            cmd.extend(per_output_filter)
+            cmd.extend(("-acodec", "aac", "-b:a", f"{bitrate}k"))
+            cmd.extend(_AAC_OUTPUT_TAIL)
+            cmd.extend(("-threads", self._ffmpeg_threads, "-map_metadata", "-1", str(output_path)))
         return cmd
 
     async def _transcode(self, input_path: Path, output_path: Path, bitrate: str) -> bool:
-        cmd = self._build_ffmpeg_cmd(input_path, output_path, bitrate)
+        return (await self._transcode_many(input_path, [(output_path, bitrate)]))[0]
 
-        try:
-            # Async subprocess
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                creationflags=0x08000000 if os.name == "nt" else 0,
-            )
-            _, stderr = await proc.communicate()
-
-            if proc.returncode == 0 and output_path.exists() and output_path.stat().st_size > 0:
-                return True
+    async def _transcode_many(self, input_path: Path, outputs: list) -> list:
+        """Transcodifica a todas las salidas en un proceso; devuelve un bool por salida."""
+        cmd = self._build_ffmpeg_multi_cmd(input_path, outputs)
 
-            self.log.debug(f"Transcode failed (RC={proc.returncode}): {stderr.decode(errors='ignore')}")
-            if output_path.exists():
-                try:
-                    os.remove(output_path)
-                except Exception:
-                    pass
-            return False
+        try:
+            async with self._ffmpeg_sem:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    creationflags=0x08000000 if os.name == "nt" else 0,
+                )
+                _, stderr = await proc.communicate()
+
+            results = [proc.returncode == 0 and _size_or_zero(output_path) > 0 for output_path, _ in outputs]
+            if not all(results):
+                self.log.debug(f"Transcode failed (RC={proc.returncode}): {stderr.decode(errors='ignore')}")
 
         except Exception as e:
             self.log.debug(f"Transcode exec error: {e}")
-            if output_path.exists():
+            results = [False] * len(outputs)
+
+        for ok, (output_path, _) in zip(results, outputs):
+            if not ok:
                 try:
                     os.remove(output_path)
-                except Exception:
+                except OSError:
                     pass
-            return False
+        return results
@@ -1,12 +1,87 @@
+import asyncio
 import re
+import threading
 from typing import Optional
 
-import requests
+import aiohttp
+
+from resonance_audio_builder.core import shutdown
 
 LRCLIB_HEADERS = {
     "User-Agent": "ResonanceAudioBuilder/1.0 (https://github.com/resonance)",
 }
 
+_MAX_CONCURRENCY = 32
+_RETRY_STATUS = {502, 503, 504}
+_RETRIES = 2
+_SYNC_TIMEOUT = 60
+
+
+class _LyricsIO:
+    """Event loop dedicado (hilo daemon) dueño de la sesión aiohttp compartida."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="lyrics-io", daemon=True).start()
+            return self._loop
+
+    def submit(self, coro):
+        """Schedule a coroutine on the lyrics loop and return a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def session(self) -> tuple[aiohttp.ClientSession, asyncio.Semaphore]:
+        # Solo se llama desde el loop de letras
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=64, limit_per_host=8, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector, headers=LRCLIB_HEADERS)
+            self._sem = asyncio.Semaphore(_MAX_CONCURRENCY)
+        return self._session, self._sem
+
+    async def _aclose(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    def close(self):
+        """Close the shared session and stop the loop."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            self.submit(self._aclose()).result(timeout=5)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_lyrics_io = _LyricsIO()
+shutdown.register(_lyrics_io.close)
+
+
+async def _get_json(url: str, params: dict, timeout: float):
+    """GET con reintentos (502/503/504 y keep-alive cerrado por el servidor). Devuelve el JSON si HTTP 200."""
+    session, sem = _lyrics_io.session()
+    for attempt in range(_RETRIES + 1):
+        try:
+            async with sem:
+                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                    if resp.status == 200:
+                        return await resp.json(content_type=None)
+                    if resp.status not in _RETRY_STATUS:
+                        return None
+        except aiohttp.ServerDisconnectedError:
+            pass
+        if attempt < _RETRIES:
+            await asyncio.sleep(0.3 * 2**attempt)
+    return None
+
 
 def _clean_artist(artist: str) -> str:
     """Solo el primer artista listado."""
@@ -34,12 +109,12 @@ def _extract_lyrics(payload: dict) -> tuple[Optional[str], str]:
     return None, "none"
 
 
-def _try_lrclib_endpoint(url: str, params: dict) -> Optional[tuple[Optional[str], str]]:
+async def _try_lrclib_endpoint(url: str, params: dict) -> Optional[tuple[Optional[str], str]]:
     """Try a single LRCLIB endpoint and extract lyrics if found."""
     try:
-        resp = requests.get(url, params=params, timeout=5 if "search" in url else 10, headers=LRCLIB_HEADERS)
-        if resp.status_code == 200:
-            lyrics, lyrics_type = _extract_lyrics(resp.json())
+        payload = await _get_json(url, params, 5 if "search" in url else 10)
+        if payload:
+            lyrics, lyrics_type = _extract_lyrics(payload)
             if lyrics:
                 return lyrics, lyrics_type
     except Exception:
@@ -47,7 +122,7 @@ def _try_lrclib_endpoint(url: str, params: dict) -> Optional[tuple[Optional[str]
     return None
 
 
-def _fetch_lrclib(artist: str, title: str, album: str = "", duration_sec: int = 0) -> tuple[Optional[str], str]:
+async def _fetch_lrclib(artist: str, title: str, album: str = "", duration_sec: int = 0) -> tuple[Optional[str], str]:
     """
     Try LRCLIB endpoints in descending precision:
     1) /api/get-cached
@@ -64,7 +139,7 @@ def _fetch_lrclib(artist: str, title: str, album: str = "", duration_sec: int =
         }
 
         for endpoint in ["get-cached", "get"]:
-            result = _try_lrclib_endpoint(f"https://lrclib.net/api/{endpoint}", params)
+            result = await _try_lrclib_endpoint(f"https://lrclib.net/api/{endpoint}", params)
             if result:
                 return result
 
@@ -74,19 +149,12 @@ def _fetch_lrclib(artist: str, title: str, album: str = "", duration_sec: int =
         search_params["album_name"] = album
 
     try:
-        resp = requests.get(
-            "https://lrclib.net/api/search",
-            params=search_params,
-            timeout=5,
-            headers=LRCLIB_HEADERS,
-        )
-        if resp.status_code == 200:
-            results = resp.json()
-            data = results if isinstance(results, dict) else results[0] if results else None
-            if data:
-                lyrics, lyrics_type = _extract_lyrics(data)
-                if lyrics:
-                    return lyrics, lyrics_type
+        results = await _get_json("https://lrclib.net/api/search", search_params, 5)
+        data = results if isinstance(results, dict) else results[0] if results else None
+        if data:
+            lyrics, lyrics_type = _extract_lyrics(data)
+            if lyrics:
+                return lyrics, lyrics_type
     except Exception:
         pass
 
@@ -112,6 +180,37 @@ def _fetch_genius(artist: str, title: str) -> Optional[str]:
     return None
 
 
+async def _fetch_lyrics_with_info(artist: str, title: str, album: str, duration_sec: int) -> tuple[Optional[str], str]:
+    clean_artist = _clean_artist(artist)
+    clean_title = _clean_title(title)
+    clean_album = _clean_title(album) if album else ""
+
+    lyrics, lyrics_type = await _fetch_lrclib(clean_artist, clean_title, clean_album, duration_sec)
+    if lyrics:
+        return lyrics, lyrics_type
+
+    # lyricsgenius es bloqueante
+    lyrics = await asyncio.to_thread(_fetch_genius, clean_artist, clean_title)
+    if lyrics:
+        return lyrics, "plain"
+
+    return None, "none"
+
+
+async def fetch_lyrics_with_info_async(
+    artist: str,
+    title: str,
+    album: str = "",
+    duration_sec: int = 0,
+) -> tuple[Optional[str], str]:
+    """Async version of fetch_lyrics_with_info, usable from any event loop."""
+    if isinstance(album, int) and duration_sec == 0:
+        duration_sec = album
+        album = ""
+    future = _lyrics_io.submit(_fetch_lyrics_with_info(artist, title, album, duration_sec))
+    return await asyncio.wrap_future(future)
+
+
 def fetch_lyrics_with_info(
     artist: str,
     title: str,
@@ -125,19 +224,12 @@ def fetch_lyrics_with_info(
         duration_sec = album
         album = ""
 
-    clean_artist = _clean_artist(artist)
-    clean_title = _clean_title(title)
-    clean_album = _clean_title(album) if album else ""
-
-    lyrics, lyrics_type = _fetch_lrclib(clean_artist, clean_title, clean_album, duration_sec)
-    if lyrics:
-        return lyrics, lyrics_type
-
-    lyrics = _fetch_genius(clean_artist, clean_title)
-    if lyrics:
-        return lyrics, "plain"
-
-    return None, "none"
+    # Shim síncrono para llamadores en hilos (tagging, executor del downloader)
+    try:
+        future = _lyrics_io.submit(_fetch_lyrics_with_info(artist, title, album, duration_sec))
+        return future.result(timeout=_SYNC_TIMEOUT)
+    except Exception:
+        return None, "none"
 
 
 def fetch_lyrics(artist: str, title: str, album: str = "", duration_sec: int = 0) -> Optional[str]:
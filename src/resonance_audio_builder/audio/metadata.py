@@ -3,38 +3,117 @@
 import hashlib
 import re
 from dataclasses import dataclass, field
-from functools import partial
+from functools import lru_cache
 from typing import List, Optional
 
-
-def _get_value(r_norm: dict, *keys) -> str:
-    """Look up a value from a normalized dict by trying multiple keys."""
+# Tabla de traducción para safe_filename:
+# - Barras se reemplazan por guiones
+# - Prohibidos en Windows: < > : " | ? *
+# - Peligrosos en shell: ; $ # & ! { }
+# (parentesis y corchetes están permitidos)
+_FILENAME_TRANS = str.maketrans({"/": "-", "\\": "-", **dict.fromkeys('<>:"|?*;$#&!{}')})
+
+
+# Alias de columnas CSV (ya normalizados: strip + lower) por campo, en orden de preferencia
+_CSV_ALIASES = {
+    "isrc": ("isrc", "code"),
+    "artist": ("artist name(s)", "artist", "artist name"),
+    "title": ("track name", "track", "title", "name"),
+    "album": ("album name", "album"),
+    "album_artist": ("album artist name(s)", "album artist"),
+    "release_date": ("album release date", "release date", "date", "year"),
+    "track_number": ("track number", "track no"),
+    "disc_number": ("disc number", "disc no"),
+    "duration_ms": ("track duration (ms)", "duration ms", "duration", "ms"),
+    "spotify_uri": ("track uri", "spotify uri", "uri"),
+    "cover_url": ("album image url", "image url", "cover"),
+    "popularity": ("popularity",),
+    "explicit": ("explicit",),
+    "genres": ("artist genres", "genres", "genre"),
+    "album_genres": ("album genres",),
+    "label": ("label", "publisher"),
+    "copyrights": ("copyrights", "copyright"),
+    "preview_url": ("track preview url", "preview url"),
+    "added_by": ("added by",),
+    "added_at": ("added at",),
+    "tempo": ("tempo", "bpm"),
+    "energy": ("energy",),
+    "danceability": ("danceability",),
+    "valence": ("valence",),
+    "acousticness": ("acousticness",),
+    "instrumentalness": ("instrumentalness",),
+    "liveness": ("liveness",),
+    "speechiness": ("speechiness",),
+    "loudness": ("loudness",),
+    "key": ("key",),
+    "mode": ("mode",),
+    "time_signature": ("time signature", "time_signature"),
+}
+
+
+def _get_value(row: dict, keys: tuple) -> str:
+    """Return the first non-missing value among the resolved header keys."""
     for k in keys:
-        val = r_norm.get(k.lower())
+        val = row.get(k)
         if val is not None:
             return val.strip()
     return ""
 
 
-def _get_float(r_norm: dict, *keys) -> float:
-    """Look up a float value from a normalized dict."""
+def _get_float(row: dict, keys: tuple) -> float:
+    """Look up a float value from the resolved header keys."""
     try:
-        val = _get_value(r_norm, *keys)
+        val = _get_value(row, keys)
         return float(val) if val else 0.0
     except ValueError:
         return 0.0
 
 
-def _get_int(r_norm: dict, *keys) -> int:
-    """Look up an int value from a normalized dict."""
+def _get_int(row: dict, keys: tuple) -> int:
+    """Look up an int value from the resolved header keys."""
     try:
-        val = _get_value(r_norm, *keys)
+        val = _get_value(row, keys)
         return int(float(val)) if val else 0
     except ValueError:
         return 0
 
 
-@dataclass
+def make_track_id(artist: str, title: str) -> str:
+    """ID estable para pistas sin ISRC: BLAKE2b de 64 bits (16 hex), más rápido que MD5 truncado."""
+    return hashlib.blake2b(f"{artist}_{title}".encode(), digest_size=8).hexdigest()
+
+
+def legacy_track_id(artist: str, title: str) -> str:
+    """ID usado antes de make_track_id (MD5 truncado); solo para migrar progress.db."""
+    return hashlib.md5(f"{artist}_{title}".encode(), usedforsecurity=False).hexdigest()[:16]
+
+
+_CSV_FLOAT_FIELDS = (
+    "tempo",
+    "energy",
+    "danceability",
+    "valence",
+    "acousticness",
+    "instrumentalness",
+    "liveness",
+    "speechiness",
+    "loudness",
+)
+_CSV_INT_FIELDS = ("duration_ms", "popularity", "key", "mode", "time_signature")
+# Conversor por campo (texto por defecto)
+_CSV_GETTERS = {
+    name: _get_float if name in _CSV_FLOAT_FIELDS else _get_int if name in _CSV_INT_FIELDS else _get_value
+    for name in _CSV_ALIASES
+}
+
+
+@lru_cache(maxsize=64)
+def _raw_header(keys: tuple) -> tuple:
+    """Cabeceras limpias compartidas por todas las filas del mismo CSV."""
+    return tuple(k.strip() for k in keys)
+
+
+@dataclass(slots=True)
 class TrackMetadata:
     """Represents metadata for a single audio track."""
 
@@ -51,7 +130,9 @@ class TrackMetadata:
     cover_url: str = ""
     duration_ms: int = 0
     cover_data: Optional[bytes] = None
-    raw_data: dict = field(default_factory=dict)
+    # Fila CSV original como tuplas (cabecera compartida), ver raw_data
+    raw_fields: tuple = ()
+    raw_values: tuple = ()
 
     # Metadatos extendidos
     genres: str = ""
@@ -83,6 +164,15 @@ class TrackMetadata:
     mode: int = 0  # 0 = minor, 1 = major
     time_signature: int = 4
 
+    # Playlist de origen (asignado por App._collect_tracks)
+    playlist_subfolder: str = ""
+    playlists: List[str] = field(default_factory=list)
+
+    @property
+    def raw_data(self) -> dict:
+        """Fila CSV original (cabeceras sin espacios), reconstruida bajo demanda."""
+        return dict(zip(self.raw_fields, self.raw_values))
+
     @property
     def artists(self) -> List[str]:
         r"""
@@ -114,61 +204,30 @@ class TrackMetadata:
             return []
         return [g.strip() for g in self.genres.split(",") if g.strip()]
 
+    @staticmethod
+    def build_resolver(fieldnames) -> dict:
+        """
+        Resuelve una sola vez por CSV qué cabeceras originales alimentan cada campo.
+        Devuelve {campo: (cabecera, ...)} en orden de preferencia de alias.
+        """
+        by_norm = {name.strip().lower(): name for name in fieldnames if name is not None}
+        return {f: tuple(by_norm[a] for a in aliases if a in by_norm) for f, aliases in _CSV_ALIASES.items()}
+
     @classmethod
-    def from_csv_row(cls, row: dict) -> "TrackMetadata":
+    def from_csv_row(cls, row: dict, resolver: Optional[dict] = None) -> "TrackMetadata":
         """Create a TrackMetadata instance from a CSV row dictionary."""
-        r_norm = {k.strip().lower(): v for k, v in row.items()}
-        r_orig = {k.strip(): v for k, v in row.items()}
-
-        gv = partial(_get_value, r_norm)
-        gf = partial(_get_float, r_norm)
-        gi = partial(_get_int, r_norm)
-
-        isrc = gv("isrc", "code")
-        artist = gv("artist name(s)", "artist", "artist name")
-        title = gv("track name", "track", "title", "name")
-
-        if isrc:
-            tid = f"isrc_{isrc}"
-        else:
-            tid = hashlib.md5(f"{artist}_{title}".encode(), usedforsecurity=False).hexdigest()[:16]
-
-        return cls(
-            track_id=tid,
-            artist=artist,
-            title=title,
-            isrc=isrc,
-            album=gv("album name", "album"),
-            album_artist=gv("album artist name(s)", "album artist"),
-            release_date=gv("album release date", "release date", "date", "year"),
-            track_number=gv("track number", "track no"),
-            disc_number=gv("disc number", "disc no"),
-            duration_ms=gi("track duration (ms)", "duration ms", "duration", "ms"),
-            spotify_uri=gv("track uri", "spotify uri", "uri"),
-            cover_url=gv("album image url", "image url", "cover"),
-            raw_data=r_orig,
-            popularity=gi("popularity"),
-            explicit=gv("explicit").lower() in ("true", "1", "yes"),
-            genres=gv("artist genres", "genres", "genre"),
-            album_genres=gv("album genres"),
-            label=gv("label", "publisher"),
-            copyrights=gv("copyrights", "copyright"),
-            preview_url=gv("track preview url", "preview url"),
-            added_by=gv("added by"),
-            added_at=gv("added at"),
-            tempo=gf("tempo", "bpm"),
-            energy=gf("energy"),
-            danceability=gf("danceability"),
-            valence=gf("valence"),
-            acousticness=gf("acousticness"),
-            instrumentalness=gf("instrumentalness"),
-            liveness=gf("liveness"),
-            speechiness=gf("speechiness"),
-            loudness=gf("loudness"),
-            key=gi("key"),
-            mode=gi("mode"),
-            time_signature=gi("time signature", "time_signature") or 4,
-        )
+        if resolver is None:
+            resolver = cls.build_resolver(row.keys())
+
+        values = {name: _CSV_GETTERS[name](row, keys) for name, keys in resolver.items()}
+
+        values["explicit"] = values["explicit"].lower() in ("true", "1", "yes")
+        values["time_signature"] = values["time_signature"] or 4
+
+        isrc, artist, title = values["isrc"], values["artist"], values["title"]
+        tid = f"isrc_{isrc}" if isrc else make_track_id(artist, title)
+
+        return cls(track_id=tid, raw_fields=_raw_header(tuple(row)), raw_values=tuple(row.values()), **values)
 
     @property
     def duration_seconds(self) -> int:
@@ -178,20 +237,11 @@ class TrackMetadata:
     @property
     def safe_filename(self) -> str:
         """Generate a filesystem-safe filename from artist and title."""
-        name = f"{self.artist} - {self.title}"
-
-        # 1. Reemplazo inteligente de barras por guiones (AC/DC -> AC-DC)
-        name = name.replace("/", "-").replace("\\", "-")
-
-        # 2. Caracteres prohibidos en Windows y Shell
-        # (pero permitimos parentesis y corchetes)
-        # Prohibidos: < > : " | ? * y también ; $ # & ! { }
-        # (peligrosos en shell)
-        invalids = '<>:"|?*;$#&!{}'
-        for char in invalids:
-            name = name.replace(char, "")
+        # Una sola pasada en C: barras -> guiones (AC/DC -> AC-DC) y
+        # eliminación de caracteres prohibidos (ver _FILENAME_TRANS)
+        name = f"{self.artist} - {self.title}".translate(_FILENAME_TRANS)
 
-        # 3. Limpieza de secuencias peligrosas
+        # Limpieza de secuencias peligrosas
         # Evitar .. para path traversal
         while ".." in name:
             name = name.replace("..", ".")
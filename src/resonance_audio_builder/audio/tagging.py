@@ -2,6 +2,7 @@ import time
 import unicodedata
 from pathlib import Path
 
+from mutagen import MutagenError
 from mutagen.mp4 import MP4, MP4Cover
 
 from resonance_audio_builder.audio.lyrics import fetch_lyrics_with_info
@@ -9,6 +10,9 @@ from resonance_audio_builder.audio.metadata import TrackMetadata
 from resonance_audio_builder.audio.musicbrainz import fetch_credits
 from resonance_audio_builder.core.logger import Logger
 
+# Esperas entre reintentos de save() cuando el archivo está bloqueado (Windows/antivirus)
+_SAVE_RETRY_DELAYS = (0.02, 0.05, 0.2, 0.5)
+
 
 class MetadataWriter:
     """Writes M4A metadata tags using Mutagen."""
@@ -24,17 +28,10 @@ class MetadataWriter:
         # Enriquecer con datos externos (MusicBrainz)
         self._enrich_metadata(meta)
 
-        # Mecanismo de reintento por si el archivo está bloqueado por Windows
-        # o Antivirus
-        max_retries = 3
-        for i in range(max_retries):
-            try:
-                self._write_m4a_tags(path, meta)
-                break
-            except Exception as e:
-                if i == max_retries - 1:
-                    self.log.error(f"FATAL METADATA ERROR ({path.name}): {e}")
-                time.sleep(0.5)
+        try:
+            self._write_m4a_tags(path, meta)
+        except Exception as e:
+            self.log.error(f"FATAL METADATA ERROR ({path.name}): {e}")
 
     def _enrich_metadata(self, meta: TrackMetadata):
         """Enriquece los metadatos con MusicBrainz si está disponible"""
@@ -55,10 +52,7 @@ class MetadataWriter:
             self.log.debug(f"Failed to fetch MusicBrainz credits: {e}")
 
     def _write_m4a_tags(self, path: Path, meta: TrackMetadata):
-        try:
-            audio = MP4(path)
-        except Exception:
-            audio = MP4(str(path))
+        audio = self._retry_locked(MP4, path)
 
         # Clear residual metadata to prevent encoding corruption
         audio.clear()
@@ -85,7 +79,20 @@ class MetadataWriter:
             self._embed_cover_m4a(audio, meta.cover_data)
 
         self._write_m4a_extended_tags(audio, meta)
-        audio.save()
+        self._retry_locked(audio.save)
+
+    @staticmethod
+    def _retry_locked(fn, *args):
+        """Reintenta solo la operación de archivo (abrir/guardar), no la construcción de tags.
+
+        En Windows el fallo típico es un bloqueo breve del antivirus: backoff corto.
+        """
+        for delay in _SAVE_RETRY_DELAYS:
+            try:
+                return fn(*args)
+            except (OSError, MutagenError):
+                time.sleep(delay)
+        return fn(*args)
 
     def _write_m4a_basic_tags(self, audio, meta: TrackMetadata):
         self._write_m4a_text_tags(audio, meta)
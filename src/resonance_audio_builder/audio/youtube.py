@@ -1,14 +1,13 @@
 import asyncio
 import math
-import random
 import re
 import unicodedata
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 import aiohttp
-import yt_dlp
 
 from resonance_audio_builder.audio.metadata import TrackMetadata
 from resonance_audio_builder.core.config import Config
@@ -16,7 +15,43 @@ from resonance_audio_builder.core.exceptions import NotFoundError
 from resonance_audio_builder.core.logger import Logger
 from resonance_audio_builder.network.cache import CacheManager
 from resonance_audio_builder.network.proxies import SmartProxyManager
-from resonance_audio_builder.network.utils import USER_AGENTS, validate_cookies_file
+from resonance_audio_builder.network.utils import get_random_user_agent, validate_cookies_file
+
+# Plantilla de opciones yt-dlp para búsquedas; por llamada solo cambian timeout, UA, proxy y cookies
+_SEARCH_BASE_OPTS = {
+    "quiet": True,
+    "no_warnings": True,
+    "extract_flat": True,
+    "noplaylist": True,
+    "retries": 2,
+    "extractor_args": {
+        "youtube": {
+            "player_client": ["android", "web"],
+        }
+    },
+}
+_SEARCH_FALLBACK_EXTRACTOR_ARGS = {"youtube": {"player_client": ["web"]}}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_MATCH_STOPWORDS = frozenset(("the", "a", "an", "and", "feat", "featuring", "ft", "x"))
+
+
+# Query, artista y título se repiten en cada candidato (y los títulos entre
+# plantillas de búsqueda): normalizar y tokenizar una sola vez por texto.
+@lru_cache(maxsize=4096)
+def _ascii_lower(text: str) -> str:
+    """Unicode -> ASCII en minúsculas (sin acentos)."""
+    return unicodedata.normalize("NFD", text).encode("ascii", "ignore").decode("ascii").lower()
+
+
+@lru_cache(maxsize=4096)
+def _text_tokens(text: str) -> frozenset:
+    return frozenset(_TOKEN_RE.findall(_ascii_lower(text)))
+
+
+@lru_cache(maxsize=4096)
+def _essential_text_tokens(text: str) -> frozenset:
+    return frozenset(tok for tok in _text_tokens(text) if tok not in _MATCH_STOPWORDS and len(tok) > 1)
 
 
 @dataclass
@@ -54,6 +89,7 @@ class YouTubeSearcher:
         "parodia",
         "parody",
     )
+    _HARD_EXCLUDE_SET = frozenset(HARD_EXCLUDES)
     VERSION_PENALTY_TOKENS = frozenset(
         (
             "lyrics",
@@ -90,7 +126,7 @@ class YouTubeSearcher:
     DURATION_HARD_PENALTY = 15.0
     MIN_SCORE_THRESHOLD = -5.0
     SHORT_ARTIST_TOKEN_LIMIT = 2
-    MATCH_STOPWORDS = frozenset(("the", "a", "an", "and", "feat", "featuring", "ft", "x"))
+    MATCH_STOPWORDS = _MATCH_STOPWORDS
 
     _TITLE_CLEAN_RE = re.compile(
         r"\s*[\(\[](feat\.?|ft\.?|featuring|with|remaster|bonus|deluxe|"
@@ -142,7 +178,7 @@ class YouTubeSearcher:
             return None
         cached = self.app_cache.get(cache_key, ttl_hours=ttl_hours)
         if cached:
-            self.log.debug(f"Cache hit: {cached.get('title', '')[:50]}")
+            self.log.dlog("Cache hit: %s", cached.get("title", "")[:50])
             return SearchResult(cached["url"], cached["title"], cached["duration"], cached=True)
         return None
 
@@ -183,9 +219,9 @@ class YouTubeSearcher:
 
     async def _search_text_candidates(self, track: TrackMetadata) -> list[tuple[float, SearchResult]]:
         """Run text-based queries and collect scored candidates."""
-        candidates: list[tuple[float, SearchResult]] = []
         clean_title = self._clean_query_title(track.title)
 
+        queries = []
         for template in self.QUERY_TEMPLATES:
             query = template.format(artist=track.artist, title=clean_title)
             cache_key = query.lower().strip()[:100]
@@ -193,10 +229,11 @@ class YouTubeSearcher:
             cached = self._get_from_cache(cache_key, ttl_hours=24 * 7)
             if cached:
                 return [(0.0, cached)]  # Cache hit, return immediately
+            queries.append((cache_key, query))
 
-            result = await self._lookup(cache_key, query, track)
-            if result:
-                candidates.append(result)
+        # Todas las plantillas se consultan siempre: lanzarlas a la vez (el executor limita la concurrencia)
+        results = await asyncio.gather(*(self._lookup(key, query, track) for key, query in queries))
+        candidates: list[tuple[float, SearchResult]] = [r for r in results if r]
 
         # For short/generic artist names, try album-disambiguated queries
         if self._is_short_artist(track) and track.album:
@@ -206,15 +243,13 @@ class YouTubeSearcher:
 
     async def _search_album_candidates(self, track: TrackMetadata, clean_title: str) -> list:
         """Album-disambiguated queries for short/generic artist names."""
-        results = []
         clean_album = self._clean_query_title(track.album)
-        for template in self.ALBUM_QUERY_TEMPLATES:
-            query = template.format(artist=track.artist, title=clean_title, album=clean_album)
-            cache_key = query.lower().strip()[:100]
-            result = await self._lookup(cache_key, query, track)
-            if result:
-                results.append(result)
-        return results
+        queries = [
+            template.format(artist=track.artist, title=clean_title, album=clean_album)
+            for template in self.ALBUM_QUERY_TEMPLATES
+        ]
+        results = await asyncio.gather(*(self._lookup(q.lower().strip()[:100], q, track) for q in queries))
+        return [r for r in results if r]
 
     def _select_best_candidate(self, candidates: list, track: TrackMetadata) -> SearchResult:
         """Pick the highest-scoring candidate and reject if below threshold."""
@@ -277,6 +312,8 @@ class YouTubeSearcher:
 
     async def _extract_from_yt(self, query: str) -> Optional[list]:
         """Extract YouTube search entries only (no cache decisions)."""
+        import yt_dlp
+
         loop = asyncio.get_running_loop()
         all_opts = await self._get_search_options_variants()
 
@@ -314,7 +351,7 @@ class YouTubeSearcher:
         """Fallback search path using public Invidious instances."""
         timeout_seconds = max(8, int(getattr(self.cfg, "SEARCH_TIMEOUT", 30)))
         timeout = aiohttp.ClientTimeout(total=timeout_seconds)
-        headers = {"User-Agent": random.choice(USER_AGENTS)}  # nosec B311
+        headers = {"User-Agent": get_random_user_agent()}
 
         for base_url in self.INVIDIOUS_SEARCH_INSTANCES:
             try:
@@ -374,21 +411,9 @@ class YouTubeSearcher:
 
     async def _get_search_options_variants(self) -> list[dict]:
         """Configura las opciones de búsqueda de yt-dlp"""
-        base_opts = {
-            "quiet": True,
-            "no_warnings": True,
-            "extract_flat": True,
-            "noplaylist": True,
-            "socket_timeout": self.cfg.SEARCH_TIMEOUT,
-            "retries": 2,
-            # nosec B311
-            "http_headers": {"User-Agent": random.choice(USER_AGENTS)},
-            "extractor_args": {
-                "youtube": {
-                    "player_client": ["android", "web"],
-                }
-            },
-        }
+        base_opts = dict(_SEARCH_BASE_OPTS)
+        base_opts["socket_timeout"] = self.cfg.SEARCH_TIMEOUT
+        base_opts["http_headers"] = {"User-Agent": get_random_user_agent()}
 
         if self.proxy_manager:
             proxy = await self.proxy_manager.get_proxy_async()
@@ -400,7 +425,7 @@ class YouTubeSearcher:
 
         # Fallback with less restrictive extractor args
         fallback_opts = dict(base_opts)
-        fallback_opts["extractor_args"] = {"youtube": {"player_client": ["web"]}}
+        fallback_opts["extractor_args"] = _SEARCH_FALLBACK_EXTRACTOR_ARGS
 
         return [base_opts, fallback_opts]
 
@@ -411,29 +436,29 @@ class YouTubeSearcher:
         if not entries:
             return None
 
-        entries = [e for e in entries if e]
-        if not entries:
-            return None
-
-        scored = [(self._score_entry(e, query, track), e) for e in entries if e]
-
-        self.log.debug(f"Query: {query!r} | Candidatos:")
-        for score, entry in sorted(scored, key=lambda x: x[0], reverse=True):
-            self.log.debug(f"  [{score:+.1f}] {entry.get('title', '')[:60]} ({entry.get('duration', 0)}s)")
-
-        valid = [(s, e) for s, e in scored if s > float("-inf")]
-        if not valid:
-            return None
+        # Una sola pasada; las entradas sin URL no se puntuan (no se podrian usar)
+        scored = []
+        best_score, best_entry, best_url = float("-inf"), None, None
+        for entry in filter(None, entries):
+            url = entry.get("webpage_url") or entry.get("url")
+            if not url:
+                self.log.dlog("Entry sin URL válida, descartando: %s", entry.get("title", "")[:60])
+                continue
+            score = self._score_entry(entry, query, track)
+            scored.append((score, entry))
+            if score > best_score:
+                best_score, best_entry, best_url = score, entry, url
 
-        best_score, best_entry = max(valid, key=lambda x: x[0])
+        if self.log.debug_enabled:
+            self.log.dlog("Query: %r | Candidatos:", query)
+            for score, entry in sorted(scored, key=lambda x: x[0], reverse=True):
+                self.log.dlog("  [%+.1f] %s (%ss)", score, entry.get("title", "")[:60], entry.get("duration", 0))
 
-        url = best_entry.get("webpage_url") or best_entry.get("url")
-        if not url:
-            self.log.debug("Entry sin URL válida, descartando")
+        if best_entry is None:
             return None
 
-        sr = SearchResult(url=url, title=best_entry.get("title", ""), duration=best_entry.get("duration", 0))
-        self.log.debug(f"Encontrado: {sr.title[:50]}")
+        sr = SearchResult(url=best_url, title=best_entry.get("title", ""), duration=best_entry.get("duration", 0))
+        self.log.dlog("Encontrado: %s", sr.title[:50])
 
         if self.app_cache:
             self.app_cache.set(cache_key, {"url": sr.url, "title": sr.title, "duration": sr.duration})
@@ -449,7 +474,7 @@ class YouTubeSearcher:
         channel = entry.get("channel", "")
 
         title_norm = self._normalize_for_phrase_match(entry_title)
-        title_tokens = set(re.findall(r"[a-z0-9]+", title_norm))
+        title_tokens = frozenset(_TOKEN_RE.findall(title_norm))
         query_tokens = self._tokenize(query)
         combined_text = f"{entry_title} {uploader} {channel}"
         combined_tokens = self._tokenize(combined_text)
@@ -507,20 +532,24 @@ class YouTubeSearcher:
             artist_phrase_match,
         )
 
-        diff_text = "n/a" if diff is None else str(diff)
-        self.log.debug(
-            "Score detalle | "
-            f"title={entry_title[:60]!r} | "
-            f"query={query!r} | "
-            f"diff={diff_text} | "
-            f"dur_penalty={duration_penalty:.2f} | "
-            f"overlap={overlap} (+{overlap_bonus:.2f}) | "
-            f"artist_hits={artist_overlap_count} (+{artist_bonus:.2f}) | "
-            f"title_hits={title_overlap_count}/{required_title_hits} | "
-            f"version_penalty={version_penalty:.2f} | "
-            f"topic_bonus=+{topic_bonus:.2f} | "
-            f"album_bonus=+{album_bonus:.2f} | "
-            f"total={score:+.2f}"
+        self.log.dlog(
+            "Score detalle | title=%r | query=%r | diff=%s | dur_penalty=%.2f | overlap=%s (+%.2f) | "
+            "artist_hits=%s (+%.2f) | title_hits=%s/%s | version_penalty=%.2f | topic_bonus=+%.2f | "
+            "album_bonus=+%.2f | total=%+.2f",
+            entry_title[:60],
+            query,
+            "n/a" if diff is None else diff,
+            duration_penalty,
+            overlap,
+            overlap_bonus,
+            artist_overlap_count,
+            artist_bonus,
+            title_overlap_count,
+            required_title_hits,
+            version_penalty,
+            topic_bonus,
+            album_bonus,
+            score,
         )
 
         return score
@@ -545,9 +574,11 @@ class YouTubeSearcher:
         required_title_hits = self._required_title_overlap(len(title_required_tokens))
 
         if title_required_tokens and title_overlap_count < required_title_hits:
-            self.log.debug(
-                f"Score descartado por titulo insuficiente: {entry_title[:60]} | "
-                f"hits={title_overlap_count}/{required_title_hits}"
+            self.log.dlog(
+                "Score descartado por titulo insuficiente: %s | hits=%s/%s",
+                entry_title[:60],
+                title_overlap_count,
+                required_title_hits,
             )
             return float("-inf")
 
@@ -555,13 +586,12 @@ class YouTubeSearcher:
         creator_tokens = self._tokenize(f"{uploader} {channel}")
         if all_artist_tokens and creator_tokens and not artist_phrase_match:
             if artist_overlap_count == 0:
-                self.log.debug(f"Score descartado por artista incompatible: {entry_title[:60]} | query={query!r}")
+                self.log.dlog("Score descartado por artista incompatible: %s | query=%r", entry_title[:60], query)
                 return float("-inf")
 
         # Hard excludes
-        hard_excludes = set(self.HARD_EXCLUDES)
-        if title_tokens & hard_excludes and not query_tokens & hard_excludes:
-            self.log.debug(f"Score descartado por exclude: {entry_title[:60]} | query={query!r}")
+        if title_tokens & self._HARD_EXCLUDE_SET and not query_tokens & self._HARD_EXCLUDE_SET:
+            self.log.dlog("Score descartado por exclude: %s | query=%r", entry_title[:60], query)
             return float("-inf")
 
         return None
@@ -661,14 +691,13 @@ class YouTubeSearcher:
 
     # ── Utility methods ─────────────────────────────────────────────────
 
-    def _tokenize(self, text: str) -> set[str]:
+    def _tokenize(self, text: str) -> frozenset[str]:
         """Normalize accents/symbols and return alphanumeric tokens."""
-        ascii_text = self._normalize_for_phrase_match(text)
-        return set(re.findall(r"[a-z0-9]+", ascii_text))
+        return _text_tokens(text)
 
-    def _essential_tokens(self, text: str) -> set[str]:
+    def _essential_tokens(self, text: str) -> frozenset[str]:
         """Tokenize text and remove low-signal words that hurt matching precision."""
-        return {tok for tok in self._tokenize(text) if tok not in self.MATCH_STOPWORDS and len(tok) > 1}
+        return _essential_text_tokens(text)
 
     def _required_title_overlap(self, title_token_count: int) -> int:
         """Compute minimum title token hits required to accept a candidate."""
@@ -733,5 +762,4 @@ class YouTubeSearcher:
 
     def _normalize_for_phrase_match(self, text: str) -> str:
         """Normalize unicode text to lowercase ASCII for stable comparisons."""
-        normalized = unicodedata.normalize("NFD", text)
-        return normalized.encode("ascii", "ignore").decode("ascii").lower()
+        return _ascii_lower(text)
@@ -1,6 +1,11 @@
 def main() -> None:
     """Entry point for the Resonance Audio Builder CLI."""
+    from resonance_audio_builder.core import shutdown
     from resonance_audio_builder.core.builder import App
 
-    app = App()
-    app.run()
+    try:
+        app = App()
+        app.run()
+    finally:
+        # Flush de cache, cierre de sesiones, etc. en paralelo
+        shutdown.run_shutdown()
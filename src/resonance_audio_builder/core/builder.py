@@ -1,12 +1,11 @@
 import asyncio
 import csv
-import glob
 import os
 import shutil
 import tempfile
 import traceback
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from rich.panel import Panel
 from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
@@ -16,14 +15,18 @@ from rich.table import Table
 from resonance_audio_builder.audio.audit import AudioAuditor
 from resonance_audio_builder.audio.metadata import TrackMetadata
 from resonance_audio_builder.core.config import Config, QualityMode
-from resonance_audio_builder.core.logger import Logger
+from resonance_audio_builder.core.logger import Logger, flush_console
 from resonance_audio_builder.core.manager import DownloadManager
 from resonance_audio_builder.core.state import ProgressDB
-from resonance_audio_builder.core.ui import console, print_header
+from resonance_audio_builder.core.ui import console, format_size, print_header
+from resonance_audio_builder.core.utils import walk_audio
 from resonance_audio_builder.network.cache import CacheManager
 from resonance_audio_builder.network.limiter import RateLimiter
 from resonance_audio_builder.network.utils import validate_cookies_file
 
+# CSVs por encima de este tamaño se leen con polars (si está instalado)
+_FAST_CSV_MIN_BYTES = 1 << 20
+
 
 class App:
     """Main application controller for Resonance Audio Builder."""
@@ -40,6 +43,8 @@ class App:
             self.log.error(f"Failed to init cache: {e}")
             self.cache = None
         self.rate_limiter = RateLimiter(self.cfg.RATE_LIMIT_MIN, self.cfg.RATE_LIMIT_MAX)
+        # Codificación confirmada por archivo (evita re-probar en reintentos)
+        self._enc_cache: Dict[str, str] = {}
 
     def _check_dependencies(self) -> bool:
         if not shutil.which("ffmpeg"):
@@ -87,6 +92,7 @@ class App:
         console.print(grid)
 
     def _select_csv(self) -> List[str]:
+        flush_console()
         console.clear()
         print_header()
 
@@ -95,8 +101,12 @@ class App:
         inp_dir.mkdir(exist_ok=True)
 
         # Search for CSV files in the input folder
-        pattern = str(inp_dir / "*.csv")
-        csvs = [c for c in glob.glob(pattern) if "fallidas" not in c.lower()]
+        with os.scandir(inp_dir) as it:
+            csvs = [
+                e.path
+                for e in it
+                if e.name.lower().endswith(".csv") and "fallidas" not in e.name.lower() and e.is_file()
+            ]
 
         if not csvs:
             console.print(
@@ -129,6 +139,7 @@ class App:
         console.print(table)
 
         choices = [str(i + 1) for i in range(len(csvs))] + ["A"]
+        flush_console()
         sel = Prompt.ask("Choose a file (or 'A' for All)", choices=choices, default="1")
 
         if sel.upper() == "A":
@@ -137,6 +148,7 @@ class App:
         return [csvs[int(sel) - 1]]
 
     def _select_quality(self):
+        flush_console()
         console.clear()
         print_header()
 
@@ -150,6 +162,7 @@ class App:
 
         console.print(Panel(grid, title="Select Quality", border_style="cyan"))
 
+        flush_console()
         sel = Prompt.ask("Option", choices=["1", "2", "3"], default="3")
 
         if sel == "1":
@@ -162,8 +175,38 @@ class App:
             self.cfg.MODE = QualityMode.BOTH
             console.print("[dim]Selected: Both versions[/dim]")
 
+    def _read_csv_fast(self, filepath: str) -> Optional[List[dict]]:
+        """Lector columnar en C (polars) para exportaciones grandes; None si no aplica"""
+        try:
+            if os.path.getsize(filepath) < _FAST_CSV_MIN_BYTES:
+                return None
+            import polars as pl
+        except (OSError, ImportError):
+            return None
+
+        try:
+            # Todo como texto (sin inferencia), igual que csv.DictReader
+            df = pl.read_csv(filepath, infer_schema_length=0, low_memory=True)
+            if df.height == 0:
+                return None
+            df = df.rename({c: c.lstrip("\ufeff") for c in df.columns}).fill_null("")
+            return df.to_dicts()
+        except Exception as e:
+            # Codificación no UTF-8, cabeceras duplicadas, etc. -> lector estándar
+            self.log.debug(f"polars CSV fallback: {e}")
+            return None
+
     def _read_csv(self, filepath: str) -> List[dict]:
+        rows = self._read_csv_fast(filepath)
+        if rows:
+            self.log.info("[i] Codificación: utf-8 (polars)")
+            return rows
+
         encodings = ["utf-8-sig", "utf-8", "latin-1", "cp1252"]
+        cached = self._enc_cache.get(filepath)
+        if cached:
+            # Primero la conocida; el resto solo si el archivo cambió
+            encodings = [cached] + [e for e in encodings if e != cached]
 
         for enc in encodings:
             try:
@@ -176,9 +219,10 @@ class App:
                     reader = csv.DictReader(f)
                     rows = list(reader)
                     if len(rows) > 0 and reader.fieldnames:
+                        self._enc_cache[filepath] = enc
                         self.log.info(f"[i] Codificación: {enc}")
                         return rows
-            except Exception:
+            except (UnicodeError, csv.Error, OSError):
                 continue
 
         print(f"[!] Error leyendo CSV: {filepath}")
@@ -191,31 +235,28 @@ class App:
             rows = self._read_csv(csv_file)
             playlist_name = Path(csv_file).stem
             if rows:
+                # Cabeceras -> campos una sola vez por archivo
+                resolver = TrackMetadata.build_resolver(rows[0].keys())
                 for row in rows:
-                    t = TrackMetadata.from_csv_row(row)
+                    t = TrackMetadata.from_csv_row(row, resolver)
                     # Use the original playlist subfolder from the CSV row
                     # (preserved in Failed_songs.csv) instead of the CSV filename
                     original_subfolder = row.get("playlist_subfolder", "").strip()
                     subfolder = original_subfolder if original_subfolder else playlist_name
-                    setattr(t, "playlist_subfolder", subfolder)
-                    setattr(t, "playlists", [subfolder])
+                    t.playlist_subfolder = subfolder
+                    t.playlists = [subfolder]
                     all_tracks.append(t)
         return all_tracks
 
     def _deduplicate_tracks(self, tracks: List[TrackMetadata]) -> List[TrackMetadata]:
         """Elimina canciones duplicadas por ID pero mantiene referencia de todas las playlists"""
-        unique = {}
+        unique: dict = {}
         for t in tracks:
-            if t.track_id not in unique:
-                unique[t.track_id] = t
-            else:
-                # Merge playlists - this track appears in multiple playlists
-                existing = unique[t.track_id]
-                existing_playlists = getattr(existing, "playlists", [])
-                new_playlists = getattr(t, "playlists", [])
-                # Combine and deduplicate playlist names
-                merged_playlists = list(set(existing_playlists + new_playlists))
-                setattr(existing, "playlists", merged_playlists)
+            # setdefault: una sola búsqueda por canción; conserva la primera aparición
+            existing = unique.setdefault(t.track_id, t)
+            if existing is not t:
+                # Merge playlists - this track appears in multiple playlists (orden estable, sin repetidos)
+                existing.playlists = list(dict.fromkeys(existing.playlists + t.playlists))
         return list(unique.values())
 
     def _get_selected_csvs(self, csv_files: Optional[List[str]]) -> List[str]:
@@ -223,6 +264,7 @@ class App:
         if csv_files is not None:
             return csv_files
 
+        flush_console()
         console.clear()
         print_header()
         return self._select_csv()
@@ -255,29 +297,35 @@ class App:
                 f.write(traceback.format_exc())
             console.print("\n[bold red][!] Error crítico guardado en crash.log[/bold red]")
 
+        flush_console()
         console.input("\n[bold cyan]Presiona ENTER para continuar...[/bold cyan]")
 
     def _retry_failed(self):
         """Reintenta descargar canciones fallidas"""
+        flush_console()
         console.clear()
         print_header()
 
         if not os.path.exists(self.cfg.ERROR_CSV):
             console.print("\n[yellow][!] No hay archivo de canciones fallidas.[/yellow]")
             console.print(f"    [dim]({self.cfg.ERROR_CSV} no existe)[/dim]")
+            flush_console()
             console.input("\n[bold cyan]Presiona ENTER para volver...[/bold cyan]")
             return
 
         rows = self._read_csv(self.cfg.ERROR_CSV)
         if not rows:
             console.print("\n[yellow][!] El archivo de fallidas esta vacio.[/yellow]")
+            flush_console()
             console.input("\n[bold cyan]Presiona ENTER para volver...[/bold cyan]")
             return
 
         # Show a lightweight summary before launching the regular download flow.
-        unique_track_ids = {TrackMetadata.from_csv_row(row).track_id for row in rows}
+        resolver = TrackMetadata.build_resolver(rows[0].keys())
+        unique_track_ids = {TrackMetadata.from_csv_row(row, resolver).track_id for row in rows}
         print(f"\n[i] {len(unique_track_ids)} canciones fallidas a reintentar")
 
+        flush_console()
         retry = Prompt.ask("Reintentar ahora? (y/n)", choices=["y", "n"], default="y")
         if retry.lower() != "y":
             return
@@ -309,19 +357,28 @@ class App:
             if os.path.exists(f):
                 try:
                     os.remove(f)
-                except Exception:
+                except OSError:
                     pass
 
     def _clear_temp_files(self):
-        temp_dir = Path(tempfile.gettempdir())
-        for f in temp_dir.glob("ytraw_*"):
+        try:
+            with os.scandir(tempfile.gettempdir()) as it:
+                stale = [(e.path, e.is_dir(follow_symlinks=False)) for e in it if e.name.startswith("ytraw_")]
+        except OSError:
+            return
+        for f, is_dir in stale:
+            # Directorios: carpeta temporal por ejecución del downloader
+            if is_dir:
+                shutil.rmtree(f, ignore_errors=True)
+                continue
             try:
                 os.remove(f)
-            except Exception:
+            except OSError:
                 pass
 
     def _clear_cache(self):
         """Menú de limpieza modular"""
+        flush_console()
         console.clear()
         print_header()
         table = Table(title="Clear Data", show_header=False, box=None)
@@ -330,6 +387,7 @@ class App:
             table.add_row(r[0], r[1])
 
         console.print(Panel(table, border_style="red"))
+        flush_console()
         sel = Prompt.ask("Option", choices=["0", "1", "2", "3"], default="0")
         if sel == "0":
             return
@@ -340,34 +398,28 @@ class App:
         else:
             console.print("[dim]Nothing to delete.[/dim]")
 
+        flush_console()
         Prompt.ask("\nPress ENTER to continue")
 
-    def _format_size(self, size_bytes: int) -> str:
-        for unit in ["B", "KB", "MB", "GB"]:
-            if size_bytes < 1024:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024
-        return f"{size_bytes:.2f} TB"
-
     def _run_audit(self):
         """Ejecuta y muestra el reporte de auditoría"""
+        flush_console()
         console.clear()
         print_header()
 
+        flush_console()
         check_spectral = Prompt.ask("Perform spectral analysis? (Slow)", choices=["y", "n"], default="n") == "y"
 
         auditor = AudioAuditor(self.log)
         hq_path = Path(self.cfg.OUTPUT_FOLDER_HQ)
         mob_path = Path(self.cfg.OUTPUT_FOLDER_MOBILE)
 
-        total_files = 0
-        if hq_path.exists():
-            total_files += len(list(hq_path.rglob("*.m4a"))) + len(list(hq_path.rglob("*.mp3")))
-        if mob_path.exists():
-            total_files += len(list(mob_path.rglob("*.m4a"))) + len(list(mob_path.rglob("*.mp3")))
+        # walk_audio ignora carpetas inexistentes
+        total_files = sum(1 for _ in walk_audio(hq_path)) + sum(1 for _ in walk_audio(mob_path))
 
         if total_files == 0:
             console.print("[yellow]No audio folders found to audit.[/yellow]")
+            flush_console()
             console.input("\n[bold cyan]Press ENTER to return...[/bold cyan]")
             return
 
@@ -394,7 +446,7 @@ class App:
             table.add_column("Value", justify="right")
 
             table.add_row("Total Files", str(res.total_files))
-            table.add_row("Total Size", self._format_size(res.total_size_bytes))
+            table.add_row("Total Size", format_size(res.total_size_bytes))
 
             # Problems
             table.add_section()
@@ -419,6 +471,7 @@ class App:
                 fake_list = "\n".join([f" [red]![/red] {f}" for f in res.fake_hq_detected])
                 console.print(Panel(fake_list, title="Fake HQ Files", border_style="red"))
 
+        flush_console()
         console.input("\n[bold cyan]Press ENTER to return...[/bold cyan]")
 
     def _notify_end(self):
@@ -430,7 +483,7 @@ class App:
                 winsound.MessageBeep(winsound.MB_ICONASTERISK)
             else:
                 print("\a")
-        except Exception:
+        except (ImportError, OSError, RuntimeError):
             pass
 
     def watch_mode(self, folder: str):
@@ -441,6 +494,7 @@ class App:
             print(f"[!] Folder not found: {folder}")
             return
 
+        flush_console()
         console.clear()
         print_header()
 
@@ -473,6 +527,7 @@ class App:
             return
 
         while True:
+            flush_console()
             console.clear()
             print_header()
 
@@ -488,10 +543,12 @@ class App:
 
             console.print(Panel(menu_table, title="Main Menu", border_style="blue"))
 
+            flush_console()
             sel = Prompt.ask("Option", choices=["1", "2", "3", "4", "5"])
 
             if sel == "1":
                 self._start_download()  # Interactivo
+                flush_console()
                 console.input("\n[bold cyan]Presiona ENTER para continuar...[/bold cyan]")
                 self._notify_end()
             elif sel == "2":
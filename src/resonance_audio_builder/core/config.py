@@ -1,7 +1,8 @@
-import json
 import os
 from dataclasses import dataclass
 
+from resonance_audio_builder.core.utils import json_loads
+
 
 class QualityMode:
     """Constants for audio quality modes."""
@@ -50,6 +51,7 @@ class Config:
     RATE_LIMIT_MIN: float = 0.5
     RATE_LIMIT_MAX: float = 2.0
     NORMALIZE_AUDIO: bool = True
+    NORMALIZE_FILTER: str = "dynaudnorm"  # 'dynaudnorm' (rapido) o 'loudnorm' (EBU R128)
     VERIFY_MD5: bool = True
     GENERATE_M3U: bool = True
     SAVE_HISTORY: bool = True
@@ -58,10 +60,12 @@ class Config:
     # v5.1 - Formato de salida: 'm4a', 'flac', o 'copy' (mantener original)
     OUTPUT_FORMAT: str = "m4a"
     EMBED_LYRICS: bool = True
+    COVER_RESAMPLE: str = "auto"  # 'auto', 'bilinear', 'hamming', 'bicubic' o 'lanczos' (archivo)
 
     # v7.0 - Spectral Analysis
     SPECTRAL_ANALYSIS: bool = True
     SPECTRAL_CUTOFF: int = 16000  # 16kHz typical for 128kbps
+    HQ_BITRATE_TRUST_THRESHOLD: int = 256  # kbps declarados por yt-dlp que omiten el análisis (0 = nunca)
 
     @classmethod
     def load(cls, filepath: str = "config.json") -> "Config":
@@ -69,8 +73,8 @@ class Config:
         cfg = cls()
         if os.path.exists(filepath):
             try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                with open(filepath, "rb") as f:
+                    data = json_loads(f.read())
                 # Mapear campos JSON a atributos
                 mapping = {
                     "output_folder_hq": "OUTPUT_FOLDER_HQ",
@@ -85,12 +89,15 @@ class Config:
                     "rate_limit_delay_min": "RATE_LIMIT_MIN",
                     "rate_limit_delay_max": "RATE_LIMIT_MAX",
                     "normalize_audio": "NORMALIZE_AUDIO",
+                    "normalize_filter": "NORMALIZE_FILTER",
                     "verify_md5": "VERIFY_MD5",
                     "generate_m3u": "GENERATE_M3U",
                     "save_history": "SAVE_HISTORY",
                     "debug_mode": "DEBUG_MODE",
                     "output_format": "OUTPUT_FORMAT",
                     "embed_lyrics": "EMBED_LYRICS",
+                    "cover_resample": "COVER_RESAMPLE",
+                    "hq_bitrate_trust_threshold": "HQ_BITRATE_TRUST_THRESHOLD",
                     "input_folder": "INPUT_FOLDER",
                     "proxies_file": "PROXIES_FILE",
                     "use_proxies": "USE_PROXIES",
@@ -1,8 +1,8 @@
-import atexit
 import os
 import threading
 import time
 
+from resonance_audio_builder.core import shutdown
 from resonance_audio_builder.core.logger import Logger
 
 
@@ -79,26 +79,28 @@ class KeyboardController:
             import termios
             import tty
 
-            old_settings = termios.tcgetattr(sys.stdin.fileno())
+            fd = sys.stdin.fileno()
+            old_settings = termios.tcgetattr(fd)
 
             def restore():
                 try:
-                    termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, old_settings)
+                    termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
                 except Exception:
                     pass
 
-            atexit.register(restore)
-
-            while self._running and not self.quit_event.is_set():
-                try:
-                    tty.setraw(sys.stdin.fileno())
-                    rlist, _, _ = select.select([sys.stdin], [], [], 0.1)
+            shutdown.register(restore)
+            # Modo cbreak una sola vez (no setraw: mantiene el post-procesado de salida para Rich)
+            tty.setcbreak(fd)
+            try:
+                while self._running and not self.quit_event.is_set():
+                    # select ya bloquea hasta 100ms, no hace falta sleep extra
+                    rlist, _, _ = select.select([fd], [], [], 0.1)
                     if rlist:
-                        key = sys.stdin.read(1).upper()
+                        key = os.read(fd, 1).decode("utf-8", errors="ignore").upper()
                         self._handle_key(key)
-                finally:
-                    termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, old_settings)
-                time.sleep(0.05)
+            finally:
+                restore()
+                shutdown.unregister(restore)
         except Exception:
             pass
 
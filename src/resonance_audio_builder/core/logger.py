@@ -1,16 +1,196 @@
+import queue
 import threading
-from datetime import datetime
+import time
 
 from rich.console import Console
 
+from resonance_audio_builder.core import shutdown
+
 console = Console()
 
 
+class _FileSink:
+    """Escritor de debug.log en segundo plano: los hilos solo encolan líneas.
+
+    Un único hilo mantiene el archivo abierto con buffer grande y hace flush
+    cuando la cola se vacía o al acumular FLUSH_BYTES.
+    """
+
+    FLUSH_INTERVAL = 1.0
+    FLUSH_BYTES = 8192
+    _STOP = object()
+
+    def __init__(self, path: str = "debug.log"):
+        self.path = path
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def write(self, line: str):
+        if self._thread is None:
+            self._start()
+        self._queue.put(line)
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def _next(self):
+        try:
+            return self._queue.get(timeout=self.FLUSH_INTERVAL)
+        except queue.Empty:
+            return None
+
+    def _worker(self):
+        f = None
+        unflushed = 0
+        while True:
+            item = self._next()
+            if isinstance(item, str):
+                f = self._write(f, item)
+                unflushed += len(item)
+                # Seguir drenando mientras haya líneas y no se supere el umbral
+                if unflushed < self.FLUSH_BYTES and not self._queue.empty():
+                    continue
+
+            if unflushed:
+                self._call(f, "flush")
+                unflushed = 0
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is self._STOP:
+                break
+        self._call(f, "close")
+
+    def _write(self, f, line: str):
+        try:
+            if f is None:
+                f = open(self.path, "a", encoding="utf-8", buffering=64 * 1024)
+            f.write(line)
+        except Exception:
+            pass
+        return f
+
+    @staticmethod
+    def _call(f, method: str):
+        if f is not None:
+            try:
+                getattr(f, method)()
+            except Exception:
+                pass
+
+    def flush(self, timeout: float = 5.0):
+        """Espera a que todo lo encolado hasta ahora esté en disco."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Vacía la cola y cierra el archivo (se reabre en la siguiente escritura)."""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(self._STOP)
+        thread.join(timeout)
+
+
+_file_sink = _FileSink()
+shutdown.register(_file_sink.close)
+
+
+class _ConsoleWriter:
+    """Hilo único dueño de console.print para los mensajes del Logger.
+
+    Sin dashboard activo (arranque/cierre) los hilos y el event loop solo encolan;
+    el parseo de markup y la escritura en terminal ocurren aquí.
+    """
+
+    _STOP = object()
+
+    def __init__(self):
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def put(self, markup: str):
+        if self._thread is None:
+            self._start()
+        self._queue.put(markup)
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="console-writer", daemon=True)
+                self._thread.start()
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            try:
+                console.print(item)
+            except Exception:
+                pass
+
+    def flush(self, timeout: float = 5.0):
+        """Espera a que se impriman los mensajes encolados (antes de prompts o del dashboard)."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(self._STOP)
+        thread.join(timeout)
+
+
+_console_writer = _ConsoleWriter()
+shutdown.register(_console_writer.close)
+
+
+def flush_console():
+    """Vacía los mensajes del Logger pendientes de imprimir en consola."""
+    _console_writer.flush()
+
+
+# Quita corchetes del markup de Rich en una sola pasada (C)
+_BRACKET_TRANS = str.maketrans({"[": None, "]": None})
+
+# Cache del timestamp: se formatea como mucho una vez por segundo
+_ts_cache = (0, "")
+
+
+def _timestamp() -> str:
+    global _ts_cache
+    now = int(time.time())
+    sec, text = _ts_cache
+    if sec != now:
+        text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        _ts_cache = (now, text)
+    return text
+
+
 class Logger:
     """Thread-safe logger with Rich console and file output."""
 
     def __init__(self, debug: bool):
-        self._debug = debug
+        # Atributo simple (no property): los llamadores lo consultan antes de formatear
+        self.debug_enabled = debug
         self._lock = threading.Lock()
         self._tracker = None
 
@@ -19,23 +199,19 @@ class Logger:
         self._tracker = tracker
 
     def _log_to_file(self, msg_clean):
-        try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open("debug.log", "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}] {msg_clean}\n")
-        except Exception:
-            pass
+        # Solo encola: la escritura la hace el hilo de _file_sink
+        _file_sink.write(f"[{_timestamp()}] {msg_clean}\n")
 
     def _log(self, level, msg, style):
         # File logging (strip rich markup approximation)
-        msg_clean = msg.replace("[", "").replace("]", "")
+        msg_clean = msg.translate(_BRACKET_TRANS)
         self._log_to_file(f"{level.upper()}: {msg_clean}")
 
         # UI logging
         if hasattr(self, "_tracker") and self._tracker:
             self._tracker.add_log(f"[{style}]{msg}[/{style}]")
         else:
-            console.print(f"[{style}]{msg}[/{style}]")
+            _console_writer.put(f"[{style}]{msg}[/{style}]")
 
     def info(self, msg):
         """Log an informational message."""
@@ -44,10 +220,16 @@ class Logger:
 
     def debug(self, msg):
         """Log a debug message if debug mode is enabled."""
-        if self._debug:
+        if self.debug_enabled:
             with self._lock:
                 self._log("debug", f"    [DEBUG] {msg}", "dim white")
 
+    def dlog(self, fmt, *args):
+        """Debug con formato diferido (estilo logging): `fmt % args` solo si está activo."""
+        if self.debug_enabled:
+            with self._lock:
+                self._log("debug", "    [DEBUG] " + (fmt % args if args else fmt), "dim white")
+
     def error(self, msg):
         """Log an error message."""
         with self._lock:
@@ -1,5 +1,7 @@
 import asyncio
 import csv
+import os
+import random
 import traceback
 from datetime import datetime
 from typing import List, Tuple
@@ -13,9 +15,9 @@ from resonance_audio_builder.audio.metadata import TrackMetadata
 from resonance_audio_builder.audio.tagging import MetadataWriter
 from resonance_audio_builder.audio.youtube import YouTubeSearcher
 from resonance_audio_builder.core.config import Config, QualityMode
-from resonance_audio_builder.core.exceptions import FatalError, RecoverableError
+from resonance_audio_builder.core.exceptions import FatalError, RateLimitError, RecoverableError
 from resonance_audio_builder.core.input import KeyboardController
-from resonance_audio_builder.core.logger import Logger
+from resonance_audio_builder.core.logger import Logger, flush_console
 from resonance_audio_builder.core.state import ProgressDB
 from resonance_audio_builder.core.ui import RichUI, console, print_header
 from resonance_audio_builder.core.utils import save_history
@@ -23,6 +25,15 @@ from resonance_audio_builder.network.cache import CacheManager
 from resonance_audio_builder.network.proxies import SmartProxyManager
 
 
+def _retry_delay(attempt: int, rate_limited: bool = False) -> float:
+    """Backoff exponencial con tope y jitter: 2s, 4s, 8s... (máx. 30s) + hasta 0.25s.
+    Tras un HTTP 429: 15s, 30s, 60s (máx.) + hasta 5s."""
+    step = max(1, attempt) - 1
+    if rate_limited:
+        return min(60.0, 15.0 * 2**step) + random.uniform(0, 5.0)  # nosec B311
+    return min(30.0, 2.0 * 2**step) + random.uniform(0, 0.25)  # nosec B311
+
+
 class DownloadManager:
     """Orquestador principal de descargas (Async)"""
 
@@ -42,6 +53,8 @@ class DownloadManager:
         from resonance_audio_builder.network.limiter import CircuitBreaker
 
         self.circuit_breaker = CircuitBreaker(threshold=3, cooldown=300)
+        # Tras un 429 todos los workers esperan hasta este instante (loop.time())
+        self._rate_limit_until = 0.0
 
         self.downloader = AudioDownloader(self.cfg, self.log, self.proxy_manager)
         self.searcher = YouTubeSearcher(self.cfg, self.log, self.cache, self.proxy_manager)
@@ -51,6 +64,11 @@ class DownloadManager:
         console.clear()
         self.queue: asyncio.Queue[TrackMetadata] = asyncio.Queue()
         self.failed_tracks: List[Tuple[TrackMetadata, str]] = []
+        # Durante run(), los fallos van fila a fila a ERROR_CSV.part (sobrevive a un cierre abrupto);
+        # ERROR_CSV puede ser la entrada de un reintento, así que solo se reemplaza al terminar
+        self._stream_failures = False
+        self._fail_csv = None
+        self._fail_writer = None
         # Store all tracks for M3U generation
         self.all_tracks: List[TrackMetadata] = []
 
@@ -70,6 +88,7 @@ class DownloadManager:
         print_header()
         self._print_batch_summary(tracks, pending)
 
+        flush_console()
         if not Confirm.ask("Start download?", default=True):
             console.print("[yellow]Cancelled by user.[/yellow]")
             return
@@ -85,6 +104,10 @@ class DownloadManager:
             await self.queue.put(t)
         self.log.debug("queue filled")
 
+        self._stream_failures = True
+        # Los commits de progreso van a un hilo aparte cada pocos segundos
+        self.state.start_autosave()
+
         # Start keyboard listener (Thread)
         self.keyboard.start()
 
@@ -117,12 +140,16 @@ class DownloadManager:
                 try:
                     self.queue.get_nowait()
                     self.queue.task_done()
-                except Exception:
+                except (asyncio.QueueEmpty, ValueError):
                     break
 
             self.keyboard.stop()
+            self.state.stop_autosave()
             self.ui.stop()
             self.searcher.close()
+            await self.downloader.close()
+            if self.cache:
+                self.cache.flush()
             self._save_failed()
             self._print_summary()
 
@@ -229,6 +256,7 @@ class DownloadManager:
         while attempt < self.cfg.MAX_RETRIES:
             if self.keyboard.should_quit():
                 return False
+            await self._wait_rate_limit_pause()
             attempt += 1
 
             success, is_fatal, error = await self._attempt_download_iteration(track, task_id, attempt)
@@ -241,15 +269,34 @@ class DownloadManager:
                 break
 
             if attempt < self.cfg.MAX_RETRIES:
-                await asyncio.sleep(2 * attempt)
+                # Tras un 429 la pausa larga es compartida (_wait_rate_limit_pause al inicio del intento)
+                await self._sleep_unless_quit(_retry_delay(attempt))
 
         if not self.keyboard.should_quit():
             self.ui.update_task_status(task_id, f"[red]Failed: {last_error}[/red]")
             self.state.mark(track, "error", error=last_error)
             self.ui.update_main_progress(1)
-            self.failed_tracks.append((track, last_error))
+            self._record_failure(track, last_error)
         return False
 
+    def _pause_for_rate_limit(self, attempt: int):
+        """Pausa global tras un 429: el resto de workers tampoco vuelve a YouTube hasta que pase."""
+        loop = asyncio.get_running_loop()
+        until = loop.time() + _retry_delay(attempt, rate_limited=True)
+        self._rate_limit_until = max(self._rate_limit_until, until)
+
+    async def _wait_rate_limit_pause(self):
+        remaining = self._rate_limit_until - asyncio.get_running_loop().time()
+        if remaining > 0:
+            await self._sleep_unless_quit(remaining)
+
+    async def _sleep_unless_quit(self, delay: float):
+        """Espera en tramos cortos para que Q cancele el backoff sin esperar entero."""
+        while delay > 0 and not self.keyboard.should_quit():
+            step = min(0.25, delay)
+            await asyncio.sleep(step)
+            delay -= step
+
     async def _attempt_download_iteration(
         self, track: TrackMetadata, task_id: str, attempt: int
     ) -> tuple[bool, bool, str]:
@@ -270,6 +317,8 @@ class DownloadManager:
             )
 
             if not result.success:
+                if result.rate_limited:
+                    raise RateLimitError(result.error or "Rate Limit (429)")
                 raise RecoverableError(result.error or "Unknown error")
 
             # Success logic
@@ -289,6 +338,11 @@ class DownloadManager:
             if "429" in str(e) or "403" in str(e) or "Banned" in str(e):
                 self.circuit_breaker.record_failure()
             return False, True, str(e)
+        except RateLimitError as e:
+            self.ui.update_task_status(task_id, f"[yellow]Rate limited: {e}[/yellow]")
+            self.circuit_breaker.record_failure()
+            self._pause_for_rate_limit(attempt)
+            return False, False, str(e)
         except RecoverableError as e:
             self.ui.update_task_status(task_id, f"[yellow]Retry: {e}[/yellow]")
             return False, False, str(e)
@@ -297,7 +351,49 @@ class DownloadManager:
             self.log.debug(f"Unexpected error for {track.title}: {traceback.format_exc()}")
             return False, True, str(e)
 
+    @staticmethod
+    def _fail_row(track: TrackMetadata) -> dict:
+        row_data = track.raw_data.copy()
+        # Add playlist_subfolder if it exists
+        row_data["playlist_subfolder"] = getattr(track, "playlist_subfolder", "")
+        return row_data
+
+    @staticmethod
+    def _fail_csv_writer(f, track: TrackMetadata) -> csv.DictWriter:
+        # Get all fieldnames from raw_data plus playlist_subfolder
+        all_fields = list(track.raw_data.keys()) + ["playlist_subfolder"]
+        writer = csv.DictWriter(f, fieldnames=all_fields, extrasaction="ignore")
+        writer.writeheader()
+        return writer
+
+    def _record_failure(self, track: TrackMetadata, error: str):
+        """Registra el fallo y lo añade a ERROR_CSV.part en el momento (flush por fila)."""
+        self.failed_tracks.append((track, error))
+        if not self._stream_failures:
+            return
+        try:
+            if self._fail_writer is None:
+                self._fail_csv = open(self._fail_csv_part(), "w", encoding="utf-8", newline="")
+                self._fail_writer = self._fail_csv_writer(self._fail_csv, track)
+            self._fail_writer.writerow(self._fail_row(track))
+            self._fail_csv.flush()
+        except Exception as e:
+            self.log.error(f"Failed to record failed track: {e}")
+
+    def _fail_csv_part(self) -> str:
+        return self.cfg.ERROR_CSV + ".part"
+
+    def _close_fail_csv(self):
+        f, self._fail_csv, self._fail_writer = self._fail_csv, None, None
+        if f is not None:
+            try:
+                f.close()
+            except OSError:
+                pass
+
     def _save_failed(self):
+        streamed = self._fail_writer is not None
+        self._close_fail_csv()
         if not self.failed_tracks:
             return
         try:
@@ -306,19 +402,13 @@ class DownloadManager:
                 for track, error in self.failed_tracks:
                     f.write(f"• {track.artist} - {track.title}\n  Error: {error}\n\n")
 
-            with open(self.cfg.ERROR_CSV, "w", encoding="utf-8", newline="") as f:
-                if self.failed_tracks:
-                    # Get all fieldnames from raw_data plus playlist_subfolder
-                    base_fields = list(self.failed_tracks[0][0].raw_data.keys())
-                    all_fields = base_fields + ["playlist_subfolder"]
-
-                    writer = csv.DictWriter(f, fieldnames=all_fields)
-                    writer.writeheader()
-                    for track, _ in self.failed_tracks:
-                        row_data = track.raw_data.copy()
-                        # Add playlist_subfolder if it exists
-                        row_data["playlist_subfolder"] = getattr(track, "playlist_subfolder", "")
-                        writer.writerow(row_data)
+            # El CSV ya se escribió incrementalmente; solo se vuelca entero si no se pudo
+            if streamed:
+                os.replace(self._fail_csv_part(), self.cfg.ERROR_CSV)
+            else:
+                with open(self.cfg.ERROR_CSV, "w", encoding="utf-8", newline="") as f:
+                    writer = self._fail_csv_writer(f, self.failed_tracks[0][0])
+                    writer.writerows(self._fail_row(track) for track, _ in self.failed_tracks)
         except Exception as e:
             self.log.error(f"Failed to record failed tracks: {e}")
 
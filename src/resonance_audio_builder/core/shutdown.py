@@ -0,0 +1,68 @@
+"""
+Tareas de cierre centralizadas.
+
+Los módulos registran aquí sus flush/close en lugar de un atexit.register
+por objeto. cli.main las ejecuta en paralelo al terminar; el único hook
+atexit es el respaldo secuencial (desde Python 3.12 no se pueden crear
+hilos dentro de atexit).
+"""
+
+import atexit
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+_tasks: List[Callable[[], None]] = []
+_lock = threading.Lock()
+
+
+def register(fn: Callable[[], None]) -> Callable[[], None]:
+    """Registra una tarea de cierre (idempotente)."""
+    with _lock:
+        if fn not in _tasks:
+            _tasks.append(fn)
+    return fn
+
+
+def unregister(fn: Callable[[], None]):
+    """Quita una tarea ya ejecutada manualmente (p. ej. close())."""
+    with _lock:
+        try:
+            _tasks.remove(fn)
+        except ValueError:
+            pass
+
+
+def _call(fn: Callable[[], None]) -> Optional[str]:
+    try:
+        fn()
+        return None
+    except Exception:
+        return traceback.format_exc()
+
+
+def run_shutdown(parallel: bool = True):
+    """Ejecuta una sola vez todas las tareas registradas; los fallos van a crash_exit.txt"""
+    with _lock:
+        tasks = _tasks[:]
+        _tasks.clear()
+    if not tasks:
+        return
+
+    if parallel and len(tasks) > 1:
+        # Archivos independientes: los flush/fsync se solapan
+        with ThreadPoolExecutor(max_workers=min(4, len(tasks))) as pool:
+            errors = [e for e in pool.map(_call, tasks) if e]
+    else:
+        errors = [e for e in map(_call, tasks) if e]
+
+    if errors:
+        try:
+            with open("crash_exit.txt", "a", encoding="utf-8") as f:
+                f.writelines(errors)
+        except Exception:
+            pass
+
+
+atexit.register(run_shutdown, parallel=False)
@@ -4,7 +4,8 @@ import time
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
-from resonance_audio_builder.audio.metadata import TrackMetadata
+from resonance_audio_builder.audio.metadata import TrackMetadata, legacy_track_id, make_track_id
+from resonance_audio_builder.core import shutdown
 from resonance_audio_builder.core.config import Config
 
 
@@ -24,6 +25,9 @@ class DownloadState:
 class ProgressDB:
     """Gestor de estado persistente usando SQLite con WAL mode."""
 
+    # Con autosave activo, mark() no hace commit; un hilo lo hace cada N segundos
+    AUTOSAVE_INTERVAL = 5.0
+
     def __init__(self, config: Config):
         self.cfg = config
         self.db_path = config.CHECKPOINT_FILE.replace(".json", ".db")
@@ -31,6 +35,9 @@ class ProgressDB:
         self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self._conn.execute("PRAGMA journal_mode=WAL")
         self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._dirty = False
+        self._saver: Optional[threading.Thread] = None
+        self._saver_stop = threading.Event()
         self._init_db()
 
     def _init_db(self):
@@ -52,8 +59,24 @@ class ProgressDB:
             )
 
             self._conn.execute("CREATE INDEX IF NOT EXISTS idx_status ON downloads(status)")
+            self._migrate_track_ids()
             self._conn.commit()
 
+    def _migrate_track_ids(self):
+        """v1: IDs sin ISRC pasan de MD5 truncado a BLAKE2b (make_track_id)"""
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] >= 1:
+            return
+        rows = self._conn.execute(
+            "SELECT track_id, artist, title FROM downloads WHERE track_id NOT LIKE 'isrc\\_%' ESCAPE '\\'"
+        ).fetchall()
+        updates = [
+            (make_track_id(artist or "", title or ""), tid)
+            for tid, artist, title in rows
+            if tid == legacy_track_id(artist or "", title or "")
+        ]
+        self._conn.executemany("UPDATE OR IGNORE downloads SET track_id = ? WHERE track_id = ?", updates)
+        self._conn.execute("PRAGMA user_version = 1")
+
     def mark(self, track: TrackMetadata, status: str, bytes_n: int = 0, error: Optional[str] = None):
         """Registra progreso de una descarga"""
         with self.lock:
@@ -85,7 +108,51 @@ class ProgressDB:
                     (track.track_id, track.artist, track.title, status, bytes_n, error, time.time()),
                 )
 
-            self._conn.commit()
+            if self._saver is None:
+                self._conn.commit()
+            else:
+                self._dirty = True
+
+    def commit(self):
+        """Persiste las marcas pendientes del autosave"""
+        with self.lock:
+            if self._dirty:
+                self._conn.commit()
+                self._dirty = False
+
+    def start_autosave(self, interval: Optional[float] = None):
+        """Agrupa los commits de mark() en un hilo propio (fuera del bucle de descargas)"""
+        with self.lock:
+            if self._saver is not None:
+                return
+            self._saver_stop.clear()
+            self._saver = threading.Thread(
+                target=self._autosave_loop,
+                args=(interval or self.AUTOSAVE_INTERVAL,),
+                name="progress-saver",
+                daemon=True,
+            )
+            self._saver.start()
+        shutdown.register(self.commit)
+
+    def stop_autosave(self):
+        """Detiene el hilo de autosave y hace el commit final"""
+        saver = self._saver
+        if saver is None:
+            return
+        self._saver_stop.set()
+        saver.join(timeout=5)
+        with self.lock:
+            self._saver = None
+        shutdown.unregister(self.commit)
+        self.commit()
+
+    def _autosave_loop(self, interval: float):
+        while not self._saver_stop.wait(interval):
+            try:
+                self.commit()
+            except Exception:
+                pass
 
     def is_done(self, track_id: str) -> bool:
         """Verifica si una descarga está completada exitosamente"""
@@ -134,6 +201,7 @@ class ProgressDB:
 
     def close(self):
         """Cierra la conexión a la base de datos"""
+        self.stop_autosave()
         with self.lock:
             self._conn.close()
 
@@ -1,4 +1,5 @@
 import threading
+import traceback
 from collections import deque
 from dataclasses import dataclass
 from importlib.metadata import PackageNotFoundError, version
@@ -31,6 +32,7 @@ from rich.table import Table
 from rich.text import Text
 
 from resonance_audio_builder.core.config import Config
+from resonance_audio_builder.core.logger import flush_console
 
 console = Console()
 
@@ -91,13 +93,19 @@ def format_time(seconds: float) -> str:
     return f"{m}m {s:02d}s"
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+_SIZE_DIVS = (1, 1 << 10, 1 << 20, 1 << 30, 1 << 40)
+
+
 def format_size(size_bytes: int) -> str:
     """Format byte count into a human-readable size string."""
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size_bytes < 1024:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes //= 1024
-    return f"{size_bytes:.2f} TB"
+    # Unidad = potencia de 1024 via bit_length, sin cadena de comparaciones
+    i = min(4, max(0, (int(size_bytes).bit_length() - 1) // 10))
+    return f"{size_bytes / _SIZE_DIVS[i]:.2f} {_SIZE_UNITS[i]}"
+
+
+# Líneas visibles en el panel de log del dashboard
+_LOG_WINDOW_LINES = 8
 
 
 class RichUI:
@@ -132,8 +140,10 @@ class RichUI:
         # Internal State tracking for Table (Shadow State)
         self.active_tasks: Dict[TaskID, UITask] = {}
 
-        self.log_buffer: deque[str] = deque(maxlen=20)
+        # Ring del tamaño exacto de la ventana de log (footer de 10 filas - bordes)
+        self.log_buffer: deque[str] = deque(maxlen=_LOG_WINDOW_LINES)
         self.log_text = Text("")
+        self._log_dirty = False
 
     def start(self, total: int):
         """Inicializa y arranca el dashboard Live"""
@@ -141,6 +151,8 @@ class RichUI:
             if self.live:
                 return
 
+            # Mensajes del Logger aún en cola: imprimirlos antes de entrar en la pantalla alterna
+            flush_console()
             self.main_task = self.overall_progress.add_task("[cyan]Batch Progress", total=total)
 
             self.layout = Layout()
@@ -188,6 +200,7 @@ class RichUI:
 
             # Stats / Logs
             if self.cfg.DEBUG_MODE:
+                self._render_log()
                 self.layout["footer"].update(Panel(self.log_text, title="Log", border_style="dim"))
             else:
                 self.layout["footer"].visible = False
@@ -213,8 +226,6 @@ Active Workers: {pending_count}
         except Exception as e:
             with open("debug_ui.txt", "a", encoding="utf-8") as f:
                 f.write(f"CRASH in make_layout: {e}\n")
-                import traceback
-
                 f.write(traceback.format_exc())
             return Layout()  # Return empty layout on crash
 
@@ -224,6 +235,7 @@ Active Workers: {pending_count}
             if self.live:
                 self.live.stop()
                 self.live = None
+        flush_console()
 
     def update_main_progress(self, advance: int = 1):
         """Advance the overall progress bar."""
@@ -271,10 +283,15 @@ Active Workers: {pending_count}
 
     def add_log(self, msg: str):
         """Append a log message to the live log buffer."""
-        # Called from Logger. Update the log text buffer.
+        # Called from Logger: solo encola; el texto se reconstruye una vez por refresh de Live
         self.log_buffer.append(msg)
-        clean_text = "\n".join(list(self.log_buffer)[-8:])
-        self.log_text.plain = clean_text
+        self._log_dirty = True
+
+    def _render_log(self):
+        """Rebuild the log panel text if new lines arrived since the last refresh."""
+        if self._log_dirty:
+            self._log_dirty = False
+            self.log_text.plain = "\n".join(tuple(self.log_buffer))
 
     def show_summary(self, stats: dict):
         """Display the final session summary table."""
@@ -1,22 +1,99 @@
 import hashlib
 import json
 import os
+from collections import deque
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Iterator, List, Tuple
+
+try:
+    import orjson  # Opcional: parser/serializador JSON en C
+except ImportError:
+    orjson = None
+
+_HASH_CHUNK_SIZE = 1 << 20  # 1MB chunks
+
+
+def json_loads(data):
+    """json.loads usando orjson si está instalado (acepta str o bytes)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_line(obj) -> bytes:
+    """Serializa `obj` como una línea JSON UTF-8 (sin escapar no-ASCII) terminada en \\n"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _md5():
+    return hashlib.md5(usedforsecurity=False)
+
+
+def _hash_file(new_hasher: Callable, file_path: Path) -> str:
+    """Hashea un archivo con el constructor dado (p. ej. hashlib.sha256)."""
+    if hasattr(hashlib, "file_digest"):
+        # Python 3.11+: bucle de lectura en C (readinto sobre archivo sin buffer)
+        with open(file_path, "rb", buffering=0) as f:
+            return hashlib.file_digest(f, new_hasher).hexdigest()
+    hasher = new_hasher()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
 
 
 def calculate_md5(file_path: Path) -> str:
     """Calcula hash MD5 de un archivo"""
-    hash_md5 = hashlib.md5(usedforsecurity=False)
     try:
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(131072), b""):  # 128KB chunks
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+        return _hash_file(_md5, file_path)
     except Exception:
         return ""
 
 
+AUDIO_EXTENSIONS = frozenset({".m4a", ".mp3"})
+
+
+def _walk_audio_entries(root, exts: frozenset) -> Iterator[os.DirEntry]:
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    name = entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+                        dot = name.rfind(".")
+                        if dot > 0 and name[dot:].lower() in exts and entry.is_file():
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def walk_audio(root, exts: frozenset = AUDIO_EXTENSIONS) -> Iterator[str]:
+    """
+    Recorre `root` recursivamente con os.scandir y genera las rutas cuyo
+    sufijo (en minúsculas) está en `exts`. Usa el tipo del dirent, sin
+    stat() por entrada, y no sigue enlaces simbólicos a directorios.
+    """
+    for entry in _walk_audio_entries(root, exts):
+        yield entry.path
+
+
+def walk_audio_stats(root, exts: frozenset = AUDIO_EXTENSIONS) -> Iterator[Tuple[str, os.stat_result]]:
+    """Como walk_audio pero genera (ruta, stat) con el stat() del DirEntry (gratis en Windows)."""
+    for entry in _walk_audio_entries(root, exts):
+        try:
+            yield entry.path, entry.stat()
+        except OSError:
+            continue
+
+
 def export_m3u(tracks: List[Tuple[str, str, int]], filepath: str):
     """Exporta lista de canciones a formato M3U"""
     try:
@@ -38,32 +115,26 @@ def export_playlist_m3us(playlist_tracks_map: dict, output_folder: str):
         output_folder: Carpeta base (ej: Audio_HQ)
     """
     try:
+        # Las entradas salen de los metadatos (no se lista el disco); la carpeta se crea una vez
+        if any(playlist_tracks_map.values()):
+            os.makedirs(output_folder, exist_ok=True)
 
         for playlist_name, tracks in playlist_tracks_map.items():
             if not tracks:
                 continue
 
             # El M3U se guarda en la raíz de la carpeta de salida (Audio_HQ/Playlist.m3u8)
-            os.makedirs(output_folder, exist_ok=True)
             m3u_path = os.path.join(output_folder, f"{playlist_name}.m3u8")
             m3u_tracks = []
 
             for track in tracks:
                 # Subcarpeta de descarga real (donde vive el archivo)
-                subfolder = getattr(track, "playlist_subfolder", playlist_name)
-                track_rel_folder = subfolder
-
-                # Nombre del archivo esperado
-                filename = f"{track.safe_filename}.m4a"
-                rel_file_path = os.path.join(track_rel_folder, filename).replace(os.sep, "/")
-
-                # Información para el M3U
-                title = f"{track.artist} - {track.title}"
-                duration = track.duration_seconds
+                subfolder = getattr(track, "playlist_subfolder", "") or playlist_name
+                rel_file_path = f"{subfolder}/{track.safe_filename}.m4a".replace(os.sep, "/")
 
                 # Agregamos la entrada independientemente de si existe en disco
                 # para que el M3U refleje el CSV completo.
-                m3u_tracks.append((rel_file_path, title, duration))
+                m3u_tracks.append((rel_file_path, f"{track.artist} - {track.title}", track.duration_seconds))
 
             if m3u_tracks:
                 export_m3u(m3u_tracks, m3u_path)
@@ -71,24 +142,47 @@ def export_playlist_m3us(playlist_tracks_map: dict, output_folder: str):
         pass
 
 
-def save_history(history_file: str, session_data: dict):
-    """Guarda historial de sesion"""
-    history = []
-    if os.path.exists(history_file):
-        try:
-            with open(history_file, "r", encoding="utf-8") as f:
-                history = json.load(f)
-        except Exception:
-            pass
+_HISTORY_LIMIT = 50
 
-    history.append(session_data)
 
-    # Mantener solo ultimas 50 sesiones
-    if len(history) > 50:
-        history = history[-50:]
+def _compact_history(history_file: str):
+    """Convierte un historial legado (array JSON) a JSON Lines y recorta a _HISTORY_LIMIT.
 
+    Las lineas nuevas se añaden sin reescribir; solo se recorta cuando el archivo
+    pasa de 2 * _HISTORY_LIMIT sesiones, así que el tamaño queda acotado.
+    """
     try:
-        with open(history_file, "w", encoding="utf-8") as f:
-            json.dump(history, f, indent=2, ensure_ascii=False)
+        with open(history_file, "rb") as f:
+            data = f.read()
+        if data[:1] == b"[":
+            history = json_loads(data)
+        else:
+            lines = [line for line in data.splitlines() if line.strip()]
+            if len(lines) <= 2 * _HISTORY_LIMIT:
+                return
+            history = [json_loads(line) for line in lines]
+        with open(history_file, "wb") as f:
+            f.writelines(json_dumps_line(s) for s in history[-_HISTORY_LIMIT:])
     except Exception:
         pass
+
+
+def save_history(history_file: str, session_data: dict):
+    """Guarda historial de sesion (una linea JSON por sesion)"""
+    if os.path.exists(history_file):
+        _compact_history(history_file)
+    try:
+        with open(history_file, "ab") as f:
+            f.write(json_dumps_line(session_data))
+    except Exception:
+        pass
+
+
+def load_history(history_file: str, limit: int = _HISTORY_LIMIT) -> List[dict]:
+    """Devuelve las ultimas `limit` sesiones (el recorte se hace al leer)"""
+    try:
+        with open(history_file, "rb") as f:
+            lines = deque((line for line in f if line.strip()), maxlen=limit)
+        return [json_loads(line) for line in lines]
+    except Exception:
+        return []
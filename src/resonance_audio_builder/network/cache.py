@@ -1,22 +1,52 @@
 import sqlite3
 import threading
 import time
+from collections import OrderedDict
+
+from resonance_audio_builder.core import shutdown
 
 
 class CacheManager:
-    """SQLite-backed key-value cache for search results."""
+    """SQLite-backed key-value cache for search results.
+
+    Un único escritor (self.conn, serializado con self.lock) y una conexión
+    de lectura por hilo: en WAL las lecturas no esperan al escritor.
+    Todas las conexiones van en autocommit; las escrituras abren su propia
+    transacción con BEGIN IMMEDIATE para tomar el lock de SQLite una sola vez.
+    """
+
+    # Las escrituras se agrupan en una sola transacción cada N filas o T segundos
+    FLUSH_MAX_ROWS = 200
+    FLUSH_INTERVAL = 2.0
+    # Filas calientes en memoria para evitar lock + SELECT en hits repetidos
+    MEM_CAPACITY = 2048
+    # Ningún lector pide un TTL mayor (ISRC: 30 días); lo anterior se purga al abrir
+    MAX_AGE_HOURS = 24 * 30
 
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.lock = threading.Lock()
+        self._pending: dict[str, tuple] = {}
+        self._last_flush = time.time()
+        self._mem: OrderedDict[str, tuple] = OrderedDict()
+        self._mem_lock = threading.Lock()
+        self._tls = threading.local()
+        self._readers: list[sqlite3.Connection] = []
         self._init_db()
+        shutdown.register(self.flush)
 
     def _init_db(self):
         with self.lock:
             try:
-                # check_same_thread=False allows sharing connection across threads if locked
-                self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                # Autocommit: sin transacciones implícitas; check_same_thread=False porque
+                # el escritor se comparte entre hilos (serializado con self.lock)
+                self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
                 self.cursor = self.conn.cursor()
+                self.cursor.execute("PRAGMA journal_mode=WAL")
+                self.cursor.execute("PRAGMA synchronous=NORMAL")
+                self.cursor.execute("PRAGMA temp_store=MEMORY")
+                self.cursor.execute("PRAGMA mmap_size=268435456")
+                self.cursor.execute("PRAGMA cache_size=-65536")
                 self.cursor.execute(
                     """
                     CREATE TABLE IF NOT EXISTS cache (
@@ -28,7 +58,11 @@ class CacheManager:
                     )
                 """
                 )
-                self.conn.commit()
+                # Índice por antigüedad: la purga borra solo las filas vencidas, sin ordenar toda la tabla
+                self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_timestamp ON cache(timestamp)")
+                self.cursor.execute(
+                    "DELETE FROM cache WHERE timestamp <= ?", (time.time() - self.MAX_AGE_HOURS * 3600,)
+                )
             except Exception as e:
                 print(f"[!] Cache DB Init Error: {e}")
 
@@ -37,34 +71,98 @@ class CacheManager:
         if not hasattr(self, "cursor"):
             return None
         limit_time = time.time() - (ttl_hours * 3600)
-        with self.lock:
-            try:
-                self.cursor.execute(
-                    "SELECT url, title, duration FROM cache WHERE key = ? AND timestamp > ?", (key, limit_time)
-                )
-                row = self.cursor.fetchone()
-                if row:
-                    return {"url": row[0], "title": row[1], "duration": row[2]}
-            except Exception:
-                pass
+
+        # 1. LRU en memoria (sin tocar SQLite)
+        with self._mem_lock:
+            hot = self._mem.get(key)
+            if hot:
+                self._mem.move_to_end(key)
+        if hot and hot[3] > limit_time:
+            return {"url": hot[0], "title": hot[1], "duration": hot[2]}
+
+        # 2. Escrituras aún no volcadas + SQLite (conexión del hilo, sin lock)
+        pending = self._pending.get(key)
+        row = pending[1:] if pending else self._select(key, limit_time)
+        if not row or row[3] <= limit_time:
             return None
+        self._remember(key, row)
+        return {"url": row[0], "title": row[1], "duration": row[2]}
+
+    def _reader(self) -> sqlite3.Connection:
+        """Conexión de lectura propia del hilo actual (autocommit, solo lectura)"""
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA query_only=ON")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._tls.conn = conn
+            with self._mem_lock:
+                self._readers.append(conn)
+        return conn
+
+    def _select(self, key: str, limit_time: float):
+        query = "SELECT url, title, duration, timestamp FROM cache WHERE key = ? AND timestamp > ?"
+        try:
+            if self.db_path == ":memory:":
+                # Cada conexión :memory: es una base distinta -> usar la del escritor
+                with self.lock:
+                    return self.cursor.execute(query, (key, limit_time)).fetchone()
+            return self._reader().execute(query, (key, limit_time)).fetchone()
+        except Exception:
+            return None
+
+    def _remember(self, key: str, row: tuple):
+        """Insert (url, title, duration, timestamp) into the in-memory LRU."""
+        with self._mem_lock:
+            self._mem[key] = row
+            self._mem.move_to_end(key)
+            if len(self._mem) > self.MEM_CAPACITY:
+                self._mem.popitem(last=False)
 
     def set(self, key: str, data: dict):
-        """Store or update a cache entry."""
+        """Store or update a cache entry (buffered, see flush)."""
+        if not hasattr(self, "cursor"):
+            return
+        now = time.time()
+        try:
+            row = (data["url"], data.get("title", ""), data.get("duration", 0), now)
+        except (KeyError, TypeError, AttributeError):
+            return  # Entrada malformada: se ignora, como antes
+        self._remember(key, row)
+        with self.lock:
+            self._pending[key] = (key, *row)
+            if len(self._pending) >= self.FLUSH_MAX_ROWS or now - self._last_flush > self.FLUSH_INTERVAL:
+                self._flush_locked()
+
+    def flush(self):
+        """Write all buffered entries to disk in a single transaction."""
         if not hasattr(self, "cursor"):
             return
         with self.lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.time()
+        if not self._pending:
+            return
+        rows = list(self._pending.values())
+        try:
+            self.cursor.execute("BEGIN IMMEDIATE")
+            self.cursor.executemany(
+                """
+                INSERT OR REPLACE INTO cache (key, url, title, duration, timestamp)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
+            self.cursor.execute("COMMIT")
+        except Exception:
             try:
-                self.cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO cache (key, url, title, duration, timestamp)
-                    VALUES (?, ?, ?, ?, ?)
-                """,
-                    (key, data["url"], data["title"], data.get("duration", 0), time.time()),
-                )
-                self.conn.commit()
+                self.cursor.execute("ROLLBACK")
             except Exception:
                 pass
+        # Vaciar tras el commit: los lectores sin lock siempre ven la fila en algún sitio
+        self._pending.clear()
 
     def clear(self):
         """Delete all entries from the cache."""
@@ -75,8 +173,10 @@ class CacheManager:
         if not acquired:
             return
         try:
+            self._pending.clear()
+            with self._mem_lock:
+                self._mem.clear()
             self.cursor.execute("DELETE FROM cache")
-            self.conn.commit()
         except Exception:
             pass
         finally:
@@ -86,24 +186,39 @@ class CacheManager:
         """Return the number of entries in the cache."""
         if not hasattr(self, "cursor"):
             return 0
-        with self.lock:
+        self.flush()
+        try:
+            if self.db_path == ":memory:":
+                with self.lock:
+                    return self.cursor.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            return self._reader().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        except Exception:
+            return 0
+
+    def _close_readers(self):
+        with self._mem_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
             try:
-                self.cursor.execute("SELECT COUNT(*) FROM cache")
-                return self.cursor.fetchone()[0]
+                conn.close()
             except Exception:
-                return 0
+                pass
 
     def __del__(self):
         """Cleanup: close connection when object is destroyed"""
         if hasattr(self, "conn"):
             try:
+                self._close_readers()
                 self.conn.close()
             except Exception:
                 pass
 
     def close(self):
         """Explicit close method"""
+        shutdown.unregister(self.flush)
+        self._close_readers()
         if self.conn:
+            self.flush()
             self.conn.close()
 
     def __enter__(self):
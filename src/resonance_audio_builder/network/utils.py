@@ -1,18 +1,29 @@
+import itertools
+import os
 import random
 import re
-from pathlib import Path
 
-USER_AGENTS = [
+USER_AGENTS = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 Safari/605.1.15",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36",
-]
+)
+
+
+def _user_agent_cycle():
+    agents = list(USER_AGENTS)
+    random.shuffle(agents)  # nosec B311
+    return itertools.cycle(agents)
+
+
+# Orden aleatorio una sola vez; luego rotación O(1) sin tocar el PRNG
+_UA_CYCLE = _user_agent_cycle()
 
 
 def get_random_user_agent() -> str:
-    """Retorna un User-Agent aleatorio de la lista"""
-    return random.choice(USER_AGENTS)  # nosec B311
+    """Retorna el siguiente User-Agent de la rotación (barajada al importar)"""
+    return next(_UA_CYCLE)
 
 
 def is_valid_ip(ip: str) -> bool:
@@ -24,14 +35,20 @@ def is_valid_ip(ip: str) -> bool:
     return all(0 <= int(part) <= 255 for part in ip.split("."))
 
 
+_COOKIE_HEADERS = (b"# Netscape HTTP Cookie File", b"# HTTP Cookie File")
+
+
 def validate_cookies_file(filepath: str) -> bool:
     """Valida que el archivo de cookies tenga formato Netscape"""
-    path = Path(filepath)
-    if not path.exists():
+    # Solo los primeros 64 bytes en crudo: sin buffer de texto ni decodificación
+    try:
+        fd = os.open(filepath, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except (OSError, TypeError, ValueError):
         return False
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            first_line = f.readline().strip()
-            return first_line.startswith("# Netscape HTTP Cookie File") or first_line.startswith("# HTTP Cookie File")
-    except Exception:
+        head = os.read(fd, 64)
+    except OSError:
         return False
+    finally:
+        os.close(fd)
+    return head.lstrip().startswith(_COOKIE_HEADERS)
@@ -1,3 +1,4 @@
+import subprocess
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -17,14 +18,14 @@ class TestAudioAnalyzer:
         """Genuine 320kbps file should pass"""
         with patch("subprocess.run") as mock_run:
             # Simulate high RMS (-50dB is > -75dB threshold) => Genuine
-            mock_run.return_value = MagicMock(stderr="[Parsed_astats] Overall.RMS_level=-50.0")
+            mock_run.return_value = MagicMock(stderr=b"[Parsed_astats] Overall.RMS_level=-50.0")
             assert analyzer.analyze_integrity(sample_mp3_320k, 20000) is True
 
     def test_analyze_fake_upscaled_128k(self, analyzer, fake_mp3_upscaled):
         """128k upscaled to 320k should fail"""
         with patch("subprocess.run") as mock_run:
             # Simulate low RMS (-80dB is < -75dB threshold) => Fake
-            mock_run.return_value = MagicMock(stderr="Overall.RMS_level=-80.0")
+            mock_run.return_value = MagicMock(stderr=b"Overall.RMS_level=-80.0")
             assert analyzer.analyze_integrity(fake_mp3_upscaled, 20000) is False
 
     def test_analyze_missing_file(self, analyzer, tmp_path):
@@ -44,12 +45,17 @@ class TestAudioAnalyzer:
     def test_analyze_with_custom_cutoff(self, analyzer, sample_mp3_320k):
         """Custom cutoff should be passed to ffmpeg"""
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stderr="Overall.RMS_level=-50.0")
+            mock_run.return_value = MagicMock(stderr=b"Overall.RMS_level=-50.0")
             analyzer.analyze_integrity(sample_mp3_320k, 15000)
 
             assert mock_run.called
             args = mock_run.call_args[0][0]  # cmd list
             assert any("highpass=f=15000" in arg for arg in args)
+            # Solo audio y sin stdin: la carátula no se decodifica
+            assert "-nostdin" in args
+            assert args.index("-vn") < args.index("-i")
+            # stdout de "-f null -" no se captura
+            assert mock_run.call_args.kwargs["stdout"] is subprocess.DEVNULL
 
     # --- Edge Cases ---
     def test_analyze_flac_lossless(self, analyzer, tmp_path):
@@ -57,13 +63,13 @@ class TestAudioAnalyzer:
         flac = tmp_path / "test.flac"
         flac.touch()
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stderr="Overall.RMS_level=-40.0")
+            mock_run.return_value = MagicMock(stderr=b"Overall.RMS_level=-40.0")
             assert analyzer.analyze_integrity(flac, 20000) is True
 
     def test_analyze_silence_file(self, analyzer, sample_mp3_320k):
         """Silence file (low RMS) should be flagged"""
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stderr="Overall.RMS_level=-95.0")
+            mock_run.return_value = MagicMock(stderr=b"Overall.RMS_level=-95.0")
             assert analyzer.analyze_integrity(sample_mp3_320k, 20000) is False
 
     @pytest.mark.parametrize(
@@ -71,9 +77,62 @@ class TestAudioAnalyzer:
         [
             ("-90.0", False),  # Too quiet -> Fake
             ("-60.0", True),  # Loud -> Genuine
+            ("-inf", False),  # Silence above cutoff -> Fake
         ],
     )
     def test_rms_threshold_boundaries(self, analyzer, sample_mp3_320k, rms_level, expected):
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stderr=f"Overall.RMS_level={rms_level}")
+            mock_run.return_value = MagicMock(stderr=f"Overall.RMS_level={rms_level}".encode())
             assert analyzer.analyze_integrity(sample_mp3_320k, 20000) is expected
+
+    def test_analyze_batch_maps_filter_index_to_input(self, analyzer, tmp_path):
+        files = [tmp_path / "a.m4a", tmp_path / "b.m4a"]
+        # Los resúmenes salen al cerrar el grafo, no necesariamente en orden de entrada
+        stderr = b"".join(
+            [
+                b"Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'a.m4a':\n",
+                b"Input #1, mov,mp4,m4a,3gp,3g2,mj2, from 'b.m4a':\n",
+                _astats_summary(3, channel_rms="-inf", overall_rms="-inf"),
+                _astats_summary(1, channel_rms="-49.871233", overall_rms="-52.504120"),
+                b"[out#0/null @ 0x5581f1a3e2c0] video:0kB audio:41344kB subtitle:0kB other streams:0kB\n",
+            ]
+        )
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(stderr=stderr)
+            res = analyzer.analyze_integrity_batch(files, 16000)
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd.count("-i") == 2
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert "[1:a]highpass=f=16000,astats[a1]" in graph
+        assert "reset" not in graph
+        assert res == {files[0]: True, files[1]: False}
+
+    def test_analyze_batch_ignores_per_channel_rms(self, analyzer, tmp_path):
+        stderr = _astats_summary(1, channel_rms="-40.000000", overall_rms="-90.000000")
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(stderr=stderr.replace(b"\n", b"\r\n"))
+            assert analyzer.analyze_integrity_batch([tmp_path / "a.m4a"]) == {tmp_path / "a.m4a": False}
+
+    def test_analyze_batch_unparsed_output_falls_back(self, analyzer, tmp_path):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(stderr=_astats_summary(1, channel_rms="-50.0", overall_rms="-50.0"))
+            assert analyzer.analyze_integrity_batch([tmp_path / "a.m4a", tmp_path / "b.m4a"]) is None
+
+
+def _astats_summary(idx, channel_rms, overall_rms):
+    """Resumen de astats tal como lo imprime ffmpeg al cerrar el filtro (un canal)."""
+    prefix = f"[Parsed_astats_{idx} @ 0x5581f1b0{idx:04x}] ".encode()
+    common = [
+        "DC offset: 0.000003",
+        "Min level: -0.031250",
+        "Max level: 0.030518",
+        "Min difference: 0.000000",
+        "Max difference: 0.012207",
+        "Mean difference: 0.000410",
+        "RMS difference: 0.000611",
+        "Peak level dB: -30.103000",
+    ]
+    channel = ["Channel: 1", *common, f"RMS level dB: {channel_rms}", "RMS peak dB: -38.120455", "Crest factor: 9.2"]
+    overall = ["Overall", *common, f"RMS level dB: {overall_rms}", "Number of samples: 10584576"]
+    return b"".join(prefix + line.encode() + b"\n" for line in channel + overall)
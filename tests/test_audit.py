@@ -2,7 +2,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from resonance_audio_builder.audio.audit import AudioAuditor
+from resonance_audio_builder.audio.audit import AudioAuditor, AuditResult
 
 
 class TestAudioAuditor:
@@ -58,12 +58,111 @@ class TestAudioAuditor:
         track1 = hq_dir / "fake.m4a"
         track1.write_bytes(b"dummy")
 
-        with patch("resonance_audio_builder.audio.audit.MP4"):
+        with patch("resonance_audio_builder.audio.audit.MP4") as mock_mp4:
+            mock_mp4.return_value.info.bitrate = 320000
             with patch.object(auditor.analyzer, "analyze_integrity", return_value=False):
                 res = auditor._audit_folder(hq_dir, check_spectral=True)
                 assert len(res.fake_hq_detected) == 1
                 assert res.fake_hq_detected[0] == "fake.m4a"
 
+    def test_audit_folder_spectral_batched(self, auditor, tmp_path):
+        hq_dir = tmp_path / "HQ"
+        hq_dir.mkdir()
+        for name in ("a.m4a", "b.m4a", "c.m4a"):
+            (hq_dir / name).write_bytes(b"dummy")
+        auditor.SPECTRAL_BATCH_SIZE = 2
+
+        def fake_batch(paths):
+            return {p: p.name != "b.m4a" for p in paths}
+
+        with (
+            patch("resonance_audio_builder.audio.audit.MP4") as mock_mp4,
+            patch.object(auditor.analyzer, "analyze_integrity_batch", side_effect=fake_batch) as batch,
+            patch.object(auditor.analyzer, "analyze_integrity") as single,
+        ):
+            mock_mp4.return_value.info.bitrate = 320000
+            res = auditor._audit_folder(hq_dir, check_spectral=True)
+
+        assert batch.call_count == 2
+        assert not single.called
+        assert res.fake_hq_detected == ["b.m4a"]
+
+    def test_audit_folder_low_bitrate_skips_ffmpeg(self, auditor, tmp_path):
+        (tmp_path / "low.m4a").write_bytes(b"dummy")
+
+        with (
+            patch("resonance_audio_builder.audio.audit.MP4") as mock_mp4,
+            patch.object(auditor.analyzer, "analyze_integrity_batch") as batch,
+            patch.object(auditor.analyzer, "analyze_integrity") as single,
+        ):
+            mock_mp4.return_value.info.bitrate = 128000
+            res = auditor._audit_folder(tmp_path, check_spectral=True)
+
+        assert res.fake_hq_detected == ["low.m4a"]
+        assert not batch.called and not single.called
+
+    def test_audit_folder_parallel_keeps_order(self, auditor, tmp_path):
+        hq_dir = tmp_path / "HQ"
+        hq_dir.mkdir()
+        names = [f"t{i:02d}.m4a" for i in range(20)]
+        for name in names:
+            (hq_dir / name).write_bytes(b"ab")
+        auditor.AUDIT_WORKERS = 4
+        ticks = []
+
+        with patch("resonance_audio_builder.audio.audit.MP4") as mock_mp4:
+            mock_mp4.return_value.__contains__.return_value = False
+            res = auditor._audit_folder(hq_dir, progress_callback=lambda: ticks.append(1))
+
+        assert res.total_files == 20
+        assert res.total_size_bytes == 40
+        assert sorted(res.missing_covers) == names
+        assert len(ticks) == 20
+
+    def test_audit_folder_reports_progress_as_files_finish(self, auditor, tmp_path):
+        import itertools
+        import threading
+
+        for i in range(3):
+            (tmp_path / f"t{i}.m4a").write_bytes(b"ab")
+        auditor.AUDIT_WORKERS = 3
+        first_tick = threading.Event()
+        waited = []
+
+        order = itertools.count()
+
+        def fake_entry(entry):
+            if next(order) > 0:
+                # El resto no termina hasta que la barra avanzó por el primero
+                waited.append(first_tick.wait(timeout=2))
+            return AuditResult(), 0
+
+        with patch.object(auditor, "_audit_entry", side_effect=fake_entry):
+            auditor._audit_folder(tmp_path, progress_callback=first_tick.set)
+
+        assert waited == [True, True]
+
+    def test_audit_mp3_frames(self, auditor, tmp_path):
+        from mutagen.id3 import APIC, ID3, TIT2, TPE1, USLT
+
+        tagged = tmp_path / "tagged.mp3"
+        tagged.write_bytes(b"")
+        tags = ID3()
+        tags.add(TIT2(encoding=3, text="T"))
+        tags.add(TPE1(encoding=3, text="A"))
+        tags.add(APIC(encoding=3, mime="image/jpeg", type=3, desc="cover", data=b"\xff\xd8"))
+        tags.add(USLT(encoding=3, lang="eng", desc="", text="la la"))
+        tags.save(tagged)
+        bare = tmp_path / "bare.mp3"
+        bare.write_bytes(b"")
+        ID3().save(bare)
+
+        res = auditor._audit_folder(tmp_path)
+
+        assert res.missing_metadata == ["bare.mp3"]
+        assert res.missing_covers == ["bare.mp3"]
+        assert res.missing_lyrics == ["bare.mp3"]
+
     def test_scan_library_integration(self, auditor, tmp_path):
         hq_dir = tmp_path / "HQ"
         hq_dir.mkdir()
@@ -79,3 +178,20 @@ class TestAudioAuditor:
             assert "Mobile" in results
             assert results["HQ"].total_files == 1
             assert results["Mobile"].total_files == 1
+
+    def test_audit_folder_reuses_parsed_tags(self, auditor, tmp_path):
+        track = tmp_path / "cached.m4a"
+        track.write_bytes(b"dummy")
+
+        with patch("resonance_audio_builder.audio.audit.MP4") as mock_mp4:
+            mock_mp4.return_value.__contains__.return_value = False
+            first = auditor._audit_folder(tmp_path)
+            second = auditor._audit_folder(tmp_path)
+            assert mock_mp4.call_count == 1
+
+            # Cambia el archivo -> se vuelve a leer
+            track.write_bytes(b"dummy2")
+            auditor._audit_folder(tmp_path)
+            assert mock_mp4.call_count == 2
+
+        assert first.missing_covers == second.missing_covers == ["cached.m4a"]
@@ -70,6 +70,14 @@ class TestApp:
         res = app._deduplicate_tracks([t1, t2, t3])
         assert len(res) == 2
 
+    def test_deduplicate_tracks_merges_playlists_in_order(self, app):
+        t1 = TrackMetadata(track_id="1", title="T1", artist="A1", playlists=["Rock", "Chill"])
+        t2 = TrackMetadata(track_id="1", title="T1", artist="A1", playlists=["Chill", "Gym"])
+
+        res = app._deduplicate_tracks([t1, t2])
+        assert res == [t1]
+        assert t1.playlists == ["Rock", "Chill", "Gym"]
+
     def test_select_quality(self, app):
         with (
             patch("resonance_audio_builder.core.builder.Prompt.ask", return_value="1"),
@@ -118,6 +126,43 @@ class TestApp:
             rows = app._read_csv(str(f))
             assert len(rows) > 0
 
+    def test_clear_temp_files_removes_raw_files_and_dirs(self, app, tmp_path):
+        (tmp_path / "ytraw_a.webm").write_bytes(b"x")
+        (tmp_path / "ytraw_run").mkdir()
+        (tmp_path / "ytraw_run" / "b.webm").write_bytes(b"x")
+        (tmp_path / "keep.txt").write_bytes(b"x")
+
+        with patch("resonance_audio_builder.core.builder.tempfile.gettempdir", return_value=str(tmp_path)):
+            app._clear_temp_files()
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["keep.txt"]
+
+    def test_read_csv_caches_encoding(self, app, tmp_path):
+        f = tmp_path / "latin1.csv"
+        f.write_bytes("Track Name,Artist\nCanción,Test\n".encode("latin-1"))
+
+        first = app._read_csv(str(f))
+        assert app._enc_cache[str(f)] == "latin-1"
+        with patch("builtins.open", wraps=open) as mock_open:
+            assert app._read_csv(str(f)) == first
+        assert mock_open.call_count == 1
+
+    def test_read_csv_fast_path_matches_stdlib(self, app, tmp_path):
+        """Large CSVs go through polars and yield the same rows as csv.DictReader"""
+        pytest.importorskip("polars")
+        f = tmp_path / "big.csv"
+        f.write_text('\ufeffTrack Name,Artist Name(s),ISRC\nSong,Artist,\n"A, B",C,X1\n', encoding="utf-8")
+
+        with patch("resonance_audio_builder.core.builder._FAST_CSV_MIN_BYTES", 0):
+            fast = app._read_csv(str(f))
+        slow = app._read_csv(str(f))
+
+        assert app._read_csv_fast(str(f)) is None  # below the size threshold
+        expected = [
+            {"Track Name": "Song", "Artist Name(s)": "Artist", "ISRC": ""},
+            {"Track Name": "A, B", "Artist Name(s)": "C", "ISRC": "X1"},
+        ]
+        assert fast == slow == expected
+
     def test_read_csv_malformed(self, app, tmp_path):
         """Test handling of malformed CSV"""
         f = tmp_path / "bad.csv"
@@ -146,3 +191,20 @@ class TestApp:
         ):
             app._retry_failed()
             assert mock_start.called
+
+    def test_retry_failed_flushes_log_before_prompt(self, app, tmp_path):
+        """Queued log lines reach the console before the retry prompt"""
+        f = tmp_path / "failed.csv"
+        f.write_text("Track Name,Artist Name(s)\nRetrySong,Artist", encoding="utf-8")
+        app.cfg.ERROR_CSV = str(f)
+        order = []
+        with (
+            patch("resonance_audio_builder.core.builder.console.print"),
+            patch("resonance_audio_builder.core.builder.flush_console", side_effect=lambda: order.append("flush")),
+            patch(
+                "resonance_audio_builder.core.builder.Prompt.ask",
+                side_effect=lambda *a, **k: order.append("ask") or "n",
+            ),
+        ):
+            app._retry_failed()
+        assert order[-2:] == ["flush", "ask"]
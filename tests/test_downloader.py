@@ -1,5 +1,4 @@
 import io
-import json
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -25,12 +24,85 @@ class TestAudioDownloader:
         f.write_bytes(b"\x00" * 100000)  # Mock large enough file
 
         mock_proc = MagicMock()
-        mock_proc.communicate = AsyncMock(return_value=(json.dumps({"format": {"duration": "180"}}).encode(), b""))
+        mock_proc.communicate = AsyncMock(return_value=(b"180.000000\n", b""))
         mock_proc.returncode = 0
 
-        with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
+        with patch("asyncio.create_subprocess_exec", return_value=mock_proc) as mock_exec:
             res = await downloader.validate_audio_file(f)
             assert res is True
+        # ffprobe solo pide la duración
+        assert "format=duration" in mock_exec.call_args[0]
+
+    @pytest.mark.asyncio
+    async def test_validate_audio_file_reads_mp4_header(self, downloader, tmp_path):
+        short, full = tmp_path / "short.m4a", tmp_path / "full.m4a"
+        short.write_bytes(b"\x00" * 100000)
+        full.write_bytes(b"\x00" * 100000)
+
+        with (
+            patch("resonance_audio_builder.audio.downloader.MP4") as mock_mp4,
+            patch("asyncio.create_subprocess_exec") as mock_exec,
+        ):
+            mock_mp4.return_value.info.length = 5.0
+            assert await downloader.validate_audio_file(short) is False
+            mock_mp4.return_value.info.length = 180.0
+            assert await downloader.validate_audio_file(full) is True
+        # ffprobe solo si mutagen no puede leer el archivo
+        assert not mock_exec.called
+
+    @pytest.mark.asyncio
+    async def test_validate_audio_file_cached_until_file_changes(self, downloader, tmp_path):
+        f = tmp_path / "cached.m4a"
+        f.write_bytes(b"\x00" * 100000)
+
+        with patch("resonance_audio_builder.audio.downloader.MP4") as mock_mp4:
+            mock_mp4.return_value.info.length = 180.0
+            assert await downloader.validate_audio_file(f) is True
+            assert await downloader.validate_audio_file(f) is True
+            assert mock_mp4.call_count == 1
+
+            f.write_bytes(b"\x00" * 100001)
+            mock_mp4.return_value.info.length = 1.0
+            assert await downloader.validate_audio_file(f) is False
+
+    @pytest.mark.asyncio
+    async def test_check_existing_files_validates_both_concurrently(self, downloader, tmp_path):
+        import asyncio
+
+        started = []
+        both_started = asyncio.Event()
+
+        async def fake_validate(path):
+            started.append(path.name)
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), 1)
+            return path.name == "hq.m4a"
+
+        downloader.validate_audio_file = fake_validate
+        res = await downloader._check_existing_files(tmp_path / "hq.m4a", tmp_path / "mob.m4a", True, True)
+        assert res == (True, False)
+
+    @pytest.mark.asyncio
+    async def test_cover_session_is_reused_until_closed(self, downloader):
+        session = downloader._cover_session()
+        assert downloader._cover_session() is session
+
+        await downloader.close()
+        assert session.closed
+        assert downloader._cover_session() is not session
+        await downloader.close()
+
+    @pytest.mark.asyncio
+    async def test_cover_resize_runs_on_dedicated_pool(self, downloader):
+        import threading
+
+        def fake_resize(data, max_size):
+            return threading.current_thread().name.encode()
+
+        downloader._resize_cover_sync = fake_resize
+        assert (await downloader._resize_cover(b"img")).startswith(b"cover_img")
+        await downloader.close()
 
     @pytest.mark.asyncio
     async def test_validate_audio_file_invalid(self, downloader, tmp_path):
@@ -40,6 +112,87 @@ class TestAudioDownloader:
         res = await downloader.validate_audio_file(f)
         assert res is False
 
+    def test_prepare_download_paths_creates_folders_once(self, downloader, tmp_path):
+        from resonance_audio_builder.core.config import QualityMode
+
+        downloader.cfg.MODE = QualityMode.BOTH
+        downloader.cfg.OUTPUT_FOLDER_HQ = str(tmp_path / "HQ")
+        downloader.cfg.OUTPUT_FOLDER_MOBILE = str(tmp_path / "Mobile")
+        track = TrackMetadata("1", "Title", "Artist")
+
+        with patch.object(Path, "mkdir") as mock_mkdir:
+            hq, mob, need_hq, need_mob = downloader._prepare_download_paths("List", track)
+            downloader._prepare_download_paths("List", TrackMetadata("2", "Other", "Artist"))
+        assert mock_mkdir.call_count == 2
+        assert hq == tmp_path / "HQ" / "List" / f"{track.safe_filename}.m4a"
+        assert mob.parent == tmp_path / "Mobile" / "List"
+        assert need_hq and need_mob
+
+    @pytest.mark.asyncio
+    async def test_spectral_analysis_runs_off_event_loop(self, downloader):
+        import asyncio
+        import threading
+
+        loop_thread = threading.current_thread()
+        seen = {}
+
+        def fake_check(raw, track):
+            seen["thread"] = threading.current_thread()
+            return True
+
+        downloader._check_fake_hq = fake_check
+        downloader._perform_transcoding_pipeline = AsyncMock(return_value=(True, 10))
+        assets = asyncio.create_task(asyncio.sleep(0))
+
+        res = await downloader._transcode_with_analysis(
+            Path("raw"), Path("hq"), Path("mob"), TrackMetadata("id", "t", "a"), True, False, assets
+        )
+        assert res == (True, 10, True)
+        assert seen["thread"] is not loop_thread
+
+    @pytest.mark.asyncio
+    async def test_ffmpeg_processes_are_capped(self, downloader, tmp_path):
+        import asyncio
+
+        downloader._ffmpeg_sem = asyncio.Semaphore(1)
+        running, peak = [0], [0]
+
+        async def fake_exec(*cmd, **kwargs):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            proc = MagicMock(returncode=1)
+
+            async def communicate():
+                await asyncio.sleep(0)
+                running[0] -= 1
+                return b"", b""
+
+            proc.communicate = communicate
+            return proc
+
+        with patch("asyncio.create_subprocess_exec", side_effect=fake_exec):
+            await asyncio.gather(*(downloader._transcode(Path("in"), tmp_path / f"{i}.m4a", "320") for i in range(3)))
+        assert peak[0] == 1
+
+    def test_ytdlp_file_logger_keeps_file_open(self, tmp_path):
+        from resonance_audio_builder.audio.downloader import _YtdlpFileLogger
+
+        log = _YtdlpFileLogger(str(tmp_path / "ytdlp_raw.log"))
+        with patch("builtins.open", wraps=open) as mock_open:
+            log.debug("one")
+            log.warning("two")
+        log.close()
+        assert mock_open.call_count == 1
+        assert (tmp_path / "ytdlp_raw.log").read_text(encoding="utf-8") == "[DEBUG] one\n[WARNING] two\n"
+
+    def test_size_or_zero(self, tmp_path):
+        from resonance_audio_builder.audio.downloader import _size_or_zero
+
+        f = tmp_path / "a.m4a"
+        assert _size_or_zero(f) == 0
+        f.write_bytes(b"x" * 10)
+        assert _size_or_zero(f) == 10
+
     @pytest.mark.asyncio
     async def test_download_skip_if_exists(self, downloader, tmp_path):
         # Setup paths
@@ -94,14 +247,26 @@ class TestAudioDownloader:
         assert opts["cookiefile"] == "cookies.txt"
         assert opts["outtmpl"] == str(out_tmpl)
 
+    def test_get_ytdlp_options_does_not_leak_between_calls(self, downloader):
+        downloader._cookies_valid = False
+        downloader.cfg.DEBUG_MODE = False
+        first = downloader._get_ytdlp_options(Path("a.%(ext)s"), "http://proxy:8080")
+        second = downloader._get_ytdlp_options(Path("b.%(ext)s"), None)
+        assert "proxy" not in second
+        assert second["outtmpl"] == "b.%(ext)s"
+        assert first["http_headers"] is not second["http_headers"]
+
     def test_handle_ytdlp_error_retryable(self, downloader):
-        from resonance_audio_builder.core.exceptions import RecoverableError
+        from resonance_audio_builder.core.exceptions import RateLimitError, RecoverableError
 
         e = Exception("HTTP Error 429: Too Many Requests")
 
-        with patch("time.sleep"):  # Don't actually sleep
-            with pytest.raises(RecoverableError):
+        with patch("time.sleep") as mock_sleep:
+            with pytest.raises(RecoverableError) as exc:
                 downloader._handle_ytdlp_error(e, None)
+        # Sin pausa bloqueante: el backoff lo hace el manager
+        assert isinstance(exc.value, RateLimitError)
+        assert not mock_sleep.called
 
     def test_handle_ytdlp_error_fatal(self, downloader):
         from resonance_audio_builder.core.exceptions import CopyrightError
@@ -114,7 +279,42 @@ class TestAudioDownloader:
     def test_build_ffmpeg_cmd(self, downloader):
         in_p = Path("in.webm")
         out_p = Path("out.m4a")
-        downloader._build_ffmpeg_cmd(in_p, out_p, "320")
+        cmd = downloader._build_ffmpeg_cmd(in_p, out_p, "320")
+        # moov al final: la inyección de tags con mutagen no debe desplazar el audio
+        assert "+faststart" not in cmd
+        assert cmd[-1] == "out.m4a"
+
+    def test_build_ffmpeg_multi_cmd_normalizes_once(self, downloader):
+        downloader.cfg.NORMALIZE_AUDIO = True
+        cmd = downloader._build_ffmpeg_multi_cmd(Path("in.webm"), [(Path("hq.m4a"), "320"), (Path("m.m4a"), "96")])
+        assert cmd.count("-i") == 1
+        assert cmd[cmd.index("-filter_complex") + 1].endswith("asplit=2[a0][a1]")
+        assert cmd.index("[a0]") < cmd.index("hq.m4a") < cmd.index("[a1]") < cmd.index("m.m4a")
+        assert cmd.count("-vn") == 2 and "-filter:a" not in cmd
+        # Un -threads para el decodificador y uno por codificador
+        assert cmd.count("-threads") == 3
+
+    def test_ffmpeg_threads_follow_process_bound(self):
+        cfg = Config()
+        with patch("resonance_audio_builder.audio.downloader._MAX_FFMPEG", 16):
+            cfg.MAX_WORKERS = 2
+            two = AudioDownloader(cfg, MagicMock())
+            cfg.MAX_WORKERS = 8
+            eight = AudioDownloader(cfg, MagicMock())
+        # 2 workers -> 4 procesos x 4 hilos; 8 workers -> 16 procesos x 1 hilo
+        assert (two._ffmpeg_sem._value, two._ffmpeg_threads) == (4, "4")
+        assert (eight._ffmpeg_sem._value, eight._ffmpeg_threads) == (16, "1")
+        cmd = two._build_ffmpeg_cmd(Path("in.webm"), Path("out.m4a"), "320")
+        assert cmd[cmd.index("-threads") + 1] == "4"
+
+    def test_build_ffmpeg_cmd_normalize_filter(self, downloader):
+        downloader.cfg.NORMALIZE_AUDIO = True
+        downloader.cfg.NORMALIZE_FILTER = "dynaudnorm"
+        cmd = downloader._build_ffmpeg_cmd(Path("in.webm"), Path("out.m4a"), "320")
+        assert cmd[cmd.index("-filter:a") + 1].startswith("dynaudnorm")
+        downloader.cfg.NORMALIZE_FILTER = "loudnorm"
+        cmd = downloader._build_ffmpeg_cmd(Path("in.webm"), Path("out.m4a"), "320")
+        assert cmd[cmd.index("-filter:a") + 1] == "loudnorm=I=-14:TP=-1.5:LRA=11"
 
     @pytest.mark.asyncio
     async def test_check_fake_hq(self, downloader, tmp_path):
@@ -126,9 +326,41 @@ class TestAudioDownloader:
         raw_f.write_bytes(b"data")
         track = TrackMetadata(track_id="1", title="T1", artist="A1")
 
-        res = downloader._check_fake_hq(raw_f, track, needed_hq=True)
+        res = downloader._check_fake_hq(raw_f, track)
         assert res is True  # It is fake
 
+    @pytest.mark.asyncio
+    async def test_check_fake_hq_skips_trusted_source(self, downloader, tmp_path):
+        downloader.cfg.SPECTRAL_ANALYSIS = True
+        downloader.analyzer = MagicMock()
+        downloader.analyzer.analyze_integrity.return_value = False
+        track = TrackMetadata(track_id="1", title="T1", artist="A1")
+        lossless, high, mid = tmp_path / "a.flac", tmp_path / "b.m4a", tmp_path / "c.webm"
+        downloader._raw_source.update({lossless: ("flac", 0.0), high: ("mp4a.40.2", 320.0), mid: ("opus", 160.0)})
+
+        assert await downloader._check_fake_hq_async(lossless, track, needed_hq=True) is False
+        assert await downloader._check_fake_hq_async(high, track, needed_hq=True) is False
+        assert downloader.analyzer.analyze_integrity.call_count == 0
+        assert await downloader._check_fake_hq_async(mid, track, needed_hq=True) is True
+
+        downloader._cleanup_temp_raw(mid)
+        assert mid not in downloader._raw_source
+
+    @pytest.mark.asyncio
+    async def test_check_fake_hq_async_skips_permit_when_nothing_to_do(self, downloader, tmp_path):
+        downloader._ffmpeg_sem = MagicMock()
+        downloader._check_fake_hq = MagicMock()
+        track = TrackMetadata(track_id="1", title="T1", artist="A1")
+        trusted = tmp_path / "a.flac"
+        downloader._raw_source[trusted] = ("flac", 0.0)
+
+        assert await downloader._check_fake_hq_async(tmp_path / "b.webm", track, needed_hq=False) is False
+        assert await downloader._check_fake_hq_async(trusted, track, needed_hq=True) is False
+        downloader.cfg.SPECTRAL_ANALYSIS = False
+        assert await downloader._check_fake_hq_async(tmp_path / "b.webm", track, needed_hq=True) is False
+        assert not downloader._ffmpeg_sem.__aenter__.called
+        assert not downloader._check_fake_hq.called
+
     @pytest.mark.asyncio
     async def test_fetch_metadata_assets(self, downloader):
         track = TrackMetadata(track_id="1", title="T1", artist="A1")
@@ -141,6 +373,34 @@ class TestAudioDownloader:
             await downloader._fetch_metadata_assets(track)
             assert track.cover_data == b"IMG2"
 
+    @pytest.mark.asyncio
+    async def test_fetch_metadata_assets_dedupes_album_covers(self, downloader):
+        """Concurrent tracks of one album download the cover once; the cache is bounded"""
+        import asyncio
+
+        async def slow_download(url):
+            await asyncio.sleep(0.01)
+            return url.encode()
+
+        tracks = [TrackMetadata(track_id=str(i), title=f"T{i}", artist="A") for i in range(4)]
+        for t in tracks:
+            t.cover_url = "http://album"
+        downloader.COVER_CACHE_SIZE = 1
+
+        with (
+            patch.object(downloader, "_download_cover", AsyncMock(side_effect=slow_download)) as dl,
+            patch.object(downloader, "_resize_cover", AsyncMock(side_effect=lambda b: b)),
+        ):
+            await asyncio.gather(*(downloader._fetch_metadata_assets(t) for t in tracks))
+            assert dl.await_count == 1
+            assert all(t.cover_data == b"http://album" for t in tracks)
+
+            other = TrackMetadata(track_id="x", title="X", artist="B")
+            other.cover_url = "http://other"
+            await downloader._fetch_metadata_assets(other)
+            assert list(downloader._cover_cache) == ["http://other"]
+            assert not downloader._cover_inflight
+
     def test_handle_ytdlp_error_geo(self, downloader):
         from resonance_audio_builder.core.exceptions import GeoBlockError
 
@@ -151,7 +411,7 @@ class TestAudioDownloader:
     @pytest.mark.asyncio
     async def test_perform_transcoding_pipeline(self, downloader):
         """Test the orchestration of transcoding tasks"""
-        downloader._transcode = AsyncMock(return_value=True)
+        downloader._transcode_many = AsyncMock(return_value=[True, True])
         downloader._inject_metadata = AsyncMock()
 
         raw, hq, mob = Path("raw"), Path("hq"), Path("mob")
@@ -162,7 +422,9 @@ class TestAudioDownloader:
             success, bytes_n = await downloader._perform_transcoding_pipeline(raw, hq, mob, track, True, True)
             assert success is True
             assert bytes_n == 200
-            assert downloader._transcode.call_count == 2
+            # Ambas calidades en un único proceso ffmpeg
+            downloader._transcode_many.assert_awaited_once()
+            assert [p for p, _ in downloader._transcode_many.call_args[0][1]] == [hq, mob]
 
     def test_resize_cover(self, downloader):
         """Test cover art resizing logic"""
@@ -176,6 +438,33 @@ class TestAudioDownloader:
         resized_img = Image.open(io.BytesIO(resized_bytes))
         assert resized_img.size[0] <= 50
 
+    def test_resize_cover_jpeg_uses_draft(self, downloader):
+        # thumbnail() (reducing_gap=2.0 por defecto) decodifica el JPEG ya reducido vía draft()
+        img = Image.new("RGB", (800, 800), color="blue")
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG")
+
+        from PIL.JpegImagePlugin import JpegImageFile
+
+        with patch.object(JpegImageFile, "draft", autospec=True, side_effect=JpegImageFile.draft) as mock_draft:
+            resized = Image.open(io.BytesIO(downloader._resize_cover_sync(buffer.getvalue(), max_size=100)))
+        assert mock_draft.called
+        assert resized.size == (100, 100)
+
+    def test_resize_cover_filter_follows_config(self, downloader):
+        img = Image.new("RGB", (800, 800), color="green")
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG")
+
+        with patch.object(Image.Image, "thumbnail", autospec=True, side_effect=Image.Image.thumbnail) as mock_thumb:
+            downloader._resize_cover_sync(buffer.getvalue(), max_size=300)
+            assert mock_thumb.call_args[0][2] == Image.Resampling.BILINEAR
+            downloader._resize_cover_sync(buffer.getvalue(), max_size=600)
+            assert mock_thumb.call_args[0][2] == Image.Resampling.HAMMING
+            downloader.cfg.COVER_RESAMPLE = "lanczos"
+            downloader._resize_cover_sync(buffer.getvalue(), max_size=300)
+            assert mock_thumb.call_args[0][2] == Image.Resampling.LANCZOS
+
     @pytest.mark.asyncio
     async def test_download_raw_full(self, downloader, tmp_path):
         """Test full flow of _download_raw"""
@@ -192,6 +481,33 @@ class TestAudioDownloader:
             assert isinstance(result, Path)
             assert mock_ydl.extract_info.called
 
+    @pytest.mark.asyncio
+    async def test_raw_downloads_use_private_scratch_dir(self, downloader):
+        scratch = downloader._scratch_dir()
+        assert scratch.is_dir() and scratch.name.startswith("ytraw_")
+        assert downloader._scratch_dir() == scratch
+
+        with patch.object(downloader, "_execute_ydl", return_value=scratch / "raw.webm") as mock_exec:
+            await downloader._download_raw("http://url", "name")
+        assert mock_exec.call_args[0][2] == scratch
+        assert mock_exec.call_args[0][1]["outtmpl"].startswith(str(scratch))
+
+        await downloader.close()
+        assert not scratch.exists()
+
+    @pytest.mark.asyncio
+    async def test_download_flags_rate_limit(self, downloader, tmp_path):
+        from resonance_audio_builder.core.config import QualityMode
+        from resonance_audio_builder.core.exceptions import RateLimitError
+
+        downloader.cfg.MODE = QualityMode.HQ_ONLY
+        downloader.cfg.OUTPUT_FOLDER_HQ = str(tmp_path / "HQ")
+        track = TrackMetadata(track_id="1", title="Title", artist="Artist")
+
+        with patch.object(downloader, "_download_raw", AsyncMock(side_effect=RateLimitError("Rate Limit (429)"))):
+            res = await downloader.download(SearchResult("url", "Title", 180), track, lambda: False)
+        assert not res.success and res.rate_limited
+
     @pytest.mark.asyncio
     async def test_download_with_quit_signal(self, downloader, tmp_path):
         """Test download respects quit signal"""
@@ -1,3 +1,4 @@
+import os
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -41,3 +42,30 @@ class TestKeyboardController:
 
             controller.stop()
             assert controller._running is False
+
+    @pytest.mark.skipif(os.name == "nt", reason="Unix terminal path")
+    def test_listen_unix_sets_mode_once(self, controller):
+        """El modo de terminal se cambia una vez al iniciar y se restaura al salir"""
+        calls = iter([[3], []])
+
+        def fake_select(r, w, x, timeout):
+            rlist = next(calls)
+            if not rlist:
+                controller.quit_event.set()
+            return rlist, [], []
+
+        with (
+            patch("sys.stdin") as stdin,
+            patch("termios.tcgetattr", return_value=["old"]),
+            patch("termios.tcsetattr") as tcset,
+            patch("tty.setcbreak") as cbreak,
+            patch("select.select", side_effect=fake_select),
+            patch("os.read", return_value=b"p"),
+        ):
+            stdin.fileno.return_value = 3
+            controller._running = True
+            controller._listen_unix()
+
+        cbreak.assert_called_once_with(3)
+        tcset.assert_called_once()
+        assert controller.is_paused() is True
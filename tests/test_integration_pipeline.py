@@ -25,7 +25,7 @@ class TestDownloadPipeline:
 
         # Patch dependencies instantiated in __init__
         with (
-            patch("resonance_audio_builder.audio.youtube.yt_dlp.YoutubeDL", return_value=mock_youtube_api),
+            patch("yt_dlp.YoutubeDL", return_value=mock_youtube_api),
             patch("asyncio.get_running_loop"),
             patch("resonance_audio_builder.core.manager.RichUI"),
             patch("resonance_audio_builder.core.manager.ProgressDB"),
@@ -16,7 +16,12 @@ if os.path.join(root_dir, "src") not in sys.path:
 from resonance_audio_builder.audio.metadata import TrackMetadata  # noqa: E402
 from resonance_audio_builder.core.config import Config  # noqa: E402
 from resonance_audio_builder.core.ui import format_size, format_time  # noqa: E402
-from resonance_audio_builder.core.utils import calculate_md5, export_m3u, save_history  # noqa: E402
+from resonance_audio_builder.core.utils import (  # noqa: E402
+    calculate_md5,
+    export_m3u,
+    load_history,
+    save_history,
+)
 from resonance_audio_builder.network.cache import CacheManager  # noqa: E402
 from resonance_audio_builder.network.limiter import RateLimiter  # noqa: E402
 from resonance_audio_builder.network.utils import validate_cookies_file  # noqa: E402
@@ -78,7 +83,34 @@ class TestTrackMetadata:
         track = TrackMetadata.from_csv_row(row)
 
         assert not track.track_id.startswith("isrc_")
-        assert len(track.track_id) == 16  # MD5 hash truncated
+        assert len(track.track_id) == 16  # 64-bit BLAKE2b hex digest
+
+    def test_from_csv_row_with_resolver(self):
+        """Headers resolved once per CSV give the same result as per-row lookup"""
+        rows = [
+            {" TRACK NAME ": "Song A", "Artist": "Artist A", "BPM": "120.5", "Explicit": "True", "Key": "7"},
+            {" TRACK NAME ": "Song B", "Artist": "Artist B", "BPM": "", "Explicit": "false", "Key": "x"},
+        ]
+        resolver = TrackMetadata.build_resolver(rows[0].keys())
+        assert resolver["title"] == (" TRACK NAME ",)
+        assert resolver["album"] == ()
+
+        for row in rows:
+            assert TrackMetadata.from_csv_row(row, resolver) == TrackMetadata.from_csv_row(row)
+
+        first = TrackMetadata.from_csv_row(rows[0], resolver)
+        assert (first.title, first.tempo, first.explicit, first.key) == ("Song A", 120.5, True, 7)
+        assert first.time_signature == 4
+        assert first.raw_data["TRACK NAME"] == "Song A"
+
+    def test_slots_and_shared_raw_header(self):
+        """Tracks carry no __dict__ and rows of one CSV share the header tuple"""
+        rows = [{" Track Name ": "A", "Artist": "X"}, {" Track Name ": "B", "Artist": "Y"}]
+        a, b = (TrackMetadata.from_csv_row(r) for r in rows)
+        assert not hasattr(a, "__dict__")
+        assert a.raw_fields is b.raw_fields
+        assert b.raw_data == {"Track Name": "B", "Artist": "Y"}
+        assert a.playlist_subfolder == "" and a.playlists == []
 
     def test_safe_filename(self):
         """Should remove invalid characters from filename"""
@@ -138,6 +170,11 @@ class TestUtilityFunctions:
         assert "KB" in format_size(1500)
         assert "MB" in format_size(5000000)
         assert "GB" in format_size(5000000000)
+        assert format_size(0) == "0.00 B"
+        assert format_size(1023) == "1023.00 B"
+        assert format_size(1536) == "1.50 KB"
+        assert format_size(3 * (1 << 40)) == "3.00 TB"
+        assert format_size(5 * (1 << 50)) == "5120.00 TB"
 
     def test_calculate_md5(self):
         """Should calculate correct MD5 hash"""
@@ -152,6 +189,14 @@ class TestUtilityFunctions:
         finally:
             os.unlink(filepath)
 
+    def test_calculate_md5_without_file_digest(self, tmp_path, monkeypatch):
+        """Python 3.10 has no hashlib.file_digest; the chunked loop gives the same digest"""
+        filepath = tmp_path / "big.bin"
+        filepath.write_bytes(b"x" * (3 << 20))
+        expected = calculate_md5(filepath)
+        monkeypatch.delattr(hashlib, "file_digest", raising=False)
+        assert calculate_md5(filepath) == expected == hashlib.md5(b"x" * (3 << 20)).hexdigest()
+
     def test_calculate_md5_missing_file(self):
         """Should return empty string for missing file"""
         md5 = calculate_md5(Path("nonexistent.file"))
@@ -213,6 +258,13 @@ class TestValidateCookies:
     def test_missing_file(self):
         assert not validate_cookies_file("nonexistent.txt")
 
+    def test_directory_and_alt_header(self, tmp_path):
+        assert not validate_cookies_file(str(tmp_path))
+
+        alt = tmp_path / "cookies.txt"
+        alt.write_bytes(b"\n# HTTP Cookie File\n")
+        assert validate_cookies_file(str(alt))
+
 
 class TestExportM3U:
     """Tests for M3U export"""
@@ -242,38 +294,57 @@ class TestExportM3U:
 class TestSaveHistory:
     """Tests for session history"""
 
-    def test_save_history(self):
-        fd, filepath = tempfile.mkstemp(suffix=".json")
-        os.close(fd)
+    def test_save_history(self, tmp_path):
+        filepath = str(tmp_path / "history.json")
+        session = {"date": "2024-01-24", "songs": 10, "name": "Canción"}
+        save_history(filepath, session)
 
-        try:
-            session = {"date": "2024-01-24", "songs": 10}
-            save_history(filepath, session)
+        with open(filepath, "r", encoding="utf-8") as f:
+            lines = f.readlines()
 
-            with open(filepath, "r") as f:
-                history = json.load(f)
+        assert len(lines) == 1
+        assert json.loads(lines[0]) == session
+        assert load_history(filepath) == [session]
 
-            assert len(history) == 1
-            assert history[0]["songs"] == 10
-        finally:
-            os.unlink(filepath)
+    def test_history_limit(self, tmp_path):
+        """Should keep only last 50 sessions when reading"""
+        filepath = str(tmp_path / "history.json")
+        # Add 60 sessions
+        for i in range(60):
+            save_history(filepath, {"session": i})
 
-    def test_history_limit(self):
-        """Should keep only last 50 sessions"""
-        fd, filepath = tempfile.mkstemp(suffix=".json")
-        os.close(fd)
+        history = load_history(filepath)
+        assert len(history) == 50
+        assert history[0]["session"] == 10
 
-        try:
-            # Add 60 sessions
-            for i in range(60):
-                save_history(filepath, {"session": i})
+    def test_history_without_orjson(self, tmp_path):
+        """stdlib fallback writes the same UTF-8 lines"""
+        filepath = str(tmp_path / "history.json")
+        with patch("resonance_audio_builder.core.utils.orjson", None):
+            save_history(filepath, {"name": "Canción", "songs": 3})
+            assert load_history(filepath) == [{"name": "Canción", "songs": 3}]
+        with open(filepath, "rb") as f:
+            assert f.read() == '{"name": "Canción", "songs": 3}\n'.encode("utf-8")
 
-            with open(filepath, "r") as f:
-                history = json.load(f)
+    def test_history_file_is_trimmed_on_write(self, tmp_path):
+        """The file itself stays bounded, not just what load_history returns"""
+        filepath = tmp_path / "history.json"
+        for i in range(101):
+            save_history(str(filepath), {"session": i})
+        assert len(filepath.read_bytes().splitlines()) == 101
 
-            assert len(history) == 50
-        finally:
-            os.unlink(filepath)
+        save_history(str(filepath), {"session": 101})
+        history = load_history(str(filepath), limit=1000)
+        assert [h["session"] for h in history] == list(range(51, 102))
+
+    def test_history_migrates_legacy_json(self, tmp_path):
+        filepath = tmp_path / "history.json"
+        filepath.write_text(json.dumps([{"session": i} for i in range(55)]), encoding="utf-8")
+
+        save_history(str(filepath), {"session": 55})
+
+        history = load_history(str(filepath), limit=100)
+        assert [h["session"] for h in history] == list(range(5, 56))
 
 
 class TestCacheManager:
@@ -316,11 +387,113 @@ class TestCacheManager:
         filepath = tmp_path / "expiry.db"
         cache = CacheManager(str(filepath))
         cache.set("old", {"url": "u"})
+        cache.close()
+
+        # Fresh instance: no in-memory copy of the row
+        cache = CacheManager(str(filepath))
         with cache.lock:
             cache.cursor.execute("UPDATE cache SET timestamp = timestamp - 100000")
             cache.conn.commit()
         assert cache.get("old", ttl_hours=1) is None
 
+    def test_set_tolerates_malformed_payload(self, tmp_path):
+        cache = CacheManager(str(tmp_path / "bad.db"))
+        cache.set("no_url", {"title": "t"})
+        cache.set("none", None)
+        cache.flush()
+        assert cache.get("no_url", ttl_hours=1) is None
+        cache.close()
+        cache.close()
+
+    def test_rows_past_max_age_are_purged_on_open(self, tmp_path):
+        filepath = str(tmp_path / "purge.db")
+        cache = CacheManager(filepath)
+        cache.set("old", {"url": "u1", "title": "t1"})
+        cache.set("new", {"url": "u2", "title": "t2"})
+        cache.flush()
+        with cache.lock:
+            cache.cursor.execute(
+                "UPDATE cache SET timestamp = timestamp - ? WHERE key = 'old'", (CacheManager.MAX_AGE_HOURS * 3600 + 1,)
+            )
+        cache.close()
+
+        cache = CacheManager(filepath)
+        assert cache.count() == 1
+        assert cache.get("new", ttl_hours=1)["url"] == "u2"
+        cache.close()
+
+    def test_memory_lru_hits_and_eviction(self, tmp_path):
+        """Repeated lookups are served from memory; the LRU is bounded"""
+        cache = CacheManager(str(tmp_path / "lru.db"))
+        cache.MEM_CAPACITY = 2
+        cache.set("a", {"url": "u1", "title": "t1"})
+        cache.set("b", {"url": "u2", "title": "t2"})
+        cache.flush()
+
+        cache.cursor = MagicMock(wraps=cache.cursor)
+        assert cache.get("a", ttl_hours=1)["url"] == "u1"
+        assert not cache.cursor.execute.called
+
+        cache.set("c", {"url": "u3", "title": "t3"})
+        assert list(cache._mem) == ["a", "c"]
+
+        cache.clear()
+        assert not cache._mem
+        assert cache.get("a", ttl_hours=1) is None
+
+    def test_set_is_buffered_until_flush(self, tmp_path):
+        """Writes are batched in memory and committed together on flush"""
+        import sqlite3
+
+        filepath = tmp_path / "batch.db"
+        cache = CacheManager(str(filepath))
+        cache.set("a", {"url": "u1", "title": "t1", "duration": 1})
+        cache.set("b", {"url": "u2", "title": "t2", "duration": 2})
+
+        # Still readable through the cache before hitting disk
+        assert cache.get("b", ttl_hours=1)["url"] == "u2"
+
+        reader = sqlite3.connect(str(filepath))
+        assert reader.execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 0
+
+        cache.flush()
+        assert reader.execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 2
+        reader.close()
+        cache.close()
+
+    def test_reads_do_not_wait_for_writer_lock(self, tmp_path):
+        """Each thread reads through its own WAL connection"""
+        import threading
+
+        cache = CacheManager(str(tmp_path / "tls.db"))
+        cache.set("k", {"url": "u", "title": "t"})
+        cache.flush()
+        cache._mem.clear()
+
+        result = {}
+        with cache.lock:  # simulate a long write in progress
+            reader = threading.Thread(target=lambda: result.update(hit=cache.get("k", ttl_hours=1)))
+            reader.start()
+            reader.join(timeout=5)
+            assert not reader.is_alive()
+
+        assert result["hit"]["url"] == "u"
+        assert len(cache._readers) == 1
+        cache.close()
+        assert cache._readers == []
+
+    def test_writer_is_autocommit(self, tmp_path):
+        """No implicit transaction is left open between write batches"""
+        cache = CacheManager(str(tmp_path / "auto.db"))
+        assert cache.conn.isolation_level is None
+        cache.set("k", {"url": "u", "title": "t"})
+        cache.flush()
+        assert not cache.conn.in_transaction
+        cache.clear()
+        assert not cache.conn.in_transaction
+        assert cache.count() == 0
+        cache.close()
+
     def test_cache_exception_handling(self):
         """Test cache robustness when DB fails"""
         with patch("sqlite3.connect", side_effect=Exception("Fail")):
@@ -28,3 +28,64 @@ class TestLogger:
         log.set_tracker(ui)
         log.error("Boom")
         assert ui.add_log.called
+
+    def test_file_lines_are_written_by_background_sink(self, tmp_path, monkeypatch):
+        from resonance_audio_builder.core import logger as logger_mod
+
+        sink = logger_mod._FileSink(str(tmp_path / "debug.log"))
+        monkeypatch.setattr(logger_mod, "_file_sink", sink)
+        log = Logger(debug=False)
+        log.set_tracker(MagicMock())
+        for i in range(100):
+            log.info(f"line {i}")
+
+        sink.flush()
+        lines = (tmp_path / "debug.log").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 100
+        assert lines[-1].endswith("INFO: i line 99")
+
+        sink.close()
+        log.warning("after close")  # reabre el archivo con un hilo nuevo
+        sink.close()
+        assert (tmp_path / "debug.log").read_text(encoding="utf-8").count("\n") == 101
+
+    def test_file_line_strips_markup_brackets(self, monkeypatch):
+        from resonance_audio_builder.core import logger as logger_mod
+
+        lines = []
+        monkeypatch.setattr(logger_mod._file_sink, "write", lines.append)
+        log = Logger(debug=False)
+        log.set_tracker(MagicMock())
+        log.error("[bold]x[/bold] ]")
+        assert lines[0].endswith("ERROR: X boldx/bold \n")
+
+    def test_dlog_formats_only_when_enabled(self):
+        ui = MagicMock()
+        arg = MagicMock()
+        log = Logger(debug=False)
+        log.set_tracker(ui)
+        log.dlog("Cache hit: %s", arg)
+        assert not ui.add_log.called
+        assert not arg.__str__.called
+
+        log.debug_enabled = True
+        log.dlog("Cache hit: %s (%d%%)", "Song", 5)
+        assert "Cache hit: Song (5%)" in ui.add_log.call_args[0][0]
+
+    def test_console_output_goes_through_writer_thread(self, monkeypatch):
+        import threading
+
+        from resonance_audio_builder.core import logger as logger_mod
+
+        printed = []
+        monkeypatch.setattr(logger_mod.console, "print", lambda m: printed.append((m, threading.current_thread().name)))
+        writer = logger_mod._ConsoleWriter()
+        monkeypatch.setattr(logger_mod, "_console_writer", writer)
+
+        log = Logger(debug=False)  # sin tracker: salida directa a consola
+        log.warning("uno")
+        log.info("dos")
+        writer.flush()
+        assert [m for m, _ in printed] == ["[bold yellow][!] uno[/bold yellow]", "[cyan][i] dos[/cyan]"]
+        assert {name for _, name in printed} == {"console-writer"}
+        writer.close()
@@ -1,20 +1,32 @@
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
-from resonance_audio_builder.audio.lyrics import fetch_lyrics
+from resonance_audio_builder.audio.lyrics import fetch_lyrics, fetch_lyrics_with_info_async
 
 
 class TestLyrics:
     def test_fetch_lyrics_success(self):
-        with patch("requests.get") as mock_get:
-            mock_get.return_value.status_code = 200
-            mock_get.return_value.json.return_value = {
-                "syncedLyrics": "These are lyrics that are long enough to pass the length check of fifty characters."
-            }
+        payload = {
+            "syncedLyrics": "These are lyrics that are long enough to pass the length check of fifty characters."
+        }
+        with patch("resonance_audio_builder.audio.lyrics._get_json", new=AsyncMock(return_value=payload)):
             res = fetch_lyrics("Artist", "Title", 180)
             assert res is not None
 
     def test_fetch_lyrics_not_found(self):
-        with patch("requests.get") as mock_get:
-            mock_get.return_value.status_code = 404
+        with (
+            patch("resonance_audio_builder.audio.lyrics._get_json", new=AsyncMock(return_value=None)),
+            patch("resonance_audio_builder.audio.lyrics._fetch_genius", return_value=None),
+        ):
             res = fetch_lyrics("Artist", "Title", 180)
             assert res is None
+
+    async def test_fetch_lyrics_async(self):
+        payload = [{"plainLyrics": "Some plain lyrics"}]
+        mock_get = AsyncMock(return_value=payload)
+        with patch("resonance_audio_builder.audio.lyrics._get_json", new=mock_get):
+            lyrics, kind = await fetch_lyrics_with_info_async("Artist, Other", "Title (Remix)")
+        assert (lyrics, kind) == ("Some plain lyrics", "plain")
+        # Sin álbum/duración solo se usa /api/search
+        url, params, _ = mock_get.call_args[0]
+        assert url.endswith("/api/search")
+        assert params == {"track_name": "Title", "artist_name": "Artist"}
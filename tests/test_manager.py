@@ -7,7 +7,7 @@ from resonance_audio_builder.audio.downloader import DownloadResult
 from resonance_audio_builder.audio.metadata import TrackMetadata
 from resonance_audio_builder.audio.youtube import SearchResult
 from resonance_audio_builder.core.config import Config
-from resonance_audio_builder.core.manager import DownloadManager
+from resonance_audio_builder.core.manager import DownloadManager, _retry_delay
 
 
 class TestDownloadManagerUnit:
@@ -112,3 +112,51 @@ class TestDownloadManagerUnit:
 
         assert manager.searcher.search.call_count == 2
         assert manager.downloader.download.called
+
+    def test_retry_delay_is_exponential_and_capped(self):
+        assert 2.0 <= _retry_delay(1) <= 2.25
+        assert 4.0 <= _retry_delay(2) <= 4.25
+        assert 30.0 <= _retry_delay(10) <= 30.25
+        assert 15.0 <= _retry_delay(1, rate_limited=True) <= 20.0
+        assert 60.0 <= _retry_delay(10, rate_limited=True) <= 65.0
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_pauses_all_workers(self, manager):
+        track = TrackMetadata(track_id="1", title="Title", artist="Artist")
+        manager.searcher.search = AsyncMock(return_value=SearchResult("u", "T", 1))
+        manager.downloader.download = AsyncMock(return_value=DownloadResult(False, 0, "Error: 429", rate_limited=True))
+        manager.circuit_breaker = MagicMock()
+        manager.state.is_done.return_value = False
+        manager.cfg.MAX_RETRIES = 1
+
+        await manager._process_track_attempts(track, "task1")
+        manager.circuit_breaker.record_failure.assert_called_once()
+        remaining = manager._rate_limit_until - asyncio.get_running_loop().time()
+        assert 10.0 < remaining <= 20.0
+
+        # Otra canción espera la pausa compartida antes de su primer intento
+        other = TrackMetadata(track_id="2", title="Other", artist="Artist")
+        manager.downloader.download = AsyncMock(return_value=DownloadResult(True, 10))
+        with patch.object(manager, "_sleep_unless_quit", AsyncMock()) as mock_sleep:
+            await manager._process_track_attempts(other, "task2")
+        assert 10.0 < mock_sleep.await_args_list[0][0][0] <= 20.0
+
+    @pytest.mark.asyncio
+    async def test_429_in_error_text_is_not_rate_limit(self, manager):
+        track = TrackMetadata(track_id="1", title="Title", artist="Artist")
+        manager.searcher.search = AsyncMock(return_value=SearchResult("u", "T", 1))
+        manager.downloader.download = AsyncMock(return_value=DownloadResult(False, 0, "Error: Track 429 failed"))
+        manager.circuit_breaker = MagicMock()
+        manager.state.is_done.return_value = False
+        manager.cfg.MAX_RETRIES = 1
+
+        await manager._process_track_attempts(track, "task1")
+        assert not manager.circuit_breaker.record_failure.called
+        assert manager._rate_limit_until == 0.0
+
+    @pytest.mark.asyncio
+    async def test_backoff_sleep_stops_on_quit(self, manager):
+        manager.keyboard.should_quit.side_effect = [False, False, True]
+        with patch("asyncio.sleep", AsyncMock()) as mock_sleep:
+            await manager._sleep_unless_quit(10.0)
+        assert mock_sleep.await_count == 2
@@ -32,6 +32,7 @@ class TestManagerFullCoverage:
             # unless explicitly needed for an async test
             mgr.searcher = MagicMock()
             mgr.downloader = MagicMock()
+            mgr.downloader.close = AsyncMock()
             mgr.state = MagicMock()
             mgr.ui = MagicMock()
             mgr.keyboard = MagicMock()
@@ -260,6 +261,51 @@ class TestManagerFullCoverage:
             manager._save_failed()
             assert m.call_count == 2
 
+    def test_failed_tracks_streamed_to_csv(self, manager, tmp_path):
+        """Each failure is on disk before the end-of-run summary"""
+        import csv
+
+        manager.cfg.ERROR_FILE = str(tmp_path / "err.txt")
+        manager.cfg.ERROR_CSV = str(tmp_path / "err.csv")
+        manager._stream_failures = True
+        for i in (1, 2):
+            row = {"Track Name": f"T{i}", "Artist Name(s)": "A", "Spotify ID": f"id{i}"}
+            manager._record_failure(TrackMetadata.from_csv_row(row), f"Err{i}")
+
+        with open(manager.cfg.ERROR_CSV + ".part", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [r["Track Name"] for r in rows] == ["T1", "T2"]
+
+        manager._save_failed()
+        assert (tmp_path / "err.txt").read_text(encoding="utf-8").count("Error:") == 2
+        with open(manager.cfg.ERROR_CSV, encoding="utf-8", newline="") as f:
+            assert len(list(csv.DictReader(f))) == 2
+
+    def test_retry_keeps_input_csv_until_run_ends(self, manager, tmp_path):
+        """Retrying ERROR_CSV: a crash mid-run must not lose the rows not yet attempted"""
+        import csv
+
+        err_csv = tmp_path / "err.csv"
+        rows = [{"Track Name": f"T{i}", "Artist Name(s)": "A", "Spotify ID": f"id{i}"} for i in range(3)]
+        with open(err_csv, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+        manager.cfg.ERROR_FILE = str(tmp_path / "err.txt")
+        manager.cfg.ERROR_CSV = str(err_csv)
+        manager._stream_failures = True
+        manager._record_failure(TrackMetadata.from_csv_row(rows[1]), "Err")
+
+        # Simula el cierre abrupto: la entrada sigue entera
+        with open(err_csv, encoding="utf-8", newline="") as f:
+            assert len(list(csv.DictReader(f))) == 3
+
+        manager._save_failed()
+        with open(err_csv, encoding="utf-8", newline="") as f:
+            assert [r["Track Name"] for r in csv.DictReader(f)] == ["T1"]
+        assert not (tmp_path / "err.csv.part").exists()
+
     def test_save_failed_exception(self, manager):
         """Test robustness of failed track saving"""
         track = TrackMetadata("id1", "T", "A")
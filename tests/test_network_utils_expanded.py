@@ -1,4 +1,4 @@
-from resonance_audio_builder.network.utils import get_random_user_agent, is_valid_ip
+from resonance_audio_builder.network.utils import USER_AGENTS, get_random_user_agent, is_valid_ip
 
 
 def test_get_random_user_agent():
@@ -7,6 +7,14 @@ def test_get_random_user_agent():
     assert len(ua) > 10
 
 
+def test_user_agent_rotation_covers_all_agents():
+    n = len(USER_AGENTS)
+    seen = [get_random_user_agent() for _ in range(n * 2)]
+    assert set(seen) == set(USER_AGENTS)
+    # Rotación fija: el ciclo se repite en el mismo orden
+    assert seen[:n] == seen[n:]
+
+
 def test_is_valid_ip():
     assert is_valid_ip("1.2.3.4") is True
     assert is_valid_ip("256.0.0.1") is False
@@ -0,0 +1,44 @@
+import threading
+
+from resonance_audio_builder.core import shutdown
+
+
+def test_run_shutdown_runs_each_task_once(monkeypatch):
+    monkeypatch.setattr(shutdown, "_tasks", [])
+    calls = []
+    lock = threading.Lock()
+
+    def make(i):
+        def task():
+            with lock:
+                calls.append(i)
+
+        return task
+
+    tasks = [make(i) for i in range(5)]
+    for t in tasks:
+        shutdown.register(t)
+    shutdown.register(tasks[0])  # duplicado ignorado
+    shutdown.unregister(tasks[4])
+
+    shutdown.run_shutdown()
+    shutdown.run_shutdown()  # segunda llamada sin tareas
+
+    assert sorted(calls) == [0, 1, 2, 3]
+
+
+def test_run_shutdown_reports_failures(monkeypatch, tmp_path):
+    monkeypatch.setattr(shutdown, "_tasks", [])
+    monkeypatch.chdir(tmp_path)
+    done = []
+
+    def boom():
+        raise RuntimeError("flush failed")
+
+    shutdown.register(boom)
+    shutdown.register(lambda: done.append(True))
+
+    shutdown.run_shutdown(parallel=False)
+
+    assert done == [True]
+    assert "flush failed" in (tmp_path / "crash_exit.txt").read_text(encoding="utf-8")
@@ -52,3 +52,38 @@ class TestProgressDB:
 
         db2 = ProgressDB(cfg)
         assert db2.is_done("track1") is True
+
+    def test_migrates_legacy_track_ids(self, tmp_path):
+        import sqlite3
+
+        from resonance_audio_builder.audio.metadata import legacy_track_id, make_track_id
+
+        cfg = Config()
+        cfg.CHECKPOINT_FILE = str(tmp_path / "legacy.json")
+        conn = sqlite3.connect(str(tmp_path / "legacy.db"))
+        conn.execute("CREATE TABLE downloads (track_id TEXT PRIMARY KEY, artist TEXT, title TEXT, status TEXT)")
+        conn.executemany(
+            "INSERT INTO downloads VALUES (?, ?, ?, 'ok')",
+            [(legacy_track_id("A", "T"), "A", "T"), ("isrc_X1", "B", "U")],
+        )
+        conn.commit()
+        conn.close()
+
+        db = ProgressDB(cfg)
+        assert db.is_done(make_track_id("A", "T")) is True
+        assert db.is_done(legacy_track_id("A", "T")) is False
+        assert db.is_done("isrc_X1") is True
+
+    def test_autosave_defers_commits(self, tmp_path):
+        cfg = Config()
+        cfg.CHECKPOINT_FILE = str(tmp_path / "autosave.json")
+        db1 = ProgressDB(cfg)
+        db1.start_autosave(interval=60)
+        db1.mark(TrackMetadata(track_id="track1", title="Title 1", artist="Artist 1"), "ok")
+
+        # Visible en la misma conexión, pendiente para las demás
+        assert db1.is_done("track1") is True
+        assert ProgressDB(cfg).is_done("track1") is False
+
+        db1.stop_autosave()
+        assert ProgressDB(cfg).is_done("track1") is True
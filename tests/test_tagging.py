@@ -186,3 +186,25 @@ class TestMetadataWriter:
         assert t.tempo == 138.978
         assert t.label == "Chezile / 10K Projects"
         assert t.copyrights == "C © 2024 Chezile"
+
+    def test_save_retries_only_save_on_lock(self, writer, tmp_path):
+        f = tmp_path / "locked.m4a"
+        f.touch()
+        track = TrackMetadata(track_id="id5", title="T", artist="A")
+
+        with (
+            patch("resonance_audio_builder.audio.tagging.MP4") as mock_mp4,
+            patch("resonance_audio_builder.audio.tagging.fetch_lyrics_with_info", return_value=(None, None)) as lyr,
+            patch("resonance_audio_builder.audio.tagging.time.sleep") as mock_sleep,
+        ):
+            mock_audio = MagicMock()
+            mock_audio.save.side_effect = [PermissionError("locked"), None]
+            mock_mp4.return_value = mock_audio
+
+            writer.write(f, track)
+
+        assert mock_audio.save.call_count == 2
+        assert mock_mp4.call_count == 1
+        assert lyr.call_count == 1
+        mock_sleep.assert_called_once_with(0.02)
+        writer.log.error.assert_not_called()
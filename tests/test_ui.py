@@ -63,3 +63,11 @@ class TestRichUI:
         with patch("resonance_audio_builder.core.ui.console.print") as mock_print:
             ui.show_summary({"ok": 1, "skip": 0, "error": 0, "bytes": 100})
             assert mock_print.called
+
+    def test_add_log_keeps_last_window(self, ui):
+        for i in range(30):
+            ui.add_log(f"line {i}")
+        assert len(ui.log_buffer) == 8
+        assert ui.log_text.plain == ""  # se reconstruye en el refresh, no por línea
+        ui._render_log()
+        assert ui.log_text.plain.splitlines() == [f"line {i}" for i in range(22, 30)]
@@ -1,8 +1,9 @@
+import os
 from unittest.mock import MagicMock
 
 import pytest
 
-from resonance_audio_builder.core.utils import export_playlist_m3us
+from resonance_audio_builder.core.utils import export_playlist_m3us, walk_audio, walk_audio_stats
 
 
 @pytest.fixture
@@ -61,3 +62,25 @@ def test_export_playlist_m3us_exception():
     # Force an exception (e.g. invalid path)
     # The function catches exceptions and passes
     export_playlist_m3us({"list": []}, 12345)  # Invalid path type
+
+
+def test_walk_audio_recurses_and_filters(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "top.m4a").write_bytes(b"x")
+    (tmp_path / "a" / "SONG.MP3").write_bytes(b"x")
+    (tmp_path / "a" / "b" / "deep.m4a").write_bytes(b"x")
+    (tmp_path / "a" / "cover.jpg").write_bytes(b"x")
+    (tmp_path / "a" / ".m4a").write_bytes(b"x")
+    (tmp_path / "dir.m4a").mkdir()
+
+    found = sorted(os.path.relpath(p, tmp_path) for p in walk_audio(tmp_path))
+    assert found == sorted(["top.m4a", os.path.join("a", "SONG.MP3"), os.path.join("a", "b", "deep.m4a")])
+    assert list(walk_audio(tmp_path / "missing")) == []
+
+
+def test_walk_audio_stats(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "one.m4a").write_bytes(b"x" * 7)
+    (tmp_path / "skip.txt").write_bytes(b"x")
+    found = list(walk_audio_stats(tmp_path))
+    assert [(p, st.st_size) for p, st in found] == [(str(tmp_path / "a" / "one.m4a"), 7)]
@@ -10,11 +10,11 @@ from resonance_audio_builder.core.exceptions import NotFoundError
 class TestYouTubeSearcher:
     @pytest.fixture
     def searcher(self, mock_youtube_api):
-        # Patch yt_dlp.YoutubeDL at the import location in youtube.py
+        # youtube.py importa yt_dlp dentro de la función: se parchea en el propio módulo
         mock_youtube_api.__enter__.return_value = mock_youtube_api
 
         with patch(
-            "resonance_audio_builder.audio.youtube.yt_dlp.YoutubeDL",
+            "yt_dlp.YoutubeDL",
             return_value=mock_youtube_api,
         ):
             # Ensure cache doesn't return mocks that act as True
@@ -56,6 +56,19 @@ class TestYouTubeSearcher:
         res = await searcher.search(track)
         assert res.url == "u2"  # Should pick the non-cover
 
+    @pytest.mark.asyncio
+    async def test_search_skips_entries_without_url(self, searcher, mock_youtube_api):
+        """Best-scoring entry without URL should not hide a usable candidate"""
+        mock_youtube_api.extract_info.return_value = {
+            "entries": [
+                {"id": "v1", "title": "Song", "uploader": "Artist - Topic", "duration": 200},
+                {"id": "v2", "title": "Song", "uploader": "Artist", "duration": 200, "webpage_url": "u2"},
+            ]
+        }
+        track = TrackMetadata("id3b", "Song", "Artist")
+        res = await searcher.search(track)
+        assert res.url == "u2"
+
     @pytest.mark.asyncio
     async def test_search_cache_hit(self, searcher):
         """Second search should hit cache (mocking cache manager)"""
@@ -275,3 +288,50 @@ class TestScoringEdgeCases:
         track = TrackMetadata("id", "Song", "Artist", duration_ms=200000)
         score = searcher._score_entry(entry, "Artist - Song Audio", track)
         assert score == float("-inf")
+
+
+def test_yt_dlp_is_imported_lazily():
+    """Importing the app must not pay for yt_dlp until a search/download runs"""
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, resonance_audio_builder.core.builder, resonance_audio_builder.audio.youtube as y;"
+        "assert 'yt_dlp' not in sys.modules"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+
+def test_tokenizers_are_memoized():
+    from resonance_audio_builder.audio import youtube
+
+    searcher = YouTubeSearcher(MagicMock(), MagicMock(), None)
+    first = searcher._essential_tokens("Beyoncé & The Band feat. X")
+    assert first == {"beyonce", "band"}
+    assert searcher._essential_tokens("Beyoncé & The Band feat. X") is first
+    assert searcher._tokenize("Ñandú Live!") == {"nandu", "live"}
+    assert youtube._text_tokens.cache_info().hits >= 1
+    searcher.close()
+
+
+@pytest.mark.asyncio
+async def test_text_queries_run_concurrently():
+    import asyncio
+
+    searcher = YouTubeSearcher(MagicMock(), MagicMock(), None)
+    running = {"now": 0, "max": 0}
+
+    async def fake_lookup(cache_key, query, track):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return None
+
+    searcher._lookup = fake_lookup
+    track = TrackMetadata("id", "Song", "Some Long Artist Name")
+    assert await searcher._search_text_candidates(track) == []
+    assert running["max"] == len(YouTubeSearcher.QUERY_TEMPLATES)
+    searcher.close()